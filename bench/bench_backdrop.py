@@ -0,0 +1,112 @@
+"""Live background blur vs the pre-blurred backdrop strip, per repaint.
+
+picom's dual_kawase blur of a bar re-runs the whole chain over the bar region
+(plus its blur margin) on every repaint behind it: passes downsample and
+passes upsample draws, each writing every texel of its target. GPU time of
+such a fill-rate bound pass scales with the texels written, so the count is
+reported next to the cairo time of the same chain on the CPU, which needs no
+GPU or display. With the backdrop the compositor only blends the bar window
+and the strip is rendered once per geometry, or loaded from the disk cache.
+
+    python bench/bench_backdrop.py [frames] [wallpaper]
+"""
+import statistics
+import sys
+import tempfile
+import time
+
+import headless  # noqa: F401, exits without libqtile and cairocffi
+import cairocffi
+
+import backdrop
+import wallpaper as wallpapers
+from glyphs import GlyphAtlas
+
+GEOMETRIES = ((1366, 768), (1920, 1080), (2560, 1440), (3840, 2160))
+BAR = 60
+PASSES = 4
+TINT = "#1d202140"
+
+
+def synthetic(width=1920, height=1080):
+    """Wallpaper-like test image: gradients and hard edges to blur."""
+    image = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, width, height)
+    ctx = cairocffi.Context(image)
+    gradient = cairocffi.LinearGradient(0, 0, width, height)
+    gradient.add_color_stop_rgb(0, 0.2, 0.1, 0.4)
+    gradient.add_color_stop_rgb(1, 0.9, 0.5, 0.2)
+    ctx.set_source(gradient)
+    ctx.paint()
+    for i in range(40):
+        ctx.set_source_rgba((i * 37 % 100) / 100, (i * 53 % 100) / 100, 0.6, 0.5)
+        ctx.rectangle(i * 47 % width, i * 29 % height, 120, 80)
+        ctx.fill()
+    return image
+
+
+def texels(width, height, passes) -> int:
+    """Texels written by a dual-filter chain over width x height."""
+    sizes = [(width, height)]
+    for _ in range(passes):
+        w, h = sizes[-1]
+        sizes.append((max(1, w // 2), max(1, h // 2)))
+    down = sum(w * h for w, h in sizes[1:])
+    up = sum(w * h for w, h in sizes[:-1])
+    return down + up
+
+
+def timed(function, frames) -> float:
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6
+
+
+def main(frames=50, wallpaper=None):
+    image = wallpapers.decode(wallpaper) if wallpaper else synthetic()
+    for width, height in GEOMETRIES:
+        rect = (0, 0, width, BAR)
+        pad = 2 ** (PASSES + 1)
+        # what the compositor blurs: the screen under the bar and its margin
+        under = (0, 0, width, BAR + pad)
+        area = backdrop.render(image, (width, height), under, "fill", passes=0)
+        live_texels = texels(width, BAR + pad, PASSES) + width * BAR
+        live = timed(lambda: backdrop.blur(area, PASSES), frames)
+        start = time.perf_counter()
+        strip = backdrop.render(image, (width, height), rect, "fill", PASSES, TINT)
+        once = (time.perf_counter() - start) * 1e3
+        target = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, width, BAR)
+
+        def blit():
+            ctx = cairocffi.Context(target)
+            ctx.set_operator(cairocffi.OPERATOR_SOURCE)
+            ctx.set_source_surface(strip)
+            ctx.paint()
+
+        cached = timed(blit, frames)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            key = ("bench", width, height)
+            GlyphAtlas(cache_dir).put(key, strip)
+            start = time.perf_counter()
+            GlyphAtlas(cache_dir).get(key)
+            disk = (time.perf_counter() - start) * 1e3
+        print(
+            "{:4d}x{:<4d}  live blur {:9d} texels {:8.1f} us/frame  "
+            "backdrop {:8d} texels {:6.1f} us/frame  "
+            "render once {:6.1f} ms  disk load {:5.1f} ms".format(
+                width,
+                height,
+                live_texels,
+                live,
+                width * BAR,
+                cached,
+                once,
+                disk,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(a) if a.isdigit() else a for a in sys.argv[1:]])
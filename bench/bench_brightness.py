@@ -0,0 +1,67 @@
+"""Writes and forks for a held brightness key on a fake /sys/class/backlight.
+
+Presses arrive every repeat_ms, from a wheel burst scrolling the Backlight
+widget (a few ms) to X's default key repeat (40 ms). Brightnessctl forks once
+per press, the controller writes at most once per frame of its fps.
+
+    python bench/bench_brightness.py [presses] [repeat_ms ...]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "qtile"))
+# after site-packages: qtile's logger if installed, the stub otherwise
+sys.path.append(os.path.join(os.path.dirname(__file__), "stubs"))
+from brightness import BrightnessController  # noqa: E402
+
+
+def make_fake_sysfs(root, name="intel_backlight", value=4800, maximum=96000):
+    path = os.path.join(root, "class", "backlight", name)
+    os.makedirs(path)
+    for attr, val in (("brightness", value), ("max_brightness", maximum)):
+        with open(os.path.join(path, attr), "w") as f:
+            f.write(str(val))
+    return path
+
+
+async def run(presses, repeat_ms):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_fake_sysfs(tmp)
+        controller = BrightnessController(sysfs=tmp, fps=60)
+        shown = []
+        controller.listeners.append(shown.append)
+        lags = []
+        for i in range(presses):
+            start = time.perf_counter()
+            controller.step(1)
+            lags.append(time.perf_counter() - start)
+            await asyncio.sleep(repeat_ms / 1000)
+        controller.close()
+        with open(os.path.join(path, "brightness")) as f:
+            final = int(f.readline())  # the controller never truncates
+        print(
+            "every {:3d} ms: {:4d} presses  brightnessctl {:4d} forks  "
+            "controller {:4d} writes {} forks  max key->display {:6.3f} ms  "
+            "final {:.0%} shown {:.0%}".format(
+                repeat_ms,
+                presses,
+                presses,
+                controller.writes,
+                controller.spawns,
+                max(lags) * 1e3,
+                final / controller.max_brightness,
+                shown[-1],
+            )
+        )
+
+
+async def main(presses=30, *repeats):
+    for repeat_ms in repeats or (2, 8, 16, 40):
+        await run(presses, repeat_ms)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,72 @@
+"""Event-loop stall while checking for updates, blocking vs UpdateChecker.
+
+Uses a fake checkupdates script that sleeps before printing its updates.
+
+    python bench/bench_checkupdates.py [delay_seconds]
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "qtile"))
+from update_checker import UpdateChecker  # noqa: E402
+
+FAKE = """#!/bin/sh
+sleep {delay}
+printf 'linux 6.1-1 -> 6.2-1\\nqtile 0.22-1 -> 0.23-1\\npicom 10-1 -> 11-1\\n'
+"""
+HEARTBEAT = 0.005
+
+
+async def max_stall(job) -> float:
+    """Run job() while a heartbeat measures the longest late wakeup."""
+    worst = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal worst
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT)
+            worst = max(worst, time.perf_counter() - start - HEARTBEAT)
+
+    beat = asyncio.ensure_future(heartbeat())
+    await asyncio.sleep(HEARTBEAT)
+    result = job()
+    if asyncio.isfuture(result):
+        await result
+    done.set()
+    await beat
+    return worst
+
+
+async def main(delay):
+    with tempfile.TemporaryDirectory() as tmp:
+        script = os.path.join(tmp, "checkupdates")
+        with open(script, "w") as f:
+            f.write(FAKE.format(delay=delay))
+        os.chmod(script, 0o755)
+        cache = os.path.join(tmp, "cache.json")
+
+        def blocking():
+            return subprocess.run(script, shell=True, capture_output=True)
+
+        checker = UpdateChecker(script, cache)
+        print("blocking stall: {:8.1f} ms".format(await max_stall(blocking) * 1e3))
+        print("asyncio  stall: {:8.1f} ms".format(await max_stall(checker.check) * 1e3))
+
+        reloaded = UpdateChecker(script, cache)
+        start = time.perf_counter()
+        reloaded.load()
+        print(
+            "reload shows {} updates after {:.3f} ms".format(
+                reloaded.updates, (time.perf_counter() - start) * 1e3
+            )
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.5))
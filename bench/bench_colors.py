@@ -0,0 +1,53 @@
+"""Time the color work done by one config rebuild, legacy helpers vs colors.py.
+
+    python bench/bench_colors.py [rebuilds]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "qtile"))
+import colors  # noqa: E402
+
+FOREGROUND = "#f9f5d7"
+
+
+def legacy_val_to_hex(val) -> str:
+    return "{:02x}".format(val)
+
+
+def legacy_rgba_to_hex(color: tuple) -> str:
+    if len(color) == 3:
+        return "#{:02x}{:02x}{:02x}".format(*color)
+    return "#{:02x}{:02x}{:02x}{:02x}".format(*color)
+
+
+def legacy_rebuild():
+    step = int(50 / 8)
+    glass = [FOREGROUND + legacy_val_to_hex((i + 1) * step) for i in range(8)]
+    glass += [FOREGROUND + legacy_val_to_hex(30) for i in range(8)]
+    gradient = [legacy_rgba_to_hex((150, 150, 150, i)) for i in range(0, 255, 20)]
+    return glass, gradient
+
+
+PALETTE = colors.Palette(FOREGROUND, 50)
+
+
+def engine_rebuild():
+    glass = [PALETTE.background(i, 8) for i in range(8)]
+    glass += [colors.with_alpha(FOREGROUND, 30)] * 8
+    gradient = colors.alpha_ramp((150, 150, 150), 0, 240, 13)
+    return glass, gradient
+
+
+def main(rebuilds=10000):
+    colors.cache_clear()
+    cold = timeit.timeit(engine_rebuild, number=1)
+    for name, fn in (("legacy", legacy_rebuild), ("colors", engine_rebuild)):
+        total = timeit.timeit(fn, number=rebuilds)
+        print("{:8} {:8.2f} us/rebuild".format(name, total / rebuilds * 1e6))
+    print("{:8} {:8.2f} us (first rebuild, empty cache)".format("cold", cold * 1e6))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,146 @@
+"""Config load time against recording stubs of libqtile and qtile_extras.
+
+Each config is executed the way a reload does it, with the helper modules
+already imported (warm) and once with them evicted (cold). Reports wall time,
+allocations and gc objects per widget, and exits with 1 when the median warm
+load regressed past the stored baseline.
+
+    python bench/bench_config_load.py [--runs N] [--update-baseline]
+"""
+import argparse
+import gc
+import json
+import os
+import runpy
+import statistics
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONFIG_DIR = os.path.join(HERE, "..", "src", "qtile")
+BASELINE = os.path.join(HERE, "baseline", "config_load.json")
+CONFIGS = ("glassmorphism", "powerline")
+sys.path[:0] = [os.path.join(HERE, "stubs"), CONFIG_DIR]
+
+import recorder  # noqa: E402
+from libqtile.widget import base  # noqa: E402
+from qtile_extras.widget.decorations import _Decoration  # noqa: E402
+
+CONFIG_MODULES = {
+    name[:-3] for name in os.listdir(CONFIG_DIR) if name.endswith(".py")
+} - set(CONFIGS)
+
+
+def load(name) -> dict:
+    recorder.reset()
+    return runpy.run_path(os.path.join(CONFIG_DIR, name + ".py"), run_name=name)
+
+
+def evict():
+    for module in CONFIG_MODULES:
+        sys.modules.pop(module, None)
+
+
+def measure(name, runs) -> dict:
+    evict()
+    start = time.perf_counter()
+    load(name)
+    cold = time.perf_counter() - start
+
+    warm = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        load(name)
+        warm.append(time.perf_counter() - start)
+
+    gc.collect()
+    objects = len(gc.get_objects())
+    tracemalloc.start()
+    load(name)
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = sum(s.count for s in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    objects = len(gc.get_objects()) - objects
+
+    widgets = [r for r in recorder.RECORDS if isinstance(r, base._Widget)]
+    decorations = [r for r in recorder.RECORDS if isinstance(r, _Decoration)]
+    # shared decorations such as HIGHLIGHT count once
+    used = {id(d) for w in widgets for d in w.config.get("decorations", ())}
+    per_class = {}
+    for widget in widgets:
+        cls = type(widget).__name__
+        per_class[cls] = per_class.get(cls, 0) + 1
+    count = max(len(widgets), 1)
+    return {
+        "cold_ms": cold * 1e3,
+        "wall_ms": statistics.median(warm) * 1e3,
+        "wall_min_ms": min(warm) * 1e3,
+        "widgets": len(widgets),
+        "decorations": len(decorations),
+        "decorations_used": len(used),
+        "objects": len(recorder.RECORDS),
+        "alloc_bytes": current,
+        "alloc_peak_bytes": peak,
+        "alloc_blocks": blocks,
+        "bytes_per_widget": current / count,
+        "gc_objects_per_widget": objects / count,
+        "widget_classes": per_class,
+        "plans": dict(sys.modules["barspec"].STATS),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print raw results")
+    args = parser.parse_args(argv)
+
+    results = {name: measure(name, args.runs) for name in CONFIGS}
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        for name, r in results.items():
+            print(
+                "{:14} warm {:7.2f} ms  cold {:7.2f} ms  {:3d} widgets  "
+                "{:3d} decorations  {:7.0f} B/widget  {:5.0f} objects/widget".format(
+                    name,
+                    r["wall_ms"],
+                    r["cold_ms"],
+                    r["widgets"],
+                    r["decorations_used"],
+                    r["bytes_per_widget"],
+                    r["gc_objects_per_widget"],
+                )
+            )
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+        with open(BASELINE, "w") as f:
+            json.dump(
+                {n: {"wall_ms": round(r["wall_ms"], 3)} for n, r in results.items()},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        return 0
+    try:
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    except OSError:
+        print("no baseline, run with --update-baseline")
+        return 0
+    failed = False
+    for name, r in results.items():
+        limit = baseline[name]["wall_ms"] * (1 + args.tolerance)
+        if r["wall_ms"] > limit:
+            print("{}: {:.2f} ms exceeds {:.2f} ms".format(name, r["wall_ms"], limit))
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
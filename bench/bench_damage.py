@@ -0,0 +1,85 @@
+"""Fills, draw calls and damaged pixels of each config's bars, with and
+without damage.py.
+
+Every bar is configured on a HeadlessBar twice, as is and with its widgets
+passed through damage.prepare and damage.track like FrameBar and BackdropBar
+do, then painted for a number of frames. Reports per frame the background
+fills, the drawer draws that reached the bar surface and the pixels they
+copied, which is the damage the compositor would blend again.
+
+    python bench/bench_damage.py [frames] [width]
+"""
+import sys
+
+import headless
+
+import damage
+from bench_render import config_bars
+
+CONFIGS = ("glassmorphism", "powerline")
+
+
+def count_fills(widgets):
+    fills = {"count": 0}
+    for widget in widgets:
+        drawer = getattr(widget, "drawer", None)
+        if drawer is None:
+            continue
+        clear = drawer.clear
+
+        def counted(colour, clear=clear):
+            fills["count"] += 1
+            clear(colour)
+
+        drawer.clear = counted
+    return fills
+
+
+def measure(widgets, width, height, background, frames, tracked) -> dict:
+    bar = headless.HeadlessBar(widgets, width, height, background)
+    if tracked:
+        for widget in widgets:
+            damage.prepare(widget)
+    bar.configure()
+    # counted outside of damage.py's wrapper, so skipped fills are not counted
+    fills = count_fills(bar.widgets)
+    if tracked:
+        for widget in bar.widgets:
+            damage.track(widget)
+    bar.paint()
+    bar.draw_calls = bar.painted_pixels = fills["count"] = 0
+    for _ in range(frames):
+        bar.paint()
+    result = {
+        "fills": fills["count"] / frames,
+        "draw_calls": bar.draw_calls / frames,
+        "pixels": bar.painted_pixels / frames,
+    }
+    bar.finalize()
+    return result
+
+
+def main(frames=20, width=1920):
+    for name in CONFIGS:
+        for tracked in (False, True):
+            damage.STATS.clear()
+            total = {"fills": 0, "draw_calls": 0, "pixels": 0}
+            for _, b in config_bars(name):
+                r = measure(b.widgets, width, b.size, b.background, frames, tracked)
+                for key in total:
+                    total[key] += r[key]
+            print(
+                "{:14} {:8} {:6.1f} fills {:6.1f} draw calls {:9.0f} px/frame  "
+                "{} decorations dropped".format(
+                    name,
+                    "damage" if tracked else "as is",
+                    total["fills"],
+                    total["draw_calls"],
+                    total["pixels"],
+                    damage.STATS["decorations_dropped"],
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""Hotplug storm against geometry.ScreenLayout, with the powerline config's
+layout and screens built from the recording stubs.
+
+Each event connects, disconnects or changes the mode of one of many monitors,
+the way a flaky dock does. "reload" builds every screen again per event, which
+is what a config reload with hardcoded geometry ends in; "engine" updates one
+ScreenLayout in place.
+
+    python bench/bench_geometry.py [events] [monitors] [seed]
+"""
+import os
+import random
+import runpy
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONFIG_DIR = os.path.join(HERE, "..", "src", "qtile")
+sys.path[:0] = [os.path.join(HERE, "stubs"), CONFIG_DIR]
+
+import geometry  # noqa: E402
+import recorder  # noqa: E402
+
+MODES = ((1366, 768), (1920, 1080), (2560, 1440), (3840, 2160), (1280, 1024))
+
+
+def storm(events, monitors, seed) -> list:
+    """Return the connected outputs after each event, monitors side by side."""
+    rng = random.Random(seed)
+    modes = [rng.choice(MODES) for _ in range(monitors)]
+    connected = [True] + [False] * (monitors - 1)
+    states = []
+    for _ in range(events):
+        i = rng.randrange(monitors)
+        if i and rng.random() < 0.7:
+            connected[i] = not connected[i]
+        else:
+            modes[i] = rng.choice(MODES)
+        x, outputs = 0, []
+        for mode, on in zip(modes, connected):
+            if on:
+                outputs.append(geometry.Rect(x, 0, *mode))
+                x += mode[0]
+        states.append(tuple(outputs))
+    return states
+
+
+def run(states, config, incremental) -> dict:
+    def new_layout():
+        return geometry.ScreenLayout(config["layout_output"], config["init_screen"])
+
+    layout = new_layout()
+    totals = dict(built=0, moved=0, hits=0)
+    start = time.perf_counter()
+    for outputs in states:
+        recorder.reset()
+        if not incremental:
+            for key in totals:
+                totals[key] += getattr(layout, key)
+            layout = new_layout()
+        layout.update(outputs)
+    elapsed = time.perf_counter() - start
+    for key in totals:
+        totals[key] += getattr(layout, key)
+    return dict(totals, us_per_event=elapsed / len(states) * 1e6)
+
+
+def main(events=2000, monitors=8, seed=1):
+    config = runpy.run_path(os.path.join(CONFIG_DIR, "powerline.py"))
+    states = storm(events, monitors, seed)
+    for name, incremental in (("reload", False), ("engine", True)):
+        r = run(states, config, incremental)
+        print(
+            "{:7} {:9.1f} us/event  {:6d} screens built  {:5d} moved  "
+            "{:5d} cached layouts reused".format(
+                name, r["us_per_event"], r["built"], r["moved"], r["hits"]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,84 @@
+"""Compositor governor against a fake sysfs and /proc tree.
+
+Replays a synthetic day, 5 second samples: a noisy build load hovering around
+the thresholds, then unplugging and draining the battery. The governor reads
+every sample through a Sampler rooted at the fake tree, once with its default
+hysteresis and once without, and reports picom reloads and time per profile.
+
+    python bench/bench_governor.py [hours] [seed]
+"""
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src", "qtile"))
+# after site-packages: qtile's logger if installed, the stub otherwise
+sys.path.append(os.path.join(HERE, "stubs"))
+
+from governor import ORDER, Governor  # noqa: E402
+from sampler import LOADAVG, Sampler  # noqa: E402
+
+STEP = 5  # seconds between samples
+CPUS = 4
+SUPPLY = os.path.join("sys", "class", "power_supply", "BAT0")
+
+
+def write(root, source, text):
+    path = os.path.join(root, source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def trace(hours, seed) -> list:
+    """(load per cpu, discharging, capacity) per sample."""
+    rng = random.Random(seed)
+    samples = int(hours * 3600 / STEP)
+    load, capacity, states = 0.3, 100.0, []
+    for i in range(samples):
+        phase = i / samples
+        base = 0.85 if 0.2 < phase < 0.5 else 0.3  # a long build
+        load += (base - load) * 0.05 + rng.gauss(0, 0.08)
+        load = max(load, 0.0)
+        discharging = phase > 0.6
+        if discharging:
+            capacity = max(capacity - 100 / (0.4 * samples), 5)
+        states.append((load, discharging, capacity))
+    return states
+
+
+def run(root, states, **options) -> dict:
+    sampler = Sampler(root=root)
+    applied = []
+    governor = Governor(applied.append, sampler=sampler, cpus=CPUS, **options)
+    time_in = Counter()
+    for i, (load, discharging, capacity) in enumerate(states):
+        write(root, LOADAVG, "{:.2f} 0.00 0.00 1/100 1\n".format(load * CPUS))
+        status = "Discharging" if discharging else "Charging"
+        write(root, os.path.join(SUPPLY, "status"), status + "\n")
+        write(root, os.path.join(SUPPLY, "capacity"), "{}\n".format(int(capacity)))
+        sample = sampler.sample(governor.sources)
+        governor.decide(governor.inputs(sample), now=i * STEP)
+        time_in[governor.profile] += STEP
+    sampler.close()
+    return {"reloads": len(applied), "time": time_in}
+
+
+def main(hours=8, seed=1):
+    states = trace(hours, seed)
+    without = dict(degrade_after=0, recover_after=0, load_margin=0, capacity_margin=0)
+    with tempfile.TemporaryDirectory() as root:
+        for name, options in (("hysteresis", {}), ("none", without)):
+            r = run(root, states, **options)
+            shares = "  ".join(
+                "{} {:4.1f}%".format(p, 100 * r["time"][p] / (len(states) * STEP))
+                for p in ORDER
+            )
+            print("{:10} {:5d} picom reloads  {}".format(name, r["reloads"], shares))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
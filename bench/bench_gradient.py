@@ -0,0 +1,82 @@
+"""Memory and draw time of the gradient bar, 13 TextBoxes vs one GradientWidget.
+
+    python bench/bench_gradient.py [frames]
+"""
+import gc
+import statistics
+import sys
+import tracemalloc
+
+import headless
+from libqtile import widget
+
+import colors
+from gradient import GradientWidget
+
+RGB = (150, 150, 150)
+STEPS = 13
+FONTSIZE = 12
+
+
+def textboxes() -> list:
+    return [
+        widget.TextBox(" ", background=bg, fontsize=FONTSIZE, padding=3)
+        for bg in colors.alpha_ramp(RGB, 0, 240, STEPS)
+    ]
+
+
+def gradient(steps=STEPS) -> list:
+    return [
+        GradientWidget(
+            length=STEPS * FONTSIZE,
+            start=colors.with_alpha(RGB, 0),
+            end=colors.with_alpha(RGB, 240),
+            steps=steps,
+        )
+    ]
+
+
+def measure(factory, frames) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    bar = headless.HeadlessBar(factory())
+    bar.configure()
+    bar.paint()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    bar.draw_calls = 0
+    frame_times = [sum(bar.paint()) for _ in range(frames)]
+    result = {
+        "widgets": len(bar.widgets),
+        "python_bytes": allocated,
+        "draw_us": statistics.median(frame_times) * 1e6,
+        "draw_calls": bar.draw_calls // frames,
+        "renders": sum(getattr(w, "renders", 0) for w in bar.widgets),
+    }
+    bar.finalize()
+    return result
+
+
+def main(frames=200):
+    variants = (
+        ("13 TextBoxes", textboxes),
+        ("GradientWidget steps", gradient),
+        ("GradientWidget smooth", lambda: gradient(None)),
+    )
+    for name, factory in variants:
+        r = measure(factory, frames)
+        print(
+            "{:22} {:3d} widgets  {:8d} B python  {:8.1f} us/frame  "
+            "{:3d} draw calls/frame  {} gradient renders".format(
+                name,
+                r["widgets"],
+                r["python_bytes"],
+                r["draw_us"],
+                r["draw_calls"],
+                r["renders"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
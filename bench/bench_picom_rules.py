@@ -0,0 +1,71 @@
+"""picom condition tests per window, hand-ordered rules vs picom_conf.optimize.
+
+Draws a synthetic window set from picom_conf.WINDOWS plus windows of classes
+the rules never name, evaluates every rule list for each window in both focus
+states and counts the condition tests and their cost. Exits with 1 if an
+optimized list matches a window differently from the hand-ordered one.
+
+    python bench/bench_picom_rules.py [windows] [seed]
+"""
+import os
+import random
+import sys
+from collections import Counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src", "qtile"))
+
+import picom_conf  # noqa: E402
+
+OTHER_CLASSES = ("Thunderbird", "Slack", "mpv", "Zathura", "Steam")
+
+
+def synthetic(count, seed) -> list:
+    rng = random.Random(seed)
+    weights = [w for w, _ in picom_conf.WINDOWS]
+    windows = []
+    for _ in range(count):
+        if rng.random() < 0.2:
+            window = dict(class_g=rng.choice(OTHER_CLASSES), window_type="normal")
+            window["name"] = "{} {}".format(window["class_g"], rng.randrange(100))
+        else:
+            window = dict(rng.choices(picom_conf.WINDOWS, weights)[0][1])
+        windows.append(window)
+    return windows
+
+
+def main(count=1000, seed=1):
+    windows = synthetic(count, seed)
+    mismatches = 0
+    built = picom_conf.build()
+    for option, texts in picom_conf.RULES.items():
+        valued = option == "opacity-rule"
+        written = [picom_conf.parse_rule(t, valued) for t in texts]
+        generated = built[option]
+        stats = {name: Counter() for name in ("written", "generated")}
+        for window in windows:
+            for focused in (False, True):
+                window = dict(window, focused=focused)
+                before = picom_conf.evaluate(written, window, stats["written"])
+                after = picom_conf.evaluate(generated, window, stats["generated"])
+                mismatches += before != after
+        events = 2 * len(windows)
+        for name, counted in stats.items():
+            print(
+                "{:24} {:9} {:3d} rules  {:5.2f} tests/window  "
+                "{:6.2f} cost/window".format(
+                    option,
+                    name,
+                    len(written if name == "written" else generated),
+                    counted["tests"] / events,
+                    counted["cost"] / events,
+                )
+            )
+    if mismatches:
+        print("{} windows matched differently".format(mismatches))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
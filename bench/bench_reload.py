@@ -0,0 +1,158 @@
+"""Full vs incremental config reload against the recording stubs.
+
+Loads a config into a fake qtile, then reloads it with an unchanged config and
+with one widget option edited, once the way reload_config() does it (finalize
+everything, build and configure everything) and once with
+hot_reload.reload_bars(). Reports widgets configured (each one restarts its
+timers and first poll), widgets finalized and time to first paint. The stubs
+configure and paint for free, so the times are mostly config execution; the
+gain on a real bar is in the widgets that are not rebuilt.
+
+    python bench/bench_reload.py [runs]
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONFIG_DIR = os.path.join(HERE, "..", "src", "qtile")
+sys.path[:0] = [os.path.join(HERE, "stubs"), CONFIG_DIR]
+
+import runpy  # noqa: E402
+
+import hot_reload  # noqa: E402
+import recorder  # noqa: E402
+
+EDITS = {
+    "glassmorphism": ('"0 updates"', '"no updates"'),
+    "powerline": ('"%Y/%m/%d %a %I:%M %p"', '"%H:%M"'),
+}
+POSITIONS = hot_reload.POSITIONS
+
+
+class Handle:
+    def __init__(self, queue, callback):
+        self.queue, self.callback = queue, callback
+
+    def cancel(self):
+        if self in self.queue:
+            self.queue.remove(self)
+
+
+class FakeQtile:
+    def __init__(self, path):
+        self.config = SimpleNamespace(file_path=path)
+        self.screens = []
+        self.widgets_map = {}
+        self.queue = []
+        self.configured = 0
+
+    def call_later(self, delay, callback, *args):
+        handle = Handle(self.queue, lambda: callback(*args))
+        self.queue.append(handle)
+        return handle
+
+    call_soon = call_later
+
+    def run_pending(self):
+        while self.queue:
+            self.queue.pop(0).callback()
+
+    def register_widget(self, widget):
+        self.configured += 1
+        self.widgets_map[widget.name] = widget
+
+    def bars(self):
+        return hot_reload._bars(self.screens)
+
+    def load(self):
+        config = runpy.run_path(self.config.file_path)
+        self.screens = config.get("fake_screens") or config.get("screens")
+        for screen in self.screens:
+            for position in POSITIONS:
+                if getattr(screen, position):
+                    getattr(screen, position)._configure(self, screen)
+
+    def reload_config(self):
+        start = time.perf_counter()
+        for bar in self.bars():
+            bar.finalize()
+        self.widgets_map.clear()
+        self.load()
+        for bar in self.bars():
+            bar.draw()
+        self.run_pending()
+        return (time.perf_counter() - start) * 1e3
+
+
+def run(path, original, edit, incremental) -> dict:
+    with open(path, "w") as f:
+        f.write(original)
+    qtile = FakeQtile(path)
+    qtile.load()
+    qtile.run_pending()
+    live = [w for bar in qtile.bars() for w in bar.widgets]
+    qtile.configured = 0
+    if edit:
+        with open(path, "w") as f:
+            f.write(original.replace(*edit))
+    if incremental:
+        start = time.perf_counter()
+        hot_reload.reload_bars(qtile)
+        qtile.run_pending()
+        paint = (time.perf_counter() - start) * 1e3
+    else:
+        paint = qtile.reload_config()
+    return {
+        "paint_ms": paint,
+        "configured": qtile.configured,
+        "finalized": sum(w.finalized for w in live),
+    }
+
+
+def bench(name, edited, incremental, runs) -> dict:
+    with open(os.path.join(CONFIG_DIR, name + ".py")) as f:
+        original = f.read()
+    edit = EDITS[name] if edited else None
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, name + ".py")
+        results = []
+        for _ in range(runs):
+            recorder.reset()
+            results.append(run(path, original, edit, incremental))
+    finally:
+        shutil.rmtree(tmp)
+    return {
+        "paint_ms": statistics.median(r["paint_ms"] for r in results),
+        "configured": results[0]["configured"],
+        "finalized": results[0]["finalized"],
+    }
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for name in EDITS:
+        for edited in (False, True):
+            for incremental in (False, True):
+                r = bench(name, edited, incremental, runs)
+                print(
+                    "{:14} {:9} {:11}  first paint {:6.2f} ms  "
+                    "{:3d} widgets configured  {:3d} finalized".format(
+                        name,
+                        "edited" if edited else "unchanged",
+                        "incremental" if incremental else "full",
+                        r["paint_ms"],
+                        r["configured"],
+                        r["finalized"],
+                    )
+                )
+    print("last incremental reload:", hot_reload.LAST)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Draw cost of each config's bars, per widget and per decoration.
+
+Every bar of a config is rebuilt at each width, configured on a HeadlessBar and
+painted for a number of frames. The median draw time of each widget is split
+into the time spent in each of its decorations and the widget's own drawing.
+Results are keyed by config, width, bar and widget name so runs of different
+commits can be compared: --compare exits with 1 when a widget, decoration or
+frame got slower than the saved run by more than the tolerance.
+
+    python bench/bench_render.py [--frames N] [--output FILE] [--compare FILE]
+"""
+import argparse
+import json
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import headless
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONFIG_DIR = os.path.join(HERE, "..", "src", "qtile")
+CONFIGS = ("glassmorphism", "powerline")
+WIDTHS = (1024, 1366, 1920, 2560, 3840)
+POSITIONS = ("top", "bottom", "left", "right")
+MIN_US = 5.0  # ignore regressions smaller than this, they are timer noise
+
+
+def config_bars(name) -> list:
+    config = runpy.run_path(os.path.join(CONFIG_DIR, name + ".py"), run_name=name)
+    screens = config.get("fake_screens") or config.get("screens") or []
+    return [
+        ("{}.{}".format(i, position), getattr(screen, position))
+        for i, screen in enumerate(screens)
+        for position in POSITIONS
+        if getattr(screen, position)
+    ]
+
+
+def time_decorations(widgets, timings):
+    """Wrap each decoration's draw to add its time to timings[widget][index],
+    call after configure, which clones shared decorations per widget."""
+    for widget in widgets:
+        for index, decoration in enumerate(getattr(widget, "decorations", ())):
+
+            def draw(widget=widget, index=index, draw=decoration.draw):
+                start = time.perf_counter()
+                draw()
+                timings[widget][index] += time.perf_counter() - start
+
+            decoration.draw = draw
+
+
+def widget_keys(widgets) -> list:
+    seen = defaultdict(int)
+    keys = []
+    for widget in widgets:
+        keys.append("{}#{}".format(widget.name, seen[widget.name]))
+        seen[widget.name] += 1
+    return keys
+
+
+def measure(widgets, width, height, background, frames) -> dict:
+    bar = headless.HeadlessBar(widgets, width, height, background)
+    bar.configure()
+    decoration_times = defaultdict(lambda: defaultdict(float))
+    time_decorations(bar.widgets, decoration_times)
+    bar.paint()
+    bar.draw_calls = 0
+    draws = defaultdict(list)
+    decorations = defaultdict(lambda: defaultdict(list))
+    for _ in range(frames):
+        decoration_times.clear()
+        for widget, seconds in zip(bar.widgets, bar.paint()):
+            draws[widget].append(seconds)
+            for index, spent in decoration_times[widget].items():
+                decorations[widget][index].append(spent)
+    result = {
+        "frame_us": sum(statistics.median(t) for t in draws.values()) * 1e6,
+        "draw_calls": bar.draw_calls // frames,
+        "skipped": sorted(w.name for w, _ in bar.skipped),
+        "widgets": {},
+    }
+    for key, widget in zip(widget_keys(bar.widgets), bar.widgets):
+        decoration_us = {
+            "{}#{}".format(type(d).__name__, i): statistics.median(
+                decorations[widget][i] or [0.0]
+            )
+            * 1e6
+            for i, d in enumerate(getattr(widget, "decorations", ()))
+        }
+        draw_us = statistics.median(draws[widget]) * 1e6
+        result["widgets"][key] = {
+            "class": type(widget).__name__,
+            "length": widget.length,
+            "draw_us": draw_us,
+            "self_us": draw_us - sum(decoration_us.values()),
+            "decorations": decoration_us,
+        }
+    bar.finalize()
+    return result
+
+
+def run(frames, widths) -> dict:
+    results = {}
+    for name in CONFIGS:
+        results[name] = {}
+        for width in widths:
+            results[name][str(width)] = {
+                key: measure(b.widgets, width, b.size, b.background, frames)
+                for key, b in config_bars(name)
+            }
+    return results
+
+
+def flatten(results) -> dict:
+    """{"config/width/bar[/widget[/decoration]]": us} of every measured time."""
+    flat = {}
+    for name, widths in results.items():
+        for width, bars in widths.items():
+            for key, bar in bars.items():
+                prefix = "/".join((name, width, key))
+                flat[prefix] = bar["frame_us"]
+                for widget, r in bar["widgets"].items():
+                    flat[prefix + "/" + widget] = r["self_us"]
+                    for decoration, us in r["decorations"].items():
+                        flat["/".join((prefix, widget, decoration))] = us
+    return flat
+
+
+def compare(old, new, tolerance) -> list:
+    old, new = flatten(old), flatten(new)
+    return [
+        (key, old[key], us)
+        for key, us in sorted(new.items())
+        if key in old and us - old[key] > MIN_US and us > old[key] * (1 + tolerance)
+    ]
+
+
+def revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=HERE,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--widths", type=int, nargs="+", default=WIDTHS)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="JSON of an earlier run")
+    parser.add_argument(
+        "--tolerance", type=float, default=1.0, help="1.0 flags a doubled draw"
+    )
+    parser.add_argument("--json", action="store_true", help="print raw results")
+    args = parser.parse_args(argv)
+
+    results = run(args.frames, args.widths)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"revision": revision(), "results": results},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        for name, widths in results.items():
+            for width, bars in widths.items():
+                for key, bar in bars.items():
+                    decorated = sum(
+                        sum(r["decorations"].values()) for r in bar["widgets"].values()
+                    )
+                    print(
+                        "{:14} {:>5} {:8} {:8.1f} us/frame  {:6.1f} us decorations  "
+                        "{:3d} widgets  {:3d} draw calls  skipped {}".format(
+                            name,
+                            width,
+                            key,
+                            bar["frame_us"],
+                            decorated,
+                            len(bar["widgets"]),
+                            bar["draw_calls"],
+                            ", ".join(bar["skipped"]) or "-",
+                        )
+                    )
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as f:
+        old = json.load(f)
+    slower = compare(old["results"], results, args.tolerance)
+    for key, before, after in slower:
+        print("{}: {:.1f} us -> {:.1f} us".format(key, before, after))
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
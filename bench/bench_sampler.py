@@ -0,0 +1,73 @@
+"""Compare per-widget reopen+parse against the shared pread sampler.
+
+Runs against a fake /proc tree written to a temporary directory, or against
+the real one with --real.
+
+    python bench/bench_sampler.py [--real] [ticks]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "qtile"))
+# after site-packages: qtile's logger if installed, the stub otherwise
+sys.path.append(os.path.join(os.path.dirname(__file__), "stubs"))
+import sampler  # noqa: E402
+
+THERMAL = "sys/class/thermal/thermal_zone0/temp"
+FAKE = {
+    sampler.STAT: "cpu  4705 356 584 3699 23 23 0 0 0 0\n"
+    "cpu0 4705 356 584 3699 23 23 0 0 0 0\n",
+    sampler.MEMINFO: "MemTotal: 16318096 kB\nMemFree: 8000000 kB\n"
+    "MemAvailable: 12000000 kB\nSwapTotal: 2097148 kB\nSwapFree: 2097148 kB\n",
+    sampler.CPUINFO: "processor\t: 0\ncpu MHz\t\t: 2400.000\n"
+    "processor\t: 1\ncpu MHz\t\t: 1800.000\n",
+    sampler.NET_DEV: "Inter-|   Receive\n face |bytes\n"
+    "  eth0: 1000 10 0 0 0 0 0 0 2000 20 0 0 0 0 0 0\n",
+    THERMAL: "45000\n",
+}
+SOURCES = [sampler.STAT, sampler.CPUINFO, sampler.MEMINFO, sampler.NET_DEV, THERMAL]
+
+
+def make_fake_root(root):
+    for source, text in FAKE.items():
+        path = os.path.join(root, source)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+
+def legacy_tick(root):
+    # every widget opens and parses its own files, CPU reads /proc/stat twice
+    for source in [sampler.STAT] + SOURCES:
+        try:
+            with open(os.path.join(root, source)) as f:
+                sampler.PARSERS.get(source, sampler.parse_int)(f.read())
+        except OSError:
+            pass
+    os.statvfs(root)
+
+
+def main(argv):
+    real = "--real" in argv
+    ticks = int(next((a for a in argv if a.isdigit()), 2000))
+    with tempfile.TemporaryDirectory() as tmp:
+        root = "/" if real else tmp
+        if not real:
+            make_fake_root(tmp)
+        shared = sampler.Sampler(root=root)
+        sources = SOURCES + [sampler.STATVFS + "/"]
+        shared.subscribe(lambda sample: None, sources)
+        legacy = timeit.timeit(lambda: legacy_tick(root), number=ticks)
+        pooled = timeit.timeit(shared.tick, number=ticks)
+        print("root:", root)
+        print("{:8} {:8.2f} us/tick".format("legacy", legacy / ticks * 1e6))
+        print("{:8} {:8.2f} us/tick".format("sampler", pooled / ticks * 1e6))
+        print("open fds:", len(shared._fds), "reads:", shared.reads)
+        print("sample:", shared.tick())
+        shared.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,96 @@
+"""Wakeups and staleness of polling vs SysfsWatcher on a fake sysfs tree.
+
+Writes a few brightness changes into a fake /sys/class/backlight over a few
+seconds and counts how often each mode woke up and how long the displayed
+value lagged behind.
+
+    python bench/bench_sysfs_watch.py [seconds] [changes] [poll_interval]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "qtile"))
+from sysfs_watch import SysfsWatcher  # noqa: E402
+
+
+class Display:
+    def __init__(self, path):
+        self.path = path
+        self.wakeups = 0
+        self.value = None
+        self.lags = []
+        self.written = {}
+
+    def refresh(self):
+        self.wakeups += 1
+        with open(self.path) as f:
+            value = f.read().strip()
+        if value != self.value and value in self.written:
+            self.lags.append(time.perf_counter() - self.written[value])
+        self.value = value
+
+
+async def write_changes(path, display, seconds, changes):
+    rng = random.Random(0)  # same irregular key presses for both modes
+    for i in range(changes):
+        await asyncio.sleep(seconds / changes * rng.uniform(0.5, 1.5))
+        with open(path, "w") as f:
+            f.write(str(100 + i))
+        display.written[str(100 + i)] = time.perf_counter()
+
+
+async def polling(path, seconds, changes, interval):
+    display = Display(path)
+
+    async def poll():
+        while True:
+            display.refresh()
+            await asyncio.sleep(interval)
+
+    task = asyncio.ensure_future(poll())
+    await write_changes(path, display, seconds, changes)
+    await asyncio.sleep(interval)
+    task.cancel()
+    return display
+
+
+async def watching(path, seconds, changes):
+    display = Display(path)
+    watcher = SysfsWatcher([path], display.refresh)
+    assert watcher.start(), "inotify unavailable"
+    display.refresh()
+    await write_changes(path, display, seconds, changes)
+    await asyncio.sleep(0.05)
+    watcher.stop()
+    return display
+
+
+def report(name, display):
+    lags = display.lags or [float("nan")]
+    print(
+        "{:8} wakeups {:4d}  mean lag {:8.2f} ms  max lag {:8.2f} ms".format(
+            name, display.wakeups, sum(lags) / len(lags) * 1e3, max(lags) * 1e3
+        )
+    )
+
+
+async def main(seconds=3.0, changes=5, interval=1.0):
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, "class", "backlight", "intel_backlight")
+        os.makedirs(folder)
+        path = os.path.join(folder, "brightness")
+        with open(path, "w") as f:
+            f.write("50")
+        report("polling", await polling(path, seconds, changes, interval))
+        report("events", await watching(path, seconds, changes))
+
+
+if __name__ == "__main__":
+    args = [float(a) for a in sys.argv[1:]]
+    if len(args) > 1:
+        args[1] = int(args[1])
+    asyncio.run(main(*args))
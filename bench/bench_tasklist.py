@@ -0,0 +1,95 @@
+"""Window storm: TaskList vs VirtualTaskList redraw cost as windows grow.
+
+Each redraw moves the focus to a random window near the current one and now
+and then renames a window, like a browser or terminal changing its title.
+
+    python bench/bench_tasklist.py [redraws] [seed]
+"""
+import random
+import statistics
+import sys
+import time
+
+import headless
+from libqtile import widget
+
+from tasklist import VirtualTaskList
+
+COUNTS = (25, 50, 100, 200, 400, 800)
+OPTIONS = dict(highlight_method="block", icon_size=0, rounded=True, margin=3)
+RENAMES = 0.1  # redraws that also rename a window
+
+
+class Core:
+    name = "headless"
+
+
+class Group:
+    def __init__(self):
+        self.windows = []
+        self.current_window = None
+
+
+class Window:
+    urgent = minimized = maximized = floating = fullscreen = False
+
+    def __init__(self, wid, group):
+        self.wid = wid
+        self.name = "window {} - Mozilla Firefox".format(wid)
+        self.group = group
+        self.icons = {}
+
+
+class Screen:
+    def __init__(self, group):
+        self.group = group
+
+
+def storm(cls, count, redraws, seed) -> dict:
+    rng = random.Random(seed)
+    group = Group()
+    group.windows = [Window(i, group) for i in range(count)]
+    group.current_window = group.windows[0]
+    bar = headless.HeadlessBar([cls(**OPTIONS)], width=1920)
+    bar.qtile.core = Core()
+    bar.screen = Screen(group)
+    bar.configure()
+    tasklist = bar.widgets[0]
+    tasklist.draw()
+    bar.draw_calls = 0
+    times = []
+    for _ in range(redraws):
+        index = group.windows.index(group.current_window) + rng.randint(-3, 3)
+        group.current_window = group.windows[max(0, min(count - 1, index))]
+        if rng.random() < RENAMES:
+            rng.choice(group.windows).name += "!"
+        start = time.perf_counter()
+        tasklist.draw()
+        times.append(time.perf_counter() - start)
+    result = {
+        "us": statistics.median(times) * 1e6,
+        "rendered": getattr(tasklist, "rendered", None),
+        "blitted": getattr(tasklist, "blitted", None),
+    }
+    bar.finalize()
+    return result
+
+
+def main(redraws=200, seed=1):
+    for count in COUNTS:
+        for name, cls in (("TaskList", widget.TaskList), ("Virtual", VirtualTaskList)):
+            r = storm(cls, count, redraws, seed)
+            extra = ""
+            if r["rendered"] is not None:
+                extra = "  {} boxes rendered, {} blitted".format(
+                    r["rendered"], r["blitted"]
+                )
+            print(
+                "{:4d} windows  {:9} {:9.1f} us/redraw{}".format(
+                    count, name, r["us"], extra
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,95 @@
+"""TaskList title truncation per redraw, with hundreds of windows.
+
+Compares the old 10 character cut, fitting titles to the pixel budget by
+measuring every redraw, and titles.fit with its glyph and title caches. A few
+titles change between redraws, like terminals showing the running command.
+Widths come from pango when libqtile is installed, else from monospace cells.
+
+    python bench/bench_titles.py [windows] [redraws] [seed]
+"""
+import os
+import random
+import sys
+import time
+import unicodedata
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src", "qtile"))
+
+import titles  # noqa: E402
+
+FONT = "JetBrainsMono Nerd Font"
+FONTSIZE = 12
+BUDGET = 8 * FONTSIZE
+CHANGED = 0.02  # share of titles that change between redraws
+WORDS = (
+    "Mozilla Firefox",
+    "nvim config.py",
+    "~/src/qtile-configs",
+    unicodedata.normalize("NFD", "Résumé — Évènements à venir"),
+    "漢字のタイトル",
+    "\U0001F468\u200d\U0001F469\u200d\U0001F467 family",
+    "\U0001F1FA\U0001F1F8 news",
+    "Slack | #general",
+)
+
+
+def chars(title) -> str:
+    return title if len(title) <= 10 else title[:10] + "..."
+
+
+def measured(title) -> str:
+    """Pixel fit without caches, measuring every cluster on every redraw."""
+    measure = titles.metrics(FONT, FONTSIZE).measure
+    clusters = titles.graphemes(title)
+    widths = [measure(c) for c in clusters]
+    if sum(widths) <= BUDGET:
+        return title
+    room, used, count = BUDGET - measure(titles.ELLIPSIS), 0, 0
+    while count < len(widths) and used + widths[count] <= room:
+        used += widths[count]
+        count += 1
+    return "".join(clusters[:count]).rstrip() + titles.ELLIPSIS
+
+
+def memoized(title) -> str:
+    return titles.fit(title, FONT, FONTSIZE, BUDGET)
+
+
+def title(rng) -> str:
+    words = rng.sample(WORDS, rng.randint(1, 3))
+    return "{} {}".format(" - ".join(words), rng.randrange(99))
+
+
+def run(truncate, windows, redraws, seed) -> float:
+    rng = random.Random(seed)
+    names = [title(rng) for _ in range(windows)]
+    elapsed = 0.0
+    for _ in range(redraws):
+        for i in rng.sample(range(windows), int(windows * CHANGED)):
+            names[i] = title(rng)
+        start = time.perf_counter()
+        for name in names:
+            truncate(name)
+        elapsed += time.perf_counter() - start
+    return elapsed / redraws
+
+
+def main(windows=300, redraws=200, seed=1):
+    print("widths from", "cells" if titles.pangocffi is None else "pango")
+    for name, truncate in (
+        ("10 chars", chars),
+        ("pixel fit", measured),
+        ("titles.fit", memoized),
+    ):
+        titles.cache_clear()
+        us = run(truncate, windows, redraws, seed) * 1e6
+        print(
+            "{:10} {:9.1f} us/redraw  {:6.2f} us/title".format(name, us, us / windows)
+        )
+    info = titles.fit.cache_info()
+    print("titles.fit cache: {} hits, {} misses".format(info.hits, info.misses))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,111 @@
+"""Forks and key-to-display latency for a held volume key.
+
+Compares the old `sh -c 'pactl ...; pactl ...'` binding with VolumeController
+on a fake pactl script, and on a fake persistent connection.
+
+    python bench/bench_volume.py [presses] [repeat_ms] [server_ms]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "qtile"))
+# after site-packages: qtile's logger if installed, the stub otherwise
+sys.path.append(os.path.join(os.path.dirname(__file__), "stubs"))
+from audio import PactlBackend, VolumeController  # noqa: E402
+
+FAKE_PACTL = """#!/bin/sh
+sleep {delay}
+case "$1" in
+    get-sink-volume) echo "Volume: front-left: 32768 /  50% / -18.06 dB";;
+    get-sink-mute) echo "Mute: no";;
+esac
+"""
+
+
+class FakeConnection:
+    """Stands in for one open connection to the sound server."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.state = [50, False]
+
+    async def get(self):
+        await asyncio.sleep(self.delay)
+        return tuple(self.state)
+
+    async def set_volume(self, percent):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        self.state[0] = percent
+
+    async def set_mute(self, muted):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        self.state[1] = muted
+
+
+async def legacy(pactl, presses, repeat):
+    cmd = (
+        "sh -c '{0} set-sink-mute @DEFAULT_SINK@ false; "
+        "{0} set-sink-volume @DEFAULT_SINK@ +1%'"
+    )
+    procs = []
+    start = time.perf_counter()
+    for _ in range(presses):
+        procs.append(await asyncio.create_subprocess_shell(cmd.format(pactl)))
+        await asyncio.sleep(repeat)
+    released = time.perf_counter()
+    await asyncio.gather(*(p.wait() for p in procs))
+    done = time.perf_counter()
+    # lazy.spawn forks the shell, which forks pactl twice
+    return 3 * presses, float("nan"), done - released, done - start
+
+
+async def controlled(backend, presses, repeat):
+    controller = VolumeController(backend)
+    lags = []
+    pressed = []
+    controller.listeners.append(
+        lambda volume, muted: lags.append(time.perf_counter() - pressed[-1])
+    )
+    start = time.perf_counter()
+    for _ in range(presses):
+        pressed.append(time.perf_counter())
+        controller.change(1)
+        await asyncio.sleep(repeat)
+    released = time.perf_counter()
+    while controller._task is not None:
+        await asyncio.sleep(0.001)
+    done = time.perf_counter()
+    forks = getattr(backend, "spawns", 0)
+    return forks, max(lags), done - released, done - start
+
+
+def report(name, result):
+    forks, display, settle, total = result
+    print(
+        "{:10} forks {:4d}  max key->display {:7.2f} ms  "
+        "settled {:7.1f} ms after release".format(
+            name, forks, display * 1e3, settle * 1e3
+        )
+    )
+
+
+async def main(presses=30, repeat_ms=25, server_ms=40):
+    repeat, delay = repeat_ms / 1000, server_ms / 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        pactl = os.path.join(tmp, "pactl")
+        with open(pactl, "w") as f:
+            f.write(FAKE_PACTL.format(delay=delay))
+        os.chmod(pactl, 0o755)
+        report("sh -c", await legacy(pactl, presses, repeat))
+        report("pactl", await controlled(PactlBackend(pactl), presses, repeat))
+        report("persistent", await controlled(FakeConnection(delay), presses, repeat))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,89 @@
+"""Wallpaper painting on reload, qtile's decode and scale vs wallpaper.py.
+
+Writes a synthetic 8K png and paints it onto a root surface for every output,
+the way qtile's painter does on each start, reload and screen change:
+
+    uncached  decode the original, scale it onto the output
+    cold      first reload with the cache, also writes the screen sized copies
+    warm      decode the cached copy and paint it 1:1, what qtile does on a hit
+    mapped    memory-map the cached copy instead of decoding it
+
+    python bench/bench_wallpaper.py [reloads] [wallpaper]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import headless  # noqa: F401, exits without libqtile and cairocffi
+import cairocffi
+
+import wallpaper
+from bench_backdrop import synthetic
+
+OUTPUTS = ((0, 0, 3840, 2160), (3840, 0, 2560, 1440), (6400, 0, 1920, 1080))
+MODE = "fill"
+
+
+def paint(root, image, x, y, width, height, mode):
+    ctx = cairocffi.Context(root)
+    ctx.rectangle(x, y, width, height)
+    ctx.clip()
+    ctx.translate(x, y)
+    ctx.transform(wallpaper.place(image, width, height, mode))
+    ctx.set_source_surface(image)
+    ctx.paint()
+
+
+def uncached(root, path, cache):
+    for x, y, width, height in OUTPUTS:
+        paint(root, wallpaper.decode(path), x, y, width, height, MODE)
+
+
+def cached(root, path, cache):
+    for x, y, width, height in OUTPUTS:
+        copy = cache.scaled(path, width, height, MODE)
+        paint(root, wallpaper.decode(copy), x, y, width, height, None)
+
+
+def mapped(root, path, cache):
+    cache.clear()  # a reload starts without mappings
+    for x, y, width, height in OUTPUTS:
+        image = cache.surface(path, width, height, MODE)
+        paint(root, image, x, y, width, height, None)
+
+
+def timed(function, root, path, cache, reloads) -> float:
+    times = []
+    for _ in range(reloads):
+        start = time.perf_counter()
+        function(root, path, cache)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3
+
+
+def main(reloads=5, path=None):
+    width = max(x + w for x, _, w, _ in OUTPUTS)
+    height = max(y + h for _, y, _, h in OUTPUTS)
+    root = cairocffi.ImageSurface(cairocffi.FORMAT_RGB24, width, height)
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = os.path.join(tmp, "wallpaper.png")
+            synthetic(7680, 4320).write_to_png(path)
+        cache = wallpaper.WallpaperCache(os.path.join(tmp, "cache"))
+        results = [("uncached", timed(uncached, root, path, cache, reloads))]
+        results.append(("cold", timed(cached, root, path, cache, 1)))
+        results.append(("warm", timed(cached, root, path, cache, reloads)))
+        results.append(("mapped", timed(mapped, root, path, cache, reloads)))
+        size = sum(
+            os.path.getsize(os.path.join(cache.cache_dir, name))
+            for name in os.listdir(cache.cache_dir)
+        )
+    print("{} outputs, {:.1f} MB cached".format(len(OUTPUTS), size / 1e6))
+    for name, ms in results:
+        print("{:9} {:8.1f} ms/reload".format(name, ms))
+
+
+if __name__ == "__main__":
+    main(*[int(a) if a.isdigit() else a for a in sys.argv[1:]])
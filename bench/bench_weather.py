@@ -0,0 +1,84 @@
+"""Weather fetch latency and dedup against a local stub server.
+
+    python bench/bench_weather.py [latency_seconds]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "qtile"))
+from weather import WeatherProvider  # noqa: E402
+from bench_checkupdates import max_stall  # noqa: E402
+
+BODY = {"cod": 200, "name": "Berkeley", "main": {"temp": 61.2}}
+
+
+def serve(latency):
+    class Handler(BaseHTTPRequestHandler):
+        requests = 0
+
+        def do_GET(self):
+            Handler.requests += 1
+            time.sleep(latency)
+            data = json.dumps(BODY).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, Handler
+
+
+def timed(label, start):
+    print("{:28} {:8.2f} ms".format(label, (time.perf_counter() - start) * 1e3))
+
+
+async def main(latency):
+    server, handler = serve(latency)
+    url = "http://127.0.0.1:{}/weather?q=Berkeley".format(server.server_port)
+    with tempfile.TemporaryDirectory() as tmp:
+        blocking = await max_stall(lambda: urlopen(url).read())
+        print("{:28} {:8.2f} ms".format("blocking urlopen stall", blocking * 1e3))
+        provider = WeatherProvider(cache_dir=tmp)
+        stall = await max_stall(lambda: provider.get(url))
+        print("{:28} {:8.2f} ms".format("provider stall", stall * 1e3))
+
+        start = time.perf_counter()
+        await provider.get(url, ttl=0)
+        timed("cold fetch", start)
+        start = time.perf_counter()
+        await provider.get(url)
+        timed("fresh cache hit", start)
+
+        before = handler.requests
+        start = time.perf_counter()
+        await asyncio.gather(*(provider.get(url, ttl=0) for _ in range(10)))
+        timed("10 concurrent refreshes", start)
+        print("{:28} {:8d}".format("server requests for them", handler.requests - before))
+
+        restarted = WeatherProvider(cache_dir=tmp)
+        start = time.perf_counter()
+        restarted.cached(url)
+        timed("first value after restart", start)
+
+        server.shutdown()
+        server.server_close()
+        start = time.perf_counter()
+        body = await restarted.get(url, ttl=0)
+        timed("offline fallback", start)
+        print("offline body:", body)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.2))
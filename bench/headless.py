@@ -0,0 +1,123 @@
+"""Headless bar for benchmarks that draw real widgets.
+
+Widgets are configured against an in-memory bar: every widget drawer paints
+into one ImageSurface instead of a window, and timers are never started.
+Needs libqtile and cairocffi with pango, i.e. a machine that runs qtile, but
+no X or Wayland display.
+"""
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src", "qtile"))
+
+try:
+    import cairocffi
+    from libqtile import bar as qtile_bar
+    from libqtile.backend.base import drawer as base_drawer
+except ImportError as e:
+    sys.exit("headless benchmarks need libqtile and cairocffi: {}".format(e))
+
+
+class Handle:
+    def cancel(self):
+        pass
+
+
+class HeadlessQtile:
+    """Swallows timers, so only drawing is measured."""
+
+    def __init__(self):
+        self.widgets_map = {}
+
+    def call_soon(self, *args, **kwargs):
+        return Handle()
+
+    call_later = call_soon
+    call_soon_threadsafe = call_soon
+
+    def register_widget(self, widget):
+        self.widgets_map[widget.name] = widget
+
+
+class HeadlessDrawer(base_drawer.Drawer):
+    def __init__(self, bar, width, height):
+        base_drawer.Drawer.__init__(self, bar.qtile, bar, width, height)
+        self.bar = bar
+
+    def draw(self, offsetx=0, offsety=0, width=None, height=None, src_x=0, src_y=0):
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        self.bar.draw_calls += 1
+        self.bar.painted_pixels += width * height
+        ctx = cairocffi.Context(self.bar.surface)
+        ctx.set_operator(cairocffi.OPERATOR_SOURCE)
+        ctx.set_source_surface(self.surface, offsetx - src_x, offsety - src_y)
+        ctx.rectangle(offsetx, offsety, width, height)
+        ctx.fill()
+        # like a window drawer, start the next frame from an empty recording
+        self._reset_surface()
+
+
+class HeadlessBar:
+    horizontal = True
+
+    def __init__(self, widgets, width=1366, height=28, background="#00000000"):
+        self.qtile = HeadlessQtile()
+        self.widgets = widgets
+        self.width = self.length = width
+        self.height = self.size = height
+        self.background = background
+        self.border_width = [0, 0, 0, 0]
+        self.screen = None
+        self.window = self
+        self.surface = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, width, height)
+        self.draw_calls = 0
+        self.painted_pixels = 0
+        self.skipped = []
+
+    def create_drawer(self, width, height):
+        return HeadlessDrawer(self, width, height)
+
+    def draw(self):
+        # widgets ask for a redraw on updates, the benchmark paints explicitly
+        pass
+
+    def configure(self):
+        """Configure the widgets, the ones that need a display or a bus (e.g.
+        Systray) are dropped into skipped."""
+        configured = []
+        for widget in self.widgets:
+            try:
+                widget._configure(self.qtile, self)
+            except Exception as e:
+                self.skipped.append((widget, e))
+                continue
+            self.qtile.register_widget(widget)
+            configured.append(widget)
+        self.widgets = configured
+        self.arrange()
+
+    def arrange(self):
+        stretch = [w for w in self.widgets if w.length_type == qtile_bar.STRETCH]
+        fixed = sum(w.length for w in self.widgets if w not in stretch)
+        for widget in stretch:
+            widget.length = max(self.width - fixed, 0) // len(stretch)
+        offset = 0
+        for widget in self.widgets:
+            widget.offsetx, widget.offsety = offset, 0
+            offset += widget.length
+
+    def paint(self) -> list:
+        """Draw every widget once, return the seconds each draw took."""
+        times = []
+        for widget in self.widgets:
+            start = time.perf_counter()
+            widget.draw()
+            times.append(time.perf_counter() - start)
+        return times
+
+    def finalize(self):
+        for widget in self.widgets:
+            widget.finalize()
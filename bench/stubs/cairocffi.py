@@ -0,0 +1,12 @@
+from recorder import Recorded, stub_module_getattr
+
+FORMAT_ARGB32 = 0
+OPERATOR_SOURCE = 1
+OPERATOR_OVER = 2
+
+
+class CairoError(Exception):
+    pass
+
+
+__getattr__ = stub_module_getattr(__name__, Recorded)
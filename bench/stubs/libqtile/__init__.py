@@ -0,0 +1 @@
+qtile = None  # no running qtile, like `qtile check`
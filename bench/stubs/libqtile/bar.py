@@ -0,0 +1,38 @@
+from recorder import Recorded
+
+CALCULATED = "calculated"
+STRETCH = "stretch"
+STATIC = "static"
+
+
+class Bar(Recorded):
+    def __init__(self, widgets, size, **config):
+        Recorded.__init__(self, widgets, size, **config)
+        self.widgets = widgets
+        self.size = size
+        self.length = 0
+
+    def _configure(self, qtile, screen, reconfigure=False):
+        self.qtile, self.screen = qtile, screen
+        for widget in self.widgets:
+            if self._configure_widget(widget):
+                qtile.register_widget(widget)
+
+    def _configure_widget(self, widget):
+        # widgets' own _configure needs a running qtile, only mark them
+        widget.qtile, widget.bar = self.qtile, self
+        widget.configured = True
+        return True
+
+    def _resize(self, length, widgets):
+        pass
+
+    def draw(self):
+        self._actual_draw()
+
+    def _actual_draw(self):
+        self.paints = getattr(self, "paints", 0) + 1
+
+    def finalize(self):
+        for widget in self.widgets:
+            widget.finalize()
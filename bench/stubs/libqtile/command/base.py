@@ -0,0 +1,5 @@
+def expose_command(name=None):
+    def decorator(method):
+        return method
+
+    return decorator
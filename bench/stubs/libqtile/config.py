@@ -0,0 +1,13 @@
+from recorder import Recorded, stub_module_getattr
+
+__getattr__ = stub_module_getattr(__name__, Recorded)
+
+
+class Group(Recorded):
+    def __init__(self, name, **config):
+        Recorded.__init__(self, name, **config)
+        self.name = name
+
+
+class Screen(Recorded):
+    top = bottom = left = right = None
@@ -0,0 +1,18 @@
+subscriptions = {}
+
+
+class _Subscribe:
+    """hook.subscribe.<event> decorators that only record the function."""
+
+    def __getattr__(self, event):
+        if event.startswith("__"):
+            raise AttributeError(event)
+
+        def subscribe(func):
+            subscriptions.setdefault(event, []).append(func)
+            return func
+
+        return subscribe
+
+
+subscribe = _Subscribe()
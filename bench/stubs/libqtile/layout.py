@@ -0,0 +1,7 @@
+from recorder import Recorded, _StubMeta, stub_module_getattr
+
+__getattr__ = stub_module_getattr(__name__, Recorded)
+
+
+class Floating(Recorded, metaclass=_StubMeta):
+    default_float_rules = []
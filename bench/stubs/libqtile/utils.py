@@ -0,0 +1,2 @@
+def guess_terminal(*args):
+    return "xterm"
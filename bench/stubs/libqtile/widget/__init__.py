@@ -0,0 +1,4 @@
+from recorder import stub_module_getattr
+from libqtile.widget import base
+
+__getattr__ = stub_module_getattr(__name__, base._TextBox)
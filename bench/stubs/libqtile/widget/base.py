@@ -0,0 +1,35 @@
+from recorder import Recorded, _StubMeta
+
+
+class _Widget(Recorded, metaclass=_StubMeta):
+    configured = False
+    finalized = False
+
+    def __init__(self, length=None, **config):
+        Recorded.__init__(self, **config)
+        self.length = length
+        self.name = config.get("name", type(self).__name__.lower())
+
+    def draw(self):
+        pass
+
+    def finalize(self):
+        self.finalized = True
+
+
+class PaddingMixin:
+    pass
+
+
+class _TextBox(_Widget):
+    def __init__(self, text=" ", **config):
+        _Widget.__init__(self, **config)
+        self.text = text
+
+
+class InLoopPollText(_TextBox):
+    pass
+
+
+class ThreadPoolText(_TextBox):
+    pass
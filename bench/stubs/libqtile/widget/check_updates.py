@@ -0,0 +1 @@
+CMD_DICT = {}
@@ -0,0 +1,8 @@
+from recorder import stub_module_getattr
+from libqtile.widget import base
+
+__getattr__ = stub_module_getattr(__name__, base._TextBox)
+
+
+def modify(classdef, *args, initialise=True, **config):
+    return classdef(*args, **config) if initialise else classdef
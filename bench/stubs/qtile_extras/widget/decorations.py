@@ -0,0 +1,17 @@
+from recorder import Recorded
+
+
+class _Decoration(Recorded):
+    pass
+
+
+class RectDecoration(_Decoration):
+    pass
+
+
+class BorderDecoration(_Decoration):
+    pass
+
+
+class PowerLineDecoration(_Decoration):
+    pass
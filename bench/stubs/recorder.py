@@ -0,0 +1,51 @@
+"""Recording stand-ins for the libqtile, qtile_extras and cairocffi objects the
+configs build. Every instance is appended to RECORDS with its arguments."""
+
+RECORDS = []
+
+
+class Recorded:
+    defaults = []
+
+    def __init__(self, *args, **config):
+        self.args = args
+        self.config = config
+        self._user_config = config
+        self.mouse_callbacks = {}
+        for key, value in config.items():
+            setattr(self, key, value)
+        RECORDS.append(self)
+
+    def add_defaults(self, defaults):
+        for name, value, _ in defaults:
+            if name not in self.config:
+                setattr(self, name, value)
+
+    def __repr__(self):
+        return "<{} {}>".format(type(self).__name__, self.config)
+
+
+class _StubMeta(type):
+    def __getattr__(cls, name):
+        # class attributes such as layout.Floating.default_float_rules
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return ()
+
+
+def stub_module_getattr(module_name, base):
+    """Return a module __getattr__ creating one Recorded subclass per name."""
+    classes = {}
+
+    def __getattr__(name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name not in classes:
+            classes[name] = _StubMeta(name, (base,), {"__module__": module_name})
+        return classes[name]
+
+    return __getattr__
+
+
+def reset():
+    RECORDS.clear()
@@ -0,0 +1,163 @@
+"""Widgets whose backend work runs on the asyncio loop instead of a timer thread.
+
+For decorations in glassmorphism.py wrap them with qtile_extras'
+widget.modify, e.g. widget.modify(async_widgets.CheckUpdates, ...).
+"""
+import os
+from abc import abstractmethod
+
+from libqtile import widget
+from libqtile.log_utils import logger
+from libqtile.widget.check_updates import CMD_DICT
+
+from update_checker import CACHE_DIR, UpdateChecker
+from weather import PROVIDER
+
+CHECKERS = {}  # (cmd, cache_file): UpdateChecker, shared between bars
+
+
+class _AsyncPoll:
+    """Run _job() on the event loop, show its result, then reschedule."""
+
+    _timer = None
+
+    @abstractmethod
+    def _job(self):
+        """Awaitable of the backend work, subclasses override it."""
+
+    @abstractmethod
+    def _job_done(self, result) -> str:
+        """Text shown for the job's result, subclasses override it."""
+
+    @abstractmethod
+    def _next_delay(self) -> float:
+        """Seconds until the next job, subclasses override it."""
+
+    def _schedule(self, delay):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self.qtile.call_later(delay, self._start_job)
+
+    def timer_setup(self):
+        self._schedule(self._next_delay())
+
+    def _start_job(self):
+        self._timer = None
+        self._job().add_done_callback(self._on_job_done)
+
+    def _on_job_done(self, task):
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning("%s: %s", self.name, task.exception())
+        elif self.configured:
+            self.update(self._job_done(task.result()))
+        if self.configured:
+            self._schedule(self._next_delay())
+
+    def force_update(self):
+        self._start_job()
+
+    def finalize(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        super().finalize()
+
+
+class CheckUpdates(_AsyncPoll, widget.CheckUpdates):
+    """CheckUpdates that never blocks and shows the cached count on reload."""
+
+    defaults = [
+        (
+            "cache_file",
+            None,
+            "File the last result is kept in. "
+            "Default ~/.cache/qtile/checkupdates-<distro>.json",
+        ),
+        ("max_backoff", 3600, "Longest retry delay in seconds after failures"),
+    ]
+
+    def __init__(self, **config):
+        widget.CheckUpdates.__init__(self, **config)
+        self.add_defaults(CheckUpdates.defaults)
+        self.checker = None
+
+    def _configure(self, qtile, bar):
+        widget.CheckUpdates._configure(self, qtile, bar)
+        cmd = self.custom_command or getattr(self, "cmd", None) or "checkupdates"
+        cache_file = self.cache_file or os.path.join(
+            CACHE_DIR, "checkupdates-{}.json".format(self.distro.lower())
+        )
+        key = (cmd, cache_file)
+        if key not in CHECKERS:
+            CHECKERS[key] = UpdateChecker(
+                cmd, cache_file, self.update_interval, self.max_backoff
+            )
+            CHECKERS[key].load()
+        self.checker = CHECKERS[key]
+        if self.checker.updates is not None:
+            self.text = self._job_done(self.checker.updates)
+
+    def _job(self):
+        return self.checker.check()
+
+    def _next_delay(self):
+        return self.checker.next_delay()
+
+    def _job_done(self, updates: int) -> str:
+        if self.custom_command:
+            updates = self.custom_command_modify(updates)
+        else:
+            # header lines the distro's command prints, e.g. Fedora's dnf
+            updates -= CMD_DICT.get(self.distro, (None, 0))[1]
+        updates = max(0, updates)
+        if updates == 0:
+            self.layout.colour = self.colour_no_updates
+            return self.no_update_string
+        self.layout.colour = self.colour_have_updates
+        return self.display_format.format(updates=updates)
+
+
+class OpenWeather(_AsyncPoll, widget.OpenWeather):
+    """OpenWeather that serves the last good response at once and offline."""
+
+    defaults = [
+        (
+            "endpoint",
+            None,
+            "Url replacing https://api.openweathermap.org/data/2.5/weather, "
+            "e.g. a local stub server",
+        ),
+        ("ttl", 600, "Seconds a cached response is used without refetching"),
+    ]
+
+    def __init__(self, **config):
+        widget.OpenWeather.__init__(self, **config)
+        self.add_defaults(OpenWeather.defaults)
+        self.provider = PROVIDER
+
+    @property
+    def weather_url(self) -> str:
+        url = self.url
+        if self.endpoint:
+            url = self.endpoint + "?" + url.partition("?")[2]
+        return url
+
+    def _configure(self, qtile, bar):
+        widget.OpenWeather._configure(self, qtile, bar)
+        body, _ = self.provider.cached(self.weather_url)
+        if body is not None:
+            self.text = self._job_done(body)
+
+    def _job(self):
+        return self.provider.get(self.weather_url, self.ttl, self.headers)
+
+    def _next_delay(self):
+        failures = self.provider.failures.get(self.weather_url, 0)
+        if failures:
+            return min(self.update_interval * 2 ** (failures - 1), 3600)
+        return max(0.0, self.ttl - self.provider.age(self.weather_url))
+
+    def _job_done(self, body) -> str:
+        return self.parse(body)
@@ -0,0 +1,168 @@
+"""Volume control without a shell and two pactl forks per key press.
+
+VolumeController keeps the wanted volume in process. Key presses only move
+that target and notify listeners (the volume widget) at once, while at most
+one commit to the sound server runs at a time, so a held key ends in a single
+write of the final value. PulseBackend keeps one connection open through
+pulsectl_asyncio, which qtile's PulseVolume already needs. Without it
+PactlBackend spawns pactl once per commit.
+"""
+import asyncio
+import re
+import time
+
+from libqtile.log_utils import logger
+
+try:
+    import pulsectl_asyncio
+except ImportError:
+    pulsectl_asyncio = None
+
+SINK = "@DEFAULT_SINK@"
+
+
+class PulseBackend:
+    def __init__(self, client_name="qtile-volume"):
+        self.client_name = client_name
+        self.pulse = None
+
+    async def _sink(self):
+        if self.pulse is None:
+            self.pulse = pulsectl_asyncio.PulseAsync(self.client_name)
+            await self.pulse.connect()
+        try:
+            info = await self.pulse.server_info()
+            return await self.pulse.get_sink_by_name(info.default_sink_name)
+        except Exception:
+            # connection dropped, e.g. the server restarted
+            self.pulse.close()
+            self.pulse = None
+            raise
+
+    async def get(self) -> tuple:
+        sink = await self._sink()
+        return round(sink.volume.value_flat * 100), bool(sink.mute)
+
+    async def set_volume(self, percent):
+        sink = await self._sink()
+        await self.pulse.volume_set_all_chans(sink, percent / 100)
+
+    async def set_mute(self, muted):
+        sink = await self._sink()
+        await self.pulse.mute(sink, muted)
+
+
+class PactlBackend:
+    def __init__(self, pactl="pactl"):
+        self.pactl = pactl
+        self.spawns = 0
+
+    async def _run(self, *args) -> str:
+        self.spawns += 1
+        proc = await asyncio.create_subprocess_exec(
+            self.pactl,
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        out, _ = await proc.communicate()
+        return out.decode(errors="replace")
+
+    async def get(self) -> tuple:
+        volume = re.search(r"(\d+)%", await self._run("get-sink-volume", SINK))
+        muted = "yes" in await self._run("get-sink-mute", SINK)
+        return int(volume.group(1)) if volume else 0, muted
+
+    async def set_volume(self, percent):
+        await self._run("set-sink-volume", SINK, "{}%".format(percent))
+
+    async def set_mute(self, muted):
+        await self._run("set-sink-mute", SINK, "1" if muted else "0")
+
+
+def default_backend():
+    return PulseBackend() if pulsectl_asyncio is not None else PactlBackend()
+
+
+class VolumeController:
+    def __init__(self, backend=None, limit=100, resync_after=2.0):
+        """@param resync_after: idle seconds after which the volume is read
+        back from the server, in case another client changed it"""
+        self.backend = backend
+        self.limit = limit
+        self.resync_after = resync_after
+        self.volume = None  # wanted state, None until read from the server
+        self.muted = False
+        self.presses = 0
+        self.commits = 0
+        self.listeners = []
+        self._applied = None
+        self._delta = 0
+        self._mute_op = None
+        self._task = None
+        self._last_commit = 0.0
+
+    def _apply_pending(self):
+        self.volume = max(0, min(self.limit, self.volume + self._delta))
+        if self._mute_op == "toggle":
+            self.muted = not self.muted
+        elif self._mute_op == "unmute":
+            self.muted = False
+        self._delta, self._mute_op = 0, None
+        for listener in self.listeners:
+            listener(self.volume, self.muted)
+
+    def _request(self, delta=0, mute_op=None):
+        self.presses += 1
+        self._delta += delta
+        if mute_op == "toggle" and self._mute_op == "toggle":
+            self._mute_op = None
+        elif mute_op is not None:
+            self._mute_op = mute_op
+        idle = time.monotonic() - self._last_commit > self.resync_after
+        if self._task is None and idle:
+            self.volume = None
+        if self.volume is not None:
+            self._apply_pending()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._commit())
+
+    def change(self, delta):
+        """Unmute and move the volume by delta percent."""
+        self._request(delta, "unmute")
+
+    def toggle_mute(self):
+        self._request(mute_op="toggle")
+
+    async def _commit(self):
+        if self.backend is None:
+            self.backend = default_backend()
+        try:
+            if self.volume is None:
+                self.volume, self.muted = await self.backend.get()
+                self._applied = self.volume, self.muted
+                self._apply_pending()
+            while (self.volume, self.muted) != self._applied:
+                volume, muted = self.volume, self.muted
+                self.commits += 1
+                if muted != self._applied[1]:
+                    await self.backend.set_mute(muted)
+                if volume != self._applied[0]:
+                    await self.backend.set_volume(volume)
+                self._applied = volume, muted
+        except Exception:
+            logger.exception("volume: could not reach the sound server")
+            self.volume = self._applied = None
+        finally:
+            self._task = None
+            self._last_commit = time.monotonic()
+
+    def lazy_change(self, delta):
+        """Callable for lazy.function, e.g. lazy.function(VOLUME.lazy_change(10))."""
+        return lambda qtile: self.change(delta)
+
+    def lazy_toggle_mute(self):
+        return lambda qtile: self.toggle_mute()
+
+
+VOLUME = VolumeController()
@@ -0,0 +1,172 @@
+"""Pre-blurred wallpaper strips painted by the bar itself.
+
+A transparent bar over a static wallpaper only looks frosted if the
+compositor blurs the region behind it on every repaint. BackdropBar renders
+that strip once instead: the part of the screen sized wallpaper copy
+(wallpaper.py) under the bar is blurred with a dual-filter chain (halve the
+size passes times, then double it back, like picom's dual_kawase) and tinted.
+Strips are kept in a GlyphAtlas on disk, keyed by the wallpaper's mtime, the
+screen and bar geometry and the blur parameters, so a restart or a screen
+coming back loads a png. After every widget clear its slice of the strip is
+painted behind the background and decorations the clear drew, and the bar
+needs no blur from picom.
+"""
+import os
+
+import cairocffi
+from libqtile import bar
+from libqtile.log_utils import logger
+
+import colors
+import damage
+import wallpaper
+from glyphs import CACHE_DIR, GlyphAtlas
+
+STRIPS = GlyphAtlas(os.path.join(os.path.dirname(CACHE_DIR), "backdrop"))
+
+
+def scaled(surface, width, height):
+    """surface stretched to width x height, edges repeated outwards."""
+    out = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, width, height)
+    ctx = cairocffi.Context(out)
+    ctx.scale(width / surface.get_width(), height / surface.get_height())
+    ctx.set_source_surface(surface)
+    pattern = ctx.get_source()
+    pattern.set_filter(cairocffi.FILTER_GOOD)
+    pattern.set_extend(cairocffi.EXTEND_PAD)
+    ctx.paint()
+    return out
+
+
+def blur(surface, passes):
+    """Dual-filter blur, each pass halves the size once more."""
+    sizes = [(surface.get_width(), surface.get_height())]
+    for _ in range(passes):
+        w, h = sizes[-1]
+        sizes.append((max(1, w // 2), max(1, h // 2)))
+    for size in sizes[1:]:
+        surface = scaled(surface, *size)
+    for size in reversed(sizes[:-1]):
+        surface = scaled(surface, *size)
+    return surface
+
+
+def render(image, screen_size, rect, mode="fill", passes=4, tint=None):
+    """Blurred, tinted part of the wallpaper under rect (x, y, width, height
+    relative to the screen)."""
+    x, y, width, height = rect
+    # blur a margin around the strip so its edges sample real wallpaper
+    pad = 2 ** (passes + 1) if passes else 0
+    ox, oy = max(0, x - pad), max(0, y - pad)
+    ow = min(screen_size[0], x + width + pad) - ox
+    oh = min(screen_size[1], y + height + pad) - oy
+    area = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, ow, oh)
+    ctx = cairocffi.Context(area)
+    ctx.translate(-ox, -oy)
+    ctx.transform(wallpaper.place(image, *screen_size, mode))
+    ctx.set_source_surface(image)
+    ctx.get_source().set_filter(cairocffi.FILTER_GOOD)
+    ctx.paint()
+    if passes:
+        area = blur(area, passes)
+    strip = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, width, height)
+    ctx = cairocffi.Context(strip)
+    ctx.set_source_surface(area, ox - x, oy - y)
+    ctx.paint()
+    if tint:
+        ctx.set_source_rgba(*(c / 255 for c in colors.hex_to_rgba(tint)))
+        ctx.paint()
+    return strip
+
+
+def strip_key(path, screen_size, rect, mode, passes, tint) -> tuple:
+    return (path, os.stat(path).st_mtime_ns, screen_size, rect, mode, passes, tint)
+
+
+def strip(path, screen_size, rect, mode="fill", passes=4, tint=None, cache=STRIPS):
+    """Cached render of the wallpaper at path, from its screen sized copy."""
+    key = strip_key(path, screen_size, rect, mode, passes, tint)
+    surface = cache.get(key)
+    if surface is None:
+        image = wallpaper.CACHE.surface(path, *screen_size, mode)
+        surface = render(image, screen_size, rect, None, passes, tint)
+        cache.put(key, surface)
+    return surface
+
+
+class BackdropBar(bar.Bar):
+    """Bar painting the blurred wallpaper of its screen behind its widgets."""
+
+    defaults = [
+        ("backdrop_passes", 4, "Blur passes, each one doubles the radius"),
+        ("backdrop_tint", None, "Colour painted over the blurred wallpaper"),
+    ]
+
+    def __init__(self, widgets, size, **config):
+        bar.Bar.__init__(self, widgets, size, **config)
+        self.add_defaults(BackdropBar.defaults)
+        self.backdrop = None
+
+    def _configure(self, qtile, screen, *args, **kwargs):
+        bar.Bar._configure(self, qtile, screen, *args, **kwargs)
+        self.backdrop = self._render_backdrop()
+        if getattr(self, "drawer", None) is not None:
+            # the strip is painted after the wrapped clear, never skipped
+            damage.track_clear(self.drawer)
+            self._wrap(self.drawer, lambda: (0, 0))
+        for widget in self.widgets:
+            damage.track(widget)
+            self._wrap_widget(widget)
+
+    def _configure_widget(self, widget):
+        # also reached for widgets added by hot_reload.reload_bars
+        damage.prepare(widget)
+        configured = bar.Bar._configure_widget(self, widget)
+        if configured:
+            damage.track(widget)
+            if getattr(self, "drawer", None) is not None:
+                self._wrap_widget(widget)
+        return configured
+
+    def _render_backdrop(self):
+        screen = self.screen
+        path = os.path.expanduser(getattr(screen, "wallpaper", None) or "")
+        if not os.path.isfile(path):
+            return None
+        try:
+            rect = (self.x - screen.x, self.y - screen.y, self.width, self.height)
+            return strip(
+                path,
+                (screen.width, screen.height),
+                rect,
+                getattr(screen, "wallpaper_mode", None),
+                self.backdrop_passes,
+                self.backdrop_tint,
+            )
+        except Exception:
+            logger.exception("backdrop: could not render %s", path)
+            return None
+
+    def _wrap_widget(self, widget):
+        drawer = getattr(widget, "drawer", None)
+        if drawer is not None:
+            self._wrap(drawer, lambda: (widget.offsetx, widget.offsety))
+
+    def _wrap(self, drawer, offset):
+        if hasattr(drawer, "_backdrop_clear"):
+            return
+        drawer._backdrop_clear = clear = drawer.clear
+
+        def backdrop_clear(colour):
+            # clear fills with SOURCE, so the strip goes behind what it drew
+            clear(colour)
+            if self.backdrop is not None:
+                x, y = offset()
+                ctx = drawer.ctx
+                ctx.save()
+                ctx.set_operator(cairocffi.OPERATOR_DEST_OVER)
+                ctx.set_source_surface(self.backdrop, -x, -y)
+                ctx.paint()
+                ctx.restore()
+
+        drawer.clear = backdrop_clear
@@ -0,0 +1,246 @@
+"""Declarative bar specs.
+
+A spec is plain data: a dict of a style, its parameters and a list of
+Segments, each with a background and its widgets. compile_spec() turns it into a plan, a
+flat list of Call entries with transitions, caps and decorations filled in,
+and memoizes the plan by the spec's hash, so a reload with an unchanged spec
+skips planning. build() instantiates a plan against the config's namespace.
+
+Plans refer to factories by name (Ref/Call) instead of holding objects, so a
+cached plan never calls functions left over from a previous config load.
+"""
+import functools
+import hashlib
+import types
+from collections import namedtuple
+
+Ref = namedtuple("Ref", "name")
+Call = namedtuple("Call", "name args kwargs")
+Segment = namedtuple(
+    "Segment",
+    "background widgets side fill decoration",
+    defaults=(None, (), "left", True, None),
+)
+
+PLANS = {}
+STATS = {"hits": 0, "misses": 0}
+
+
+def W(name, *args, **options) -> Call:
+    """Widget entry of a segment. Options starting with _ are style hints:
+    _group (glass: group the decoration, default True), _decorate (default True)."""
+    return Call(name, args, options)
+
+
+def spec_hash(spec) -> str:
+    text = repr(spec)
+    if " object at 0x" in text or "<function" in text:
+        raise ValueError("bar specs must be plain data, use Ref/Call for objects")
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _hints(entry: Call) -> tuple:
+    kwargs = {k: v for k, v in entry.kwargs.items() if not k.startswith("_")}
+    hints = {k[1:]: v for k, v in entry.kwargs.items() if k.startswith("_")}
+    return kwargs, hints
+
+
+def _powerline(spec) -> list:
+    """Segments joined by glyph transitions, see powerline.py. Segments on the
+    right side point the other way, unfilled segments keep the bar background."""
+    segments, outer = spec["segments"], spec["outer"]
+    transition, symbols = spec["transition"], spec["symbols"]
+    cap = (segments[0].background, outer, symbols["left_cap"])
+    plan = [Call(spec["cap"], cap, {})]
+    for i, segment in enumerate(segments):
+        if i:
+            previous = segments[i - 1].background
+            if segment.side == "left":
+                args = (previous, segment.background, symbols["left"])
+            else:
+                args = (segment.background, previous, symbols["right"])
+            plan.append(Call(transition, args, {}))
+        for entry in segment.widgets:
+            kwargs, _ = _hints(entry)
+            if segment.fill:
+                kwargs.setdefault("background", segment.background)
+            plan.append(Call(entry.name, entry.args, kwargs))
+    cap = (segments[-1].background, outer, symbols["right_cap"])
+    plan.append(Call(spec["cap"], cap, {"left": False}))
+    return plan
+
+
+def _glass(spec) -> list:
+    """Translucent segments with rect decorations, see glassmorphism.py.
+    Segments without a background take theirs from the spec's colors.Palette,
+    sized to the number of segments."""
+    segments, outer = spec["segments"], spec["outer"]
+    transition, decorate = spec["transition"], spec["decorate"]
+    palette = spec.get("palette")
+    backgrounds = [
+        s.background or palette.background(i, len(segments))
+        for i, s in enumerate(segments)
+    ]
+    plan = [Call(transition, (outer, backgrounds[0], 1), {})]
+    for i, segment in enumerate(segments):
+        background = backgrounds[i]
+        if i:
+            plan.append(Call(transition, (backgrounds[i - 1], background, 0), {}))
+        colour = segment.decoration or spec["decoration"]
+        for entry in segment.widgets:
+            kwargs, hints = _hints(entry)
+            if hints.get("decorate", True):
+                group = hints.get("group", True)
+                kwargs["**"] = Call(decorate, (background, colour), {"group": group})
+            else:
+                kwargs.setdefault("background", background)
+            plan.append(Call(entry.name, entry.args, kwargs))
+    if "cap" in spec:
+        plan.append(Call(spec["cap"], (backgrounds[-1],), {}))
+    return plan
+
+
+STYLES = {"powerline": _powerline, "glass": _glass}
+
+
+def compile_spec(spec) -> tuple:
+    key = spec_hash(spec)
+    plan = PLANS.get(key)
+    if plan is None:
+        STATS["misses"] += 1
+        plan = PLANS[key] = tuple(STYLES[spec["style"]](spec))
+    else:
+        STATS["hits"] += 1
+    return plan
+
+
+def _lookup(name, namespace):
+    head, *rest = name.split(".")
+    obj = namespace[head]
+    for attr in rest:
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _resolve(value, namespace):
+    if isinstance(value, Ref):
+        return _lookup(value.name, namespace)
+    if isinstance(value, Call):
+        return _call(value, namespace)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_resolve(v, namespace) for v in value)
+    if isinstance(value, dict):
+        return {k: _resolve(v, namespace) for k, v in value.items()}
+    return value
+
+
+def _arguments(entry: Call, namespace) -> tuple:
+    kwargs = _resolve(entry.kwargs, namespace)
+    kwargs.update(kwargs.pop("**", {}))
+    return _lookup(entry.name, namespace), _resolve(entry.args, namespace), kwargs
+
+
+def _call(entry: Call, namespace):
+    factory, args, kwargs = _arguments(entry, namespace)
+    return factory(*args, **kwargs)
+
+
+def _code(code, seen, memo) -> list:
+    consts = [
+        _code(c, seen, memo)
+        if isinstance(c, types.CodeType)
+        else _fingerprint(c, seen, memo)
+        for c in code.co_consts
+    ]
+    return [code.co_code.hex(), consts, code.co_names]
+
+
+def _function(func, seen, memo) -> list:
+    """Code, defaults, closure and the globals it reads, so editing a helper
+    or a constant it uses changes the fingerprint."""
+    code = func.__code__
+    cells = [c.cell_contents for c in func.__closure__ or () if c is not None]
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(const.co_names)
+    used = {n: func.__globals__[n] for n in names if n in func.__globals__}
+    return [
+        func.__module__,
+        func.__qualname__,
+        _code(code, seen, memo),
+        _fingerprint((func.__defaults__, func.__kwdefaults__, cells), seen, memo),
+        _fingerprint(used, seen, memo),
+    ]
+
+
+def _fingerprint(value, seen, memo) -> str:
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if id(value) in memo:
+        return memo[id(value)][1]
+    if id(value) in seen:
+        return "<cycle>"
+    seen = seen | {id(value)}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_fingerprint(v, seen, memo) for v in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort()
+        text = "{}{}".format(type(value).__name__, items)
+    elif isinstance(value, dict):
+        items = sorted(
+            (_fingerprint(k, seen, memo), _fingerprint(v, seen, memo))
+            for k, v in value.items()
+        )
+        text = "dict{}".format(items)
+    elif isinstance(value, functools.partial):
+        parts = (value.func, value.args, value.keywords)
+        text = "partial{}".format(_fingerprint(parts, seen, memo))
+    elif isinstance(value, types.FunctionType):
+        text = "function{}".format(_function(value, seen, memo))
+    elif isinstance(value, types.MethodType):
+        parts = (value.__func__, value.__self__)
+        text = "method{}".format(_fingerprint(parts, seen, memo))
+    elif isinstance(value, types.ModuleType):
+        text = "<module {}>".format(value.__name__)
+    elif isinstance(value, type):
+        text = "<class {}.{}>".format(value.__module__, value.__qualname__)
+    else:
+        kind = "{}.{}".format(type(value).__module__, type(value).__qualname__)
+        config = getattr(value, "_user_config", None)
+        if isinstance(config, dict):
+            text = "<{} {}>".format(kind, _fingerprint(config, seen, memo))
+        else:
+            text = "<{} {}>".format(kind, id(value))
+    # holding value keeps its id from being reused while memo lives
+    memo[id(value)] = (value, text)
+    return text
+
+
+def fingerprint(value, memo=None) -> str:
+    """Text of value that is equal across config loads if value is: data by
+    repr, functions by code and the globals they read, configurable objects by
+    their type and options, modules by name and other objects by identity.
+    Values already in memo, e.g. helpers shared by a bar's widgets, are not
+    walked again."""
+    return _fingerprint(value, frozenset(), {} if memo is None else memo)
+
+
+def build(spec, namespace) -> list:
+    """Return the widgets of spec, factories are looked up in namespace. Each
+    widget's spec_key fingerprints its factory and resolved arguments, see
+    hot_reload."""
+    widgets, memo = [], {}
+    for entry in compile_spec(spec):
+        factory, args, kwargs = _arguments(entry, namespace)
+        made = factory(*args, **kwargs)
+        text = fingerprint((factory, args, kwargs), memo)
+        key = hashlib.sha1(text.encode()).hexdigest()
+        if isinstance(made, (list, tuple)):
+            for i, widget in enumerate(made):
+                widget.spec_key = "{}#{}".format(key, i)
+            widgets.extend(made)
+        else:
+            made.spec_key = key
+            widgets.append(made)
+    return widgets
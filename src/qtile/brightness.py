@@ -0,0 +1,143 @@
+"""Backlight control through the sysfs node instead of brightnessctl.
+
+The brightness file is opened once and written with os.pwrite. Key repeats
+only move the target and notify listeners (the Backlight widget) at once;
+the target is written at most once per frame. If the node is not writable
+(no udev rule / video group) or a write fails, the frame's value is set with
+fallback_cmd.
+"""
+import asyncio
+import os
+import time
+
+from libqtile.log_utils import logger
+
+
+class BrightnessController:
+    def __init__(
+        self,
+        name="intel_backlight",
+        sysfs="/sys",
+        fps=60,
+        fallback_cmd="brightnessctl set {}%",
+        resync_after=1.0,
+    ):
+        self.path = os.path.join(sysfs, "class", "backlight", name)
+        self.fps = fps
+        self.fallback_cmd = fallback_cmd
+        self.resync_after = resync_after
+        self.listeners = []
+        self.presses = 0
+        self.writes = 0
+        self.spawns = 0
+        self.target = None
+        self._max = None
+        self._fd = None
+        self._writable = True
+        self._frame = None
+        self._last_write = 0.0
+        self._spawned = set()
+
+    def _read(self, name) -> int:
+        with open(os.path.join(self.path, name)) as f:
+            # values end at the newline flush() writes, like sysfs attributes
+            return int(f.readline())
+
+    @property
+    def max_brightness(self) -> int:
+        if self._max is None:
+            self._max = self._read("max_brightness")
+        return self._max
+
+    @property
+    def percent(self) -> float:
+        return 100 * self.target / self.max_brightness
+
+    def _open(self):
+        if self._fd is None and self._writable:
+            path = os.path.join(self.path, "brightness")
+            try:
+                self._fd = os.open(path, os.O_WRONLY)
+            except PermissionError:
+                logger.info("brightness: %s is read-only, using fallback_cmd", path)
+                self._writable = False
+
+    def _sync(self):
+        # re-read after a pause in case something else changed the brightness
+        idle = time.monotonic() - self._last_write > self.resync_after
+        if self.target is None or (self._frame is None and idle):
+            self.target = self._read("brightness")
+
+    def set_percent(self, percent):
+        self.presses += 1
+        percent = max(0.0, min(100.0, percent))
+        self.target = round(percent * self.max_brightness / 100)
+        self._changed()
+
+    def step(self, percent):
+        """Move the brightness by percent of the maximum, e.g. step(-10)."""
+        self.presses += 1
+        self._sync()
+        delta = round(percent * self.max_brightness / 100)
+        self.target = max(0, min(self.max_brightness, self.target + delta))
+        self._changed()
+
+    def _changed(self):
+        for listener in self.listeners:
+            listener(self.target / self.max_brightness)
+        if self._frame is None:
+            loop = asyncio.get_event_loop()
+            self._frame = loop.call_later(1 / self.fps, self.flush)
+
+    def flush(self):
+        """Write the target now, called once per frame while keys repeat."""
+        self._frame = None
+        self._last_write = time.monotonic()
+        self._open()
+        if self._fd is not None:
+            try:
+                # sysfs takes the whole value per write and ignores the newline
+                os.pwrite(self._fd, b"%d\n" % self.target, 0)
+                self.writes += 1
+                return
+            except OSError:
+                logger.exception("brightness: writing failed, using fallback_cmd")
+                os.close(self._fd)
+                self._fd = None
+                self._writable = False
+        if self.fallback_cmd:
+            self.spawns += 1
+            cmd = self.fallback_cmd.format(round(self.percent)).split()
+            task = asyncio.ensure_future(self._spawn(cmd))
+            self._spawned.add(task)
+            task.add_done_callback(self._spawned.discard)
+
+    async def _spawn(self, cmd):
+        try:
+            proc = await asyncio.create_subprocess_exec(*cmd)
+            await proc.wait()
+        except OSError:
+            logger.exception("brightness: could not run %s", cmd[0])
+
+    def lazy_step(self, percent):
+        """Callable for lazy.function(BRIGHTNESS.lazy_step(10))."""
+        return lambda qtile: self.step(percent)
+
+    def close(self):
+        if self._frame is not None:
+            self._frame.cancel()
+            self.flush()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+CONTROLLERS = {}
+
+
+def get_controller(name="intel_backlight", **config) -> BrightnessController:
+    """Return the shared controller of a backlight. It outlives config reloads,
+    so keys and widgets of reloaded and kept bars use the same one."""
+    if name not in CONTROLLERS:
+        CONTROLLERS[name] = BrightnessController(name, **config)
+    return CONTROLLERS[name]
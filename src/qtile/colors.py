@@ -0,0 +1,124 @@
+"""Shared color helpers for the qtile configs.
+
+Colors are held as packed 0xRRGGBBAA integers. Every conversion is memoized
+so rebuilding the bars only formats each distinct color once, and whole
+alpha/lerp ramps are built in a single call.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+OPAQUE = 0xFF
+
+
+@lru_cache(maxsize=None)
+def _parse_str(string: str) -> int:
+    h = string.lstrip("#")
+    if len(h) == 6:
+        h += "ff"
+    if len(h) != 8:
+        raise ValueError("invalid color: {!r}".format(string))
+    return int(h, 16)
+
+
+def pack(color) -> int:
+    """Return packed 0xRRGGBBAA for a hex string, rgb(a) tuple or packed int."""
+    if isinstance(color, int):
+        return color
+    if isinstance(color, str):
+        return _parse_str(color)
+    if len(color) == 3:
+        color = (*color, OPAQUE)
+    r, g, b, a = (max(0, min(255, int(c))) for c in color)
+    return (r << 24) | (g << 16) | (b << 8) | a
+
+
+def unpack(packed: int) -> tuple:
+    return (
+        (packed >> 24) & 0xFF,
+        (packed >> 16) & 0xFF,
+        (packed >> 8) & 0xFF,
+        packed & 0xFF,
+    )
+
+
+def alpha(color) -> int:
+    return pack(color) & 0xFF
+
+
+@lru_cache(maxsize=None)
+def to_hex(packed: int) -> str:
+    """Format packed color as #rrggbbaa."""
+    return "#{:08x}".format(packed)
+
+
+def hex_to_rgba(string) -> tuple:
+    return unpack(pack(string))
+
+
+@lru_cache(maxsize=None)
+def _with_alpha(packed: int, a: int) -> str:
+    return to_hex((packed & 0xFFFFFF00) | max(0, min(255, a)))
+
+
+def with_alpha(color, a: int) -> str:
+    """Return color with its alpha channel replaced by a (0-255)."""
+    return _with_alpha(pack(color), int(a))
+
+
+@lru_cache(maxsize=None)
+def _alpha_ramp(packed: int, start: int, stop: int, steps: int) -> tuple:
+    if steps == 1:
+        return (_with_alpha(packed, start),)
+    span = stop - start
+    return tuple(
+        _with_alpha(packed, start + (span * i) // (steps - 1)) for i in range(steps)
+    )
+
+
+def alpha_ramp(color, start: int, stop: int, steps: int) -> tuple:
+    """Return steps hex colors with alpha going linearly from start to stop."""
+    return _alpha_ramp(pack(color), int(start), int(stop), int(steps))
+
+
+@lru_cache(maxsize=None)
+def _lerp_ramp(packed_1: int, packed_2: int, steps: int) -> tuple:
+    c1, c2 = unpack(packed_1), unpack(packed_2)
+    if steps == 1:
+        return (to_hex(packed_1),)
+    ramp = []
+    for i in range(steps):
+        rgba = (a + (b - a) * i // (steps - 1) for a, b in zip(c1, c2))
+        ramp.append(to_hex(pack(tuple(rgba))))
+    return tuple(ramp)
+
+
+def lerp_ramp(color_1, color_2, steps: int) -> tuple:
+    """Return steps hex colors interpolated from color_1 to color_2, inclusive."""
+    return _lerp_ramp(pack(color_1), pack(color_2), int(steps))
+
+
+@lru_cache(maxsize=None)
+def _segment_ramp(packed: int, max_alpha: int, count: int) -> tuple:
+    if count < 1:
+        return ()
+    step = max_alpha // count
+    return _alpha_ramp(packed, step, count * step, count)
+
+
+class Palette(namedtuple("Palette", "color max_alpha")):
+    """Segment backgrounds of a bar: color with alpha rising in equal steps up
+    to max_alpha over however many segments the bar has. The ramp is computed
+    once per segment count and shared by every bar and screen using it."""
+
+    __slots__ = ()
+
+    def ramp(self, count: int) -> tuple:
+        return _segment_ramp(pack(self.color), int(self.max_alpha), int(count))
+
+    def background(self, index: int, count: int) -> str:
+        return self.ramp(count)[index]
+
+
+def cache_clear():
+    for fn in (_parse_str, to_hex, _with_alpha, _alpha_ramp, _lerp_ramp, _segment_ramp):
+        fn.cache_clear()
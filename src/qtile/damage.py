@@ -0,0 +1,140 @@
+"""Skip fully transparent fills and redraw only what a widget painted.
+
+Both configs give many widgets, spacers and bars a background with alpha 00.
+Filling those is invisible but still a cairo fill per draw, and since the
+fill covers the whole widget, every draw damages the widget's full area of
+the bar window, which the compositor then blends again.
+
+prepare() drops decorations that can't paint anything before a widget is
+configured. track() wraps a configured widget's drawer: clears with a fully
+transparent colour skip the cairo fill but still erase the drawer's pixmap
+with clear_rect(), so nothing is composited over the previous frame, and
+each drawer.draw only copies the ink extents of the recording, joined with
+the previous frame's ink so old content is erased in the window too. A frame
+that painted nothing, twice in a row, is not drawn at all. STATS counts what
+was skipped.
+"""
+from collections import Counter
+
+import colors
+
+STATS = Counter()
+
+
+def transparent(colour) -> bool:
+    """Whether colour, or every colour of a gradient list, has alpha 0."""
+    if colour is None:
+        return False
+    if isinstance(colour, list):
+        return all(transparent(c) for c in colour)
+    return colors.alpha(colour) == 0
+
+
+def _line_invisible(width, colour) -> bool:
+    if isinstance(width, (list, tuple)):
+        width = max(width)
+    return not width or transparent(colour)
+
+
+def invisible(decoration, widget) -> bool:
+    """Whether a qtile_extras decoration can't paint anything on widget.
+    PowerLineDecoration takes its colours from the neighbours, keep it."""
+    name = type(decoration).__name__
+    if name == "RectDecoration":
+        colour = getattr(decoration, "colour", "#000000")
+        if getattr(decoration, "use_widget_background", False):
+            colour = widget.background
+        filled = getattr(decoration, "filled", False) and not transparent(colour)
+        line = not _line_invisible(
+            getattr(decoration, "line_width", 0),
+            getattr(decoration, "line_colour", "#ffffff"),
+        )
+        return not (filled or line)
+    if name == "BorderDecoration":
+        return _line_invisible(
+            getattr(decoration, "border_width", 2),
+            getattr(decoration, "colour", "#000000"),
+        )
+    return False
+
+
+def prepare(widget):
+    """Drop invisible decorations, call before the widget is configured."""
+    decorations = getattr(widget, "decorations", None)
+    if not decorations:
+        return
+    visible = [d for d in decorations if not invisible(d, widget)]
+    STATS["decorations_dropped"] += len(decorations) - len(visible)
+    widget.decorations = visible
+
+
+def _clip(ink, width, height):
+    x, y, w, h = ink
+    x0, y0 = max(0, int(x)), max(0, int(y))
+    x1, y1 = min(width, int(x + w + 0.999)), min(height, int(y + h + 0.999))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def _union(a, b):
+    if a is None or b is None:
+        return a or b
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def track_clear(drawer, decorated=False):
+    """Skip the fill of fully transparent colours, only erasing the pixmap.
+    qtile_extras draws decorations from the drawer's clear, so decorated
+    widgets keep it."""
+    if decorated or hasattr(drawer, "_damage_clear"):
+        return
+    drawer._damage_clear = clear = drawer.clear
+
+    def damage_clear(colour):
+        STATS["fills"] += 1
+        if transparent(colour):
+            STATS["fills_skipped"] += 1
+            # on X11 this is what erases the persistent pixmap
+            drawer.clear_rect()
+            return
+        clear(colour)
+
+    drawer.clear = damage_clear
+
+
+def track(widget):
+    """Wrap a configured widget's drawer, see the module docstring."""
+    drawer = getattr(widget, "drawer", None)
+    if drawer is None or hasattr(drawer, "_damage_draw"):
+        return
+    track_clear(drawer, bool(getattr(widget, "decorations", None)))
+    drawer._damage_draw = draw = drawer.draw
+    last = {"area": None, "ink": None}
+
+    def damage_draw(offsetx=0, offsety=0, width=None, height=None, src_x=0, src_y=0):
+        width = drawer.width if width is None else width
+        height = drawer.height if height is None else height
+        area = (offsetx, offsety, width, height)
+        ink_extents = getattr(drawer.surface, "ink_extents", None)
+        if src_x or src_y or ink_extents is None:
+            last["area"] = None
+            return draw(offsetx, offsety, width, height, src_x, src_y)
+        ink = _clip(ink_extents(), width, height)
+        if area != last["area"]:
+            # moved or resized, the whole area is stale
+            damaged = (0, 0, width, height)
+        else:
+            damaged = _union(ink, last["ink"])
+        last["area"], last["ink"] = area, ink
+        STATS["draws"] += 1
+        if damaged is None:
+            STATS["draws_skipped"] += 1
+            STATS["pixels_saved"] += width * height
+            drawer._reset_surface()
+            return None
+        x0, y0, x1, y1 = damaged
+        STATS["pixels_saved"] += width * height - (x1 - x0) * (y1 - y0)
+        return draw(offsetx + x0, offsety + y0, x1 - x0, y1 - y0, x0, y0)
+
+    drawer.draw = damage_draw
@@ -0,0 +1,178 @@
+"""Widgets that redraw on change events instead of waiting for their poll.
+
+Battery and Backlight follow sysfs change notifications. They poll at their
+normal update_interval until a change event has actually arrived, since a
+bound socket doesn't prove the driver sends them (many batteries don't), and
+only every fallback_interval after that. PulseVolume follows audio.VOLUME.
+CompositorProfile shows the profile of a governor.Governor and runs the
+governor while its bar lives.
+"""
+import os
+from abc import abstractmethod
+
+from libqtile import widget
+
+from audio import VOLUME
+from sysfs_watch import SysfsWatcher
+
+SYSFS = "/sys"
+
+
+class _Watched:
+    subsystems = ()
+    watcher = None
+    _timer = None
+
+    @abstractmethod
+    def watch_paths(self) -> list:
+        """sysfs paths to watch for changes, subclasses override it."""
+
+    def timer_setup(self):
+        self._stop()
+        self.interval = self.update_interval
+        self.watcher = SysfsWatcher(self.watch_paths(), self._event, self.subsystems)
+        self.watcher.start()
+        self._poll_timer()
+
+    def _event(self):
+        if self.interval != self.fallback_interval:
+            # events do arrive, the poll is only a fallback from now on
+            self.interval = self.fallback_interval
+            self._schedule()
+        self._changed()
+
+    def _changed(self):
+        self.update(self.poll())
+
+    def _schedule(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self.qtile.call_later(self.interval, self._poll_timer)
+
+    def _poll_timer(self):
+        self._changed()
+        self._schedule()
+
+    def _stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def finalize(self):
+        self._stop()
+        super().finalize()
+
+
+class Battery(_Watched, widget.Battery):
+    defaults = [
+        ("fallback_interval", 300, "Poll interval while change events arrive"),
+        ("sysfs", SYSFS, "sysfs mount point"),
+    ]
+    subsystems = ("power_supply",)
+
+    def __init__(self, **config):
+        widget.Battery.__init__(self, **config)
+        self.add_defaults(Battery.defaults)
+
+    def watch_paths(self):
+        name = self.battery
+        if not isinstance(name, str):
+            name = "BAT{}".format(name)
+        return [os.path.join(self.sysfs, "class", "power_supply", name)]
+
+
+class Backlight(_Watched, widget.Backlight):
+    defaults = [
+        ("fallback_interval", 300, "Poll interval while change events arrive"),
+        ("sysfs", SYSFS, "sysfs mount point"),
+        (
+            "controller",
+            None,
+            "brightness.BrightnessController shown at once and used for scrolling",
+        ),
+    ]
+    subsystems = ("backlight",)
+
+    def __init__(self, **config):
+        widget.Backlight.__init__(self, **config)
+        self.add_defaults(Backlight.defaults)
+        if self.controller is not None and "mouse_callbacks" not in config:
+            self.mouse_callbacks.update(
+                {
+                    "Button4": lambda: self.controller.step(self.step),
+                    "Button5": lambda: self.controller.step(-self.step),
+                }
+            )
+
+    def _configure(self, qtile, bar):
+        widget.Backlight._configure(self, qtile, bar)
+        if self.controller is not None:
+            self.controller.listeners.append(self._brightness_changed)
+
+    def _brightness_changed(self, fraction):
+        self.update(self.format.format(percent=fraction))
+
+    def finalize(self):
+        if self.controller and self._brightness_changed in self.controller.listeners:
+            self.controller.listeners.remove(self._brightness_changed)
+        _Watched.finalize(self)
+
+    def watch_paths(self):
+        path = os.path.join(self.sysfs, "class", "backlight", self.backlight_name)
+        return [
+            os.path.join(path, self.brightness_file),
+            os.path.join(path, "actual_brightness"),
+        ]
+
+
+class PulseVolume(widget.PulseVolume):
+    """PulseVolume that shows audio.VOLUME's target as soon as a key is pressed."""
+
+    def __init__(self, controller=VOLUME, **config):
+        widget.PulseVolume.__init__(self, **config)
+        self.controller = controller
+
+    def _configure(self, qtile, bar):
+        widget.PulseVolume._configure(self, qtile, bar)
+        self.controller.listeners.append(self._volume_changed)
+
+    def _volume_changed(self, volume, muted):
+        self.volume = -1 if muted else volume
+        self._update_drawer()
+        self.bar.draw()
+
+    def finalize(self):
+        if self._volume_changed in self.controller.listeners:
+            self.controller.listeners.remove(self._volume_changed)
+        widget.PulseVolume.finalize(self)
+
+
+class CompositorProfile(widget.TextBox):
+    defaults = [
+        ("governor", None, "governor.Governor to run and show"),
+        ("format", "{profile}", "Format of the active profile"),
+    ]
+
+    def __init__(self, **config):
+        widget.TextBox.__init__(self, "", **config)
+        self.add_defaults(CompositorProfile.defaults)
+
+    def _configure(self, qtile, bar):
+        widget.TextBox._configure(self, qtile, bar)
+        self.governor.listeners.append(self._profile_changed)
+        self.governor.start(qtile)
+        if self.governor.profile is not None:
+            self._profile_changed(self.governor.profile)
+
+    def _profile_changed(self, profile):
+        self.update(self.format.format(profile=profile))
+
+    def finalize(self):
+        if self._profile_changed in self.governor.listeners:
+            self.governor.listeners.remove(self._profile_changed)
+        if not self.governor.listeners:
+            self.governor.stop()
+        widget.TextBox.finalize(self)
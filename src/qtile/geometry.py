@@ -0,0 +1,90 @@
+"""Fake screen geometry computed from the real outputs.
+
+A layout function splits one output into the rects of its fake screens, e.g.
+a bar strip and the main area below it. ScreenLayout keeps the fake_screens
+list handed to qtile and updates it in place when outputs change: rects are
+cached per output and whole layouts per output signature, Screens of outputs
+that did not change are kept with their bars and widgets, moved outputs only
+get new coordinates, and only new outputs build new Screens. qtile's own
+reconfigure_screens then applies the list without a config reload.
+"""
+from collections import namedtuple
+
+Rect = namedtuple("Rect", "x y width height")
+DEFAULT_OUTPUTS = (Rect(0, 0, 1366, 768),)
+MAX_SIGNATURES = 64
+
+
+def outputs(qtile) -> tuple:
+    """Rects of the real outputs, DEFAULT_OUTPUTS when qtile is not running
+    (e.g. qtile check)."""
+    if qtile is None:
+        return DEFAULT_OUTPUTS
+    return tuple(
+        Rect(o.x, o.y, o.width, o.height) if hasattr(o, "width") else Rect(*o)
+        for o in qtile.core.get_screen_info()
+    )
+
+
+class ScreenLayout:
+    def __init__(self, layout, build):
+        """@param layout: layout(output, index) -> tuple of Rects, one per fake
+        screen of the index-th output
+        @param build: build(index, role, rect) -> Screen for the role-th rect"""
+        self.layout = layout
+        self.build = build
+        self.fake_screens = []
+        self.signature = None
+        self.hits = 0
+        self.misses = 0
+        self.built = 0
+        self.moved = 0
+        self._rects = {}  # (index, output) -> rects
+        self._plans = {}  # signature -> ((index, role, rect), ...)
+        self._screens = {}  # (index, role) -> Screen
+
+    def rects(self, index, output) -> tuple:
+        key = (index, output)
+        rects = self._rects.get(key)
+        if rects is None:
+            self.misses += 1
+            rects = self._rects[key] = tuple(self.layout(output, index))
+        return rects
+
+    def plan(self, outputs) -> tuple:
+        plan = self._plans.get(outputs)
+        if plan is None:
+            if len(self._plans) >= MAX_SIGNATURES:
+                self._plans.clear()
+                self._rects.clear()
+            plan = self._plans[outputs] = tuple(
+                (index, role, rect)
+                for index, output in enumerate(outputs)
+                for role, rect in enumerate(self.rects(index, output))
+            )
+        else:
+            self.hits += 1
+        return plan
+
+    def update(self, outputs) -> bool:
+        """Lay out fake_screens for outputs, return False if nothing changed."""
+        outputs = tuple(Rect(*o) for o in outputs)
+        if outputs == self.signature:
+            return False
+        screens = []
+        used = set()
+        for index, role, rect in self.plan(outputs):
+            screen = self._screens.get((index, role))
+            if screen is None:
+                self.built += 1
+                screen = self._screens[(index, role)] = self.build(index, role, rect)
+            elif (screen.x, screen.y, screen.width, screen.height) != rect:
+                self.moved += 1
+                screen.x, screen.y, screen.width, screen.height = rect
+            used.add((index, role))
+            screens.append(screen)
+        for key in set(self._screens) - used:
+            del self._screens[key]
+        self.fake_screens[:] = screens
+        self.signature = outputs
+        return True
@@ -24,20 +24,31 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from libqtile import bar, layout, widget
+from libqtile import bar, hook, layout, qtile, widget
 from libqtile.config import Click, Drag, Group, Key, Match, Screen
 from libqtile.lazy import lazy
 from libqtile.utils import guess_terminal
 
 
 # MY CODE ========================================================================================================================
-from collections import namedtuple
 from qtile_extras import widget
 from qtile_extras.widget.decorations import (
     PowerLineDecoration,
     RectDecoration,
     BorderDecoration,
 )
+import barspec
+from barspec import Ref, Segment, W
+import colors
+import geometry
+import governor
+import hot_reload
+import tasklist
+import titles
+import wallpaper
+import async_widgets
+import backdrop
+import event_widgets
 
 # https://github.com/morhetz/gruvbox/blob/master/colors/gruvbox.vim
 GRUVBOX = {
@@ -106,6 +117,7 @@ DEBUG = "#00ff00"
 BORDER_COLOR = GRUVBOX["light0_hard"] + "00"
 ICON_PATHS = []
 WALLPAPER = "~/.config/qtile/awesome.png"
+BACKDROP_TINT = DARK_BACKGROUND + "40"  # over the pre-blurred wallpaper strip
 WHITE = GRUVBOX["light0_hard"]
 MAX_ALPHA = 50
 TEXT_COLOR = WHITE
@@ -137,31 +149,39 @@ ENDCAPL = {
     "decorations": [PowerLineDecoration(path="rounded_right", shift=40, size=25)],
     "padding": 0,
 }
+FONT = "JetBrainsMono Nerd Font"
 FONTSIZE = 12
+TITLE_WIDTH = 8 * FONTSIZE  # about the old 10 characters and ellipsis
 PADDING = 14
 widget_defaults = dict(
-    font="JetBrainsMono Nerd Font",
+    font=FONT,
     fontsize=FONTSIZE,
     padding=PADDING,
     background=BACKGROUND,
     foreground=TEXT_COLOR,
 )
 
-SCREENDIM = (1366, 768)  # (1366, 768)
-FakeScreenDim = namedtuple("FakeScreenDimDim", "x y width height")
-
-MAIN = FakeScreenDim(
-    PADDING,
-    PADDING,
-    SCREENDIM[0] - 2 * PADDING,
-    SCREENDIM[1] - PADDING,
-)
 LMARGIN = int(1.5 * PADDING)  # 4*PADDING for showcasing
 HIGHLIGHT = BorderDecoration(border_width=[4, 0, 0, 0], colour=WHITE + "32")  # "08"
-
-
-def val_to_hex(val) -> str:
-    return "{:02x}".format(val)
+# segment backgrounds, the alpha ramp is sized to the number of segments
+SEGMENT_PALETTE = colors.Palette(FOREGROUND, MAX_ALPHA)
+SEGMENT_DECORATION = colors.with_alpha(FOREGROUND, 30)
+# picom options of this theme, written to picom.conf by picom_conf.py
+PICOM = {"shadow-color": DARK_BACKGROUND, "corner-radius": 30, "blur-strength": 8}
+# cheaper picom profiles on battery or under load, shown next to the layout
+GOVERNOR = governor.shared(PICOM)
+
+
+def layout_output(output, index) -> tuple:
+    """One fake screen per output, inset by PADDING except at the bottom."""
+    return (
+        geometry.Rect(
+            output.x + PADDING,
+            output.y + PADDING,
+            output.width - 2 * PADDING,
+            output.height - PADDING,
+        ),
+    )
 
 
 def get_endcap(left) -> dict:
@@ -175,143 +195,140 @@ def get_endcap(left) -> dict:
     )
 
 
+parse_title = titles.fitter(TITLE_WIDTH, FONT, FONTSIZE)
+
+
 def init_widgets() -> list:
-    NUM_WIDGETS = 8
-    # transparency settings
-    M_ALPHA, STEPS, COLOR = MAX_ALPHA, NUM_WIDGETS, FOREGROUND
-    STEP = int(M_ALPHA / STEPS)
-    PRIGHT = dict(decorations=[PowerLineDecoration(path="rounded_left")])
-    PLEFT = dict(decorations=[PowerLineDecoration(path="rounded_right")])
     # params2 = dict(decorations=[RectDecoration(colour=color + dalpha, filled=True, padding_y=10, group=False, radius=20)])
-    background_1 = []  # ["#ff0000"] *4
-    background_2 = []
-    g1 = lambda pop=0: background_1.pop() if pop else background_1[-1]
-    g2 = lambda pop=0: background_2.pop() if pop else background_2[-1]
-    for i in range(STEPS):
-        bg_1 = COLOR + val_to_hex((i + 1) * STEP)
-        bg_2 = COLOR + val_to_hex(30)
-        background_1.insert(0, bg_1)
-        background_2.insert(0, bg_2)
-    items = [
-        *build_transition(BACKGROUND, g1(), 1),
-        widget.CheckUpdates(
-            distro="Arch",
-            no_update_string="0 updates",
-            colour_no_updates=TEXT_COLOR,
-            **build_dict(g1(), g2(1))
+    segments = [
+        Segment(
+            widgets=[
+                W(
+                    "widget.modify",
+                    Ref("async_widgets.CheckUpdates"),
+                    distro="Arch",
+                    no_update_string="0 updates",
+                    colour_no_updates=TEXT_COLOR,
+                    _group=False,
+                )
+            ],
         ),
-        *build_transition(g1(1), g1(), 0),
-        widget.CurrentLayoutIcon(
-            scale=0.35,
-            padding=0,
-            **build_dict(g1(), g2(), group=True),
-            custom_icon_paths=ICON_PATHS
+        Segment(
+            widgets=[
+                W(
+                    "widget.CurrentLayoutIcon",
+                    scale=0.35,
+                    padding=0,
+                    custom_icon_paths=ICON_PATHS,
+                ),
+                W("widget.CurrentLayout"),
+                W(
+                    "widget.modify",
+                    Ref("event_widgets.CompositorProfile"),
+                    governor=Ref("GOVERNOR"),
+                ),
+            ],
         ),
-        widget.CurrentLayout(**build_dict(g1(), g2(1), group=True)),
-        *build_transition(g1(1), g1(), 0),
-        widget.Spacer(length=int(1.5 * FONTSIZE), **build_dict(g1(), g2(), group=True)),
-        widget.TaskList(
-            # background=g1(),
-            border=ACCENT + "aa",
-            # foreground=DARK_BACKGROUND,
-            borderwidth=0,
-            highlight_method="block",
-            icon_size=0,  # 4*FONTSIZE,
-            padding=6,
-            margin_x=9,
-            margin=16,
-            # margin_y=15,
-            # max_title_width=200,
-            parse_text=lambda string: string
-            if len(string) < 10
-            else string[:10] + "...",
-            rounded=True,
-            spacing=None,
-            theme_mode=None,
-            # title_width_method="uniform",
-            unfocused_border=g2(),
-            urgent_alert_method="border",
-            urgent_border=GRUVBOX["bright_red"],
-            **build_dict(g1(), g2(), group=True)
+        Segment(
+            widgets=[
+                W("widget.Spacer", length=int(1.5 * FONTSIZE)),
+                W(
+                    "widget.modify",
+                    Ref("tasklist.VirtualTaskList"),
+                    border=ACCENT + "aa",
+                    # foreground=DARK_BACKGROUND,
+                    borderwidth=0,
+                    highlight_method="block",
+                    icon_size=0,  # 4*FONTSIZE,
+                    padding=6,
+                    margin_x=9,
+                    margin=16,
+                    # margin_y=15,
+                    # max_title_width=200,
+                    parse_text=Ref("parse_title"),
+                    rounded=True,
+                    spacing=None,
+                    theme_mode=None,
+                    # title_width_method="uniform",
+                    unfocused_border=SEGMENT_DECORATION,
+                    urgent_alert_method="border",
+                    urgent_border=GRUVBOX["bright_red"],
+                ),
+                W("widget.Spacer", length=int(1.5 * FONTSIZE)),
+            ],
         ),
-        widget.Spacer(
-            length=int(1.5 * FONTSIZE), **build_dict(g1(), g2(1), group=True)
+        Segment(
+            widgets=[
+                W("widget.TextBox", "\uf120 ", fontsize=2 * FONTSIZE),
+                W(
+                    "widget.Prompt",
+                    prompt="",
+                    fontsize=FONTSIZE + 4,
+                    cursor_color=FOREGROUND,
+                    bell_style="visual",
+                    visual_bell_color=DEBUG,
+                ),
+                W("widget.Spacer", decorations=[Ref("HIGHLIGHT")], _decorate=False),
+            ],
         ),
-        *build_transition(g1(1), g1(), 0),
-        widget.TextBox(
-            "\uf120 ", fontsize=2 * FONTSIZE, **build_dict(g1(), g2(), group=True)
+        Segment(
+            widgets=[
+                W("widget.TextBox", "", fontsize=FONTSIZE),
+                W("widget.PulseVolume"),
+            ],
         ),
-        widget.Prompt(
-            prompt="",
-            fontsize=FONTSIZE + 4,
-            cursor_color=FOREGROUND,
-            bell_style="visual",
-            visual_bell_color=DEBUG,
-            **build_dict(g1(), g2(1), group=True)
+        Segment(
+            widgets=[
+                W(
+                    "widget.modify",
+                    Ref("event_widgets.Backlight"),
+                    format=SYMBOLS["brightness"] + " {percent:2.0%}",
+                    backlight_name="intel_backlight",
+                )
+            ],
         ),
-        widget.Spacer(background=g1(), **dict(decorations=[HIGHLIGHT])),
-        *build_transition(g1(1), g1(), 0),
-        widget.TextBox("", fontsize=FONTSIZE, **build_dict(g1(), g2(), group=True)),
-        widget.PulseVolume(**build_dict(g1(), g2(1), group=True)),
-        *build_transition(g1(1), g1(), 0),
-        # widget.TextBox("foo", **build_dict(g1(), g2(1))),
-        widget.Backlight(
-            format=SYMBOLS["brightness"] + " {percent:2.0%}",
-            backlight_name="intel_backlight",
-            **build_dict(g1(), g2(1), group=True)
+        Segment(
+            widgets=[
+                W(
+                    "widget.modify",
+                    Ref("event_widgets.Battery"),
+                    # foreground=GRUVBOX["bg0_h"],
+                    show_short_text=False,
+                    low_percentage=0.15,
+                    charge_char="\uf0e7",
+                    discharge_char="\uf242",
+                    empty_char="\uf244",
+                    full_char="\uf240",
+                    format="{char}  {percent:2.0%} ",
+                    unkown_char="?",
+                    low_foreground=GRUVBOX["bright_red"],
+                    update_interval=30,
+                )
+            ],
         ),
-        *build_transition(g1(1), g1(), 0),
-        widget.Battery(
-            # foreground=GRUVBOX["bg0_h"],
-            show_short_text=False,
-            low_percentage=0.15,
-            charge_char="\uf0e7",
-            discharge_char="\uf242",
-            empty_char="\uf244",
-            full_char="\uf240",
-            format="{char}  {percent:2.0%} ",
-            unkown_char="?",
-            low_foreground=GRUVBOX["bright_red"],
-            update_interval=30,
-            **build_dict(g1(), g2(1), group=True)
-        ),
-        *build_transition(g1(1), g1(), 0),
-        widget.QuickExit(
-            default_text=" " + SYMBOLS["power"],
-            countdown_format="({})",
-            fontsize=int(2 * FONTSIZE),
-            **build_dict(g1(), g2(1))
-        ),
-        # widget.Spacer(length=FONTSIZE, background=g1(), **dict(decorations=[HIGHLIGHT])),
-        # *build_transition(g1(), DEBUG, 0),
-        widget.Spacer(
-            length=1,
-            background=g1(),
-            **dict(decorations=[PowerLineDecoration(path="rounded_left"), HIGHLIGHT])
+        Segment(
+            widgets=[
+                W(
+                    "widget.QuickExit",
+                    default_text=" " + SYMBOLS["power"],
+                    countdown_format="({})",
+                    fontsize=int(2 * FONTSIZE),
+                    _group=False,
+                )
+            ],
         ),
     ]
-    return items
-
-
-def rgba_to_hex(color: tuple) -> str:
-    """Convert rga or rgba to hex. If rgb then a=255 is assumed."""
-    if len(color) == 3:
-        # rgb
-        return "#{:02x}{:02x}{:02x}".format(*color)
-    # rgba
-    return "#{:02x}{:02x}{:02x}{:02x}".format(*color)
-
-
-def hex_to_rgba(string) -> tuple:
-    h = string.lstrip("#")
-    if len(string) == 6:
-        h += "ff"
-    return tuple(int(h[i : i + 2], 16) for i in (0, 2, 4, 6))
-
-
-def double_alpha(string) -> str:
-    r, g, b, a = hex_to_rgba(string)
-    return rgba_to_hex((r, g, b, a * 2))
+    spec = {
+        "style": "glass",
+        "transition": "build_transition",
+        "decorate": "build_dict",
+        "cap": "build_endcap",
+        "palette": SEGMENT_PALETTE,
+        "decoration": SEGMENT_DECORATION,
+        "outer": BACKGROUND,
+        "segments": segments,
+    }
+    return barspec.build(spec, globals())
 
 
 def build_dict(color_1, color_2, group=False):
@@ -334,6 +351,11 @@ def build_dict(color_1, color_2, group=False):
     )
 
 
+def build_endcap(color):
+    params = dict(decorations=[PowerLineDecoration(path="rounded_left"), HIGHLIGHT])
+    return widget.Spacer(length=1, background=color, **params)
+
+
 def build_transition(color_1, color_2, left):
     path = "rounded_right" if left else "rounded_left"
     params = dict(decorations=[PowerLineDecoration(path=path), HIGHLIGHT])
@@ -370,12 +392,14 @@ def init_bar() -> bar.Bar:
     widgets.append(get_endcap(False))
     widgets.append(widget.Spacer(1, background=BORDER_COLOR))
     """
-    return bar.Bar(
+    return backdrop.BackdropBar(
         init_widgets(),
         60,
         background=BACKGROUND,  # make color transparent
         border_width=0,  # PADDING,
         border_color="#00000000",
+        backdrop_passes=4,
+        backdrop_tint=BACKDROP_TINT,
     )
 
 
@@ -433,7 +457,18 @@ keys = [
     # Toggle between different layouts as defined below
     Key([mod], "Tab", lazy.next_layout(), desc="Toggle between layouts"),
     Key([mod], "w", lazy.window.kill(), desc="Kill focused window"),
-    Key([mod, "control"], "r", lazy.reload_config(), desc="Reload the config"),
+    Key(
+        [mod, "control"],
+        "r",
+        lazy.function(hot_reload.reload_bars),
+        desc="Reload the bars, keeping unchanged widgets",
+    ),
+    Key(
+        [mod, "control", "shift"],
+        "r",
+        lazy.function(hot_reload.full_reload),
+        desc="Reload the config",
+    ),
     Key([mod, "control"], "q", lazy.shutdown(), desc="Shutdown Qtile"),
     Key([mod], "r", lazy.spawncmd(), desc="Spawn a command using a prompt widget"),
 ]
@@ -488,17 +523,27 @@ layouts = [
 
 extension_defaults = widget_defaults.copy()
 
-screens = [
-    Screen(
+
+def init_screen(index, role, rect):
+    return wallpaper.WallpaperScreen(
         top=init_bar(),
-        x=MAIN.x,
-        y=MAIN.y,
-        width=MAIN.width,
-        height=MAIN.height,
         wallpaper=WALLPAPER,
         wallpaper_mode="fill",
-    ),
-]
+        **rect._asdict()
+    )
+
+
+SCREENS = geometry.ScreenLayout(layout_output, init_screen)
+SCREENS.update(geometry.outputs(qtile))
+fake_screens = SCREENS.fake_screens
+hot_reload.track(fake_screens)
+
+
+@hook.subscribe.screen_change
+def outputs_changed(*args):
+    # runs before qtile's reconfigure_screens, which applies fake_screens
+    SCREENS.update(geometry.outputs(qtile))
+
 
 # Drag floating layouts.
 mouse = [
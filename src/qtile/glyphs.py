@@ -0,0 +1,147 @@
+"""Pre-rendered powerline transition glyphs.
+
+Each (foreground, background, symbol, font, size, height) combination is
+rasterized with pango once, kept in an in-memory atlas and saved as a png so a
+restart can load the bitmap instead of laying the glyph out again.
+"""
+import hashlib
+import os
+
+import cairocffi
+from libqtile import bar
+from libqtile.log_utils import logger
+from libqtile.widget import base
+
+import colors
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "qtile",
+    "glyph-atlas",
+)
+
+
+class GlyphAtlas:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._sprites = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".png")
+
+    def get(self, key):
+        """Return the cached ImageSurface for key or None."""
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+        if self.cache_dir:
+            try:
+                sprite = cairocffi.ImageSurface.create_from_png(self._path(key))
+            except (OSError, MemoryError, cairocffi.CairoError):
+                sprite = None
+        if sprite is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._sprites[key] = sprite
+        return sprite
+
+    def put(self, key, sprite):
+        self._sprites[key] = sprite
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self._path(key) + ".tmp"
+            sprite.write_to_png(tmp)
+            os.replace(tmp, self._path(key))
+        except (OSError, cairocffi.CairoError):
+            logger.exception("glyph atlas: could not write %s", self.cache_dir)
+
+    def clear(self):
+        self._sprites.clear()
+
+
+ATLAS = GlyphAtlas()
+
+
+def _pack(colour):
+    """Packed colour, or a tuple of them for a gradient list."""
+    if isinstance(colour, list):
+        return tuple(colors.pack(c) for c in colour)
+    return colors.pack(colour)
+
+
+class GlyphTransition(base._Widget):
+    """TextBox replacement for a single powerline glyph, blitted from ATLAS."""
+
+    defaults = [
+        ("font", "sans", "Default font"),
+        ("fontsize", None, "Font size. Calculated if None."),
+        ("padding", None, "Padding. Calculated if None."),
+        ("foreground", "ffffff", "Glyph colour"),
+    ]
+
+    def __init__(self, symbol, atlas=ATLAS, **config):
+        base._Widget.__init__(self, bar.CALCULATED, **config)
+        self.add_defaults(GlyphTransition.defaults)
+        self.symbol = symbol
+        self.atlas = atlas
+        self.sprite = None
+
+    def _configure(self, qtile, bar):
+        base._Widget._configure(self, qtile, bar)
+        if self.fontsize is None:
+            self.fontsize = self.bar.height - self.bar.height / 5
+        self.sprite = self.atlas.get(self.key)
+
+    @property
+    def key(self) -> tuple:
+        return (
+            colors.pack(self.foreground),
+            _pack(self.background or self.bar.background),
+            self.symbol,
+            self.font,
+            self.fontsize,
+            self.bar.height,
+        )
+
+    def calculate_length(self):
+        if self.sprite is None:
+            self.sprite = self._rasterize()
+        return self.sprite.get_width()
+
+    def _rasterize(self):
+        layout = self.drawer.textlayout(
+            self.symbol, self.foreground, self.font, self.fontsize, None, markup=False
+        )
+        padding = self.fontsize / 2 if self.padding is None else self.padding
+        width = max(int(layout.width + 2 * padding), 1)
+        self.drawer.clear(self.background or self.bar.background)
+        layout.draw(padding, int(self.bar.height / 2.0 - layout.height / 2.0) + 1)
+        layout.finalize()
+        sprite = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, width, self.bar.height)
+        ctx = cairocffi.Context(sprite)
+        ctx.set_operator(cairocffi.OPERATOR_SOURCE)
+        ctx.set_source_surface(self.drawer.ctx.get_target(), 0, 0)
+        ctx.paint()
+        self.atlas.put(self.key, sprite)
+        return sprite
+
+    def draw(self):
+        if self.sprite is None:
+            self.sprite = self._rasterize()
+        # erases the drawer's pixmap, antialiased edges would pile up otherwise
+        self.drawer.clear_rect()
+        ctx = self.drawer.ctx
+        ctx.save()
+        ctx.set_operator(cairocffi.OPERATOR_SOURCE)
+        ctx.set_source_surface(self.sprite, 0, 0)
+        ctx.paint()
+        ctx.restore()
+        self.drawer.draw(offsetx=self.offsetx, offsety=self.offsety, width=self.length)
@@ -0,0 +1,205 @@
+"""picom profile chosen from battery state and load.
+
+Governor reads the battery status and capacity and /proc/loadavg through the
+shared sampler and picks one of picom_conf.PROFILES: full on AC with a quiet
+CPU, reduced on battery or under load, minimal on a low battery or heavy load.
+Two kinds of hysteresis keep it from flapping: leaving a cheaper profile needs
+the inputs clear of the threshold by a margin, and a new profile has to be
+wanted for degrade_after (or the longer recover_after) seconds before it is
+applied. Picom writes the chosen profile over picom's config and sends picom
+SIGUSR1, which makes it reload.
+
+A fake tree works for trying it out, e.g.
+
+    governor = Governor(print, sampler=Sampler(root="/tmp/fakeroot"))
+    governor.decide(governor.inputs(governor.sampler.sample(governor.sources)))
+"""
+import os
+import signal
+import time
+from collections import namedtuple
+
+from libqtile.log_utils import logger
+
+import picom_conf
+from sampler import LOADAVG, PARSERS, SAMPLER, parse_str
+
+ORDER = ("full", "reduced", "minimal")  # cheaper to the right
+PICOM_CONF = os.path.join(
+    os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config")),
+    "picom",
+    "picom.conf",
+)
+
+Inputs = namedtuple("Inputs", "discharging capacity load")  # load per cpu
+GOVERNORS = {}  # shared() instances, outlive config reloads
+
+
+class Governor:
+    def __init__(
+        self,
+        apply,
+        battery="BAT0",
+        sampler=SAMPLER,
+        update_interval=5,
+        degrade_after=10,
+        recover_after=60,
+        reduce_load=0.8,
+        minimal_load=1.5,
+        minimal_capacity=20,
+        load_margin=0.2,
+        capacity_margin=5,
+        cpus=None,
+    ):
+        """@param apply: apply(profile), e.g. a Picom
+        @param reduce_load, minimal_load: 1 minute load per cpu
+        @param minimal_capacity: battery percent"""
+        self.apply = apply
+        self.sampler = sampler
+        self.update_interval = update_interval
+        self.degrade_after = degrade_after
+        self.recover_after = recover_after
+        self.reduce_load = reduce_load
+        self.minimal_load = minimal_load
+        self.minimal_capacity = minimal_capacity
+        self.load_margin = load_margin
+        self.capacity_margin = capacity_margin
+        self.cpus = cpus or os.cpu_count() or 1
+        supply = os.path.join("sys", "class", "power_supply", battery)
+        self._status = os.path.join(supply, "status")
+        self._capacity = os.path.join(supply, "capacity")
+        self.sources = (LOADAVG, self._status, self._capacity)
+        PARSERS.setdefault(self._status, parse_str)
+        self.profile = None
+        self.listeners = []
+        self.switches = 0
+        self._wanted = None
+        self._since = 0.0
+        self._subscription = None
+
+    def inputs(self, sample) -> Inputs:
+        load = sample.get(LOADAVG)
+        return Inputs(
+            sample.get(self._status) == "Discharging",
+            sample.get(self._capacity),
+            0.0 if load is None else load / self.cpus,
+        )
+
+    def _level(self, inputs, slack) -> int:
+        """Index in ORDER for inputs, thresholds moved by slack margins."""
+        load = inputs.load + slack * self.load_margin
+        capacity = inputs.capacity
+        if inputs.discharging and capacity is not None:
+            if capacity <= self.minimal_capacity + slack * self.capacity_margin:
+                return 2
+        if load >= self.minimal_load:
+            return 2
+        if inputs.discharging or load >= self.reduce_load:
+            return 1
+        return 0
+
+    def wanted(self, inputs) -> str:
+        level = self._level(inputs, 0)
+        if self.profile is not None and level < ORDER.index(self.profile):
+            # only recover once the inputs are clear of the thresholds
+            level = min(self._level(inputs, 1), ORDER.index(self.profile))
+        return ORDER[level]
+
+    def decide(self, inputs, now=None) -> bool:
+        """Switch profile if inputs have wanted another one long enough,
+        return whether it switched."""
+        now = time.monotonic() if now is None else now
+        wanted = self.wanted(inputs)
+        if wanted == self.profile:
+            self._wanted = None
+            return False
+        if wanted != self._wanted:
+            self._wanted, self._since = wanted, now
+        if self.profile is not None:
+            degrade = ORDER.index(wanted) > ORDER.index(self.profile)
+            hold = self.degrade_after if degrade else self.recover_after
+            if now - self._since < hold:
+                return False
+        self.switch(wanted)
+        return True
+
+    def switch(self, profile):
+        logger.info("compositor profile %s -> %s", self.profile, profile)
+        self.profile = profile
+        self._wanted = None
+        self.switches += 1
+        try:
+            self.apply(profile)
+        except Exception:
+            logger.exception("compositor profile %s could not be applied", profile)
+        for listener in self.listeners:
+            listener(profile)
+
+    def _on_sample(self, sample):
+        self.decide(self.inputs(sample), sample["time"])
+
+    def start(self, qtile):
+        if self._subscription is None:
+            self._subscription = self.sampler.subscribe(
+                self._on_sample, self.sources, self.update_interval
+            )
+            self.sampler.start(qtile)
+            self._on_sample(self.sampler.sample(self.sources))
+
+    def stop(self):
+        if self._subscription is not None:
+            self.sampler.unsubscribe(self._subscription)
+            self._subscription = None
+
+
+class Picom:
+    """Writes a profile over picom's config and makes picom reload it. The
+    profiles are rendered from the config file on first use."""
+
+    def __init__(self, path=PICOM_CONF, theme=None, proc="/proc"):
+        self.path = path
+        self.theme = theme
+        self.proc = proc
+        self.configs = None
+        self.signalled = 0
+
+    def pids(self) -> list:
+        pids = []
+        for entry in os.listdir(self.proc):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.proc, entry, "comm")) as f:
+                    if f.read().strip() == "picom":
+                        pids.append(int(entry))
+            except OSError:
+                continue
+        return pids
+
+    def __call__(self, profile):
+        if self.configs is None:
+            with open(self.path) as f:
+                self.configs = picom_conf.render_profiles(f.read(), self.theme)
+        text = self.configs[profile]
+        with open(self.path) as f:
+            if f.read() == text:
+                return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, self.path)
+        for pid in self.pids():
+            try:
+                os.kill(pid, signal.SIGUSR1)
+                self.signalled += 1
+            except OSError:
+                logger.warning("could not signal picom %d", pid)
+
+
+def shared(theme=None, **options) -> Governor:
+    """Governor applying the picom profiles of theme, the same instance for the
+    same arguments, so executing the config again doesn't start a second one."""
+    key = repr((sorted((theme or {}).items()), sorted(options.items())))
+    if key not in GOVERNORS:
+        GOVERNORS[key] = Governor(Picom(theme=theme), **options)
+    return GOVERNORS[key]
@@ -0,0 +1,80 @@
+"""Colour gradient drawn in one cairo pass.
+
+Replaces a row of TextBoxes with one background colour each. The gradient is
+rendered into an ImageSurface once and only rendered again when the widget is
+resized, every draw after that is a single blit. Fully transparent bands are
+left as the surface's initial transparent pixels instead of being filled.
+"""
+import cairocffi
+from libqtile import bar
+from libqtile.widget import base
+
+import colors
+
+
+def _rgba(color) -> tuple:
+    return tuple(c / 255 for c in colors.unpack(colors.pack(color)))
+
+
+class GradientWidget(base._Widget):
+    defaults = [
+        ("start", "#00000000", "Colour at the start (left or top)"),
+        ("end", "#ffffffff", "Colour at the end (right or bottom)"),
+        ("steps", None, "Number of flat colour bands, None for a continuous gradient"),
+    ]
+
+    def __init__(self, length=bar.STRETCH, **config):
+        base._Widget.__init__(self, length, **config)
+        self.add_defaults(GradientWidget.defaults)
+        self.surface = None
+        self.renders = 0
+        self._size = None
+
+    def _render(self, width, height):
+        self.renders += 1
+        surface = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, width, height)
+        ctx = cairocffi.Context(surface)
+        ctx.set_operator(cairocffi.OPERATOR_SOURCE)
+        extent = width if self.bar.horizontal else height
+        if not self.steps:
+            if self.bar.horizontal:
+                pattern = cairocffi.LinearGradient(0, 0, extent, 0)
+            else:
+                pattern = cairocffi.LinearGradient(0, 0, 0, extent)
+            pattern.add_color_stop_rgba(0, *_rgba(self.start))
+            pattern.add_color_stop_rgba(1, *_rgba(self.end))
+            ctx.set_source(pattern)
+            ctx.paint()
+            return surface
+        band = extent / self.steps
+        for i, color in enumerate(colors.lerp_ramp(self.start, self.end, self.steps)):
+            start, stop = round(i * band), round((i + 1) * band)
+            if colors.alpha(color) == 0:
+                continue
+            ctx.set_source_rgba(*_rgba(color))
+            if self.bar.horizontal:
+                ctx.rectangle(start, 0, stop - start, height)
+            else:
+                ctx.rectangle(0, start, width, stop - start)
+            ctx.fill()
+        return surface
+
+    def draw(self):
+        size = (self.width, self.height)
+        if self.surface is None or self._size != size:
+            self.surface = self._render(*size)
+            self._size = size
+        # erases the drawer's pixmap, translucent bands would pile up otherwise
+        self.drawer.clear_rect()
+        ctx = self.drawer.ctx
+        ctx.save()
+        ctx.set_operator(cairocffi.OPERATOR_SOURCE)
+        ctx.set_source_surface(self.surface, 0, 0)
+        ctx.paint()
+        ctx.restore()
+        self.drawer.draw(
+            offsetx=self.offsetx,
+            offsety=self.offsety,
+            width=self.width,
+            height=self.height,
+        )
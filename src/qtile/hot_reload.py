@@ -0,0 +1,151 @@
+"""Incremental config reload for the bars.
+
+reload_bars() executes the config file again and diffs the bars it builds
+against the live ones. Widgets built by barspec carry a fingerprint of their
+factory and resolved arguments as spec_key (barspec.fingerprint, which follows
+the helpers and constants a callback reads): a live widget whose key is
+unchanged is kept with its state and timers, new keys are configured into the
+live bar and dropped ones are finalized. Other widgets are always rebuilt.
+Keys, groups and layouts are not touched and need full_reload(), which
+reload_bars() falls back to when the screens or a bar's own options changed.
+
+Both log the time from the key press until every bar has painted once.
+"""
+import runpy
+import time
+from collections import defaultdict, deque
+
+from libqtile import hook
+from libqtile.log_utils import logger
+
+POSITIONS = ("top", "bottom", "left", "right")
+LAST = {}  # stats of the last reload
+_pending_full = None
+
+
+def bar_key(bar) -> tuple:
+    config = getattr(bar, "_user_config", {})
+    return type(bar).__qualname__, bar.size, repr(sorted(config.items()))
+
+
+def diff_widgets(live, new) -> tuple:
+    """Return (widgets, created, removed): the new bar's widget list with
+    unchanged live widgets swapped in, the widgets to configure and the live
+    widgets to finalize."""
+    unchanged = defaultdict(deque)
+    for widget in live:
+        key = getattr(widget, "spec_key", None)
+        if key is not None:
+            unchanged[key].append(widget)
+    widgets, created = [], []
+    for widget in new:
+        kept = unchanged.get(getattr(widget, "spec_key", None))
+        if kept:
+            widgets.append(kept.popleft())
+        else:
+            widgets.append(widget)
+            created.append(widget)
+    keep = {id(w) for w in widgets}
+    removed = [w for w in live if id(w) not in keep]
+    return widgets, created, removed
+
+
+def _painted(stats, bar):
+    stats["waiting"].discard(bar)
+    if not stats["waiting"]:
+        stats["first_paint_ms"] = (time.monotonic() - stats.pop("start")) * 1e3
+        del stats["waiting"]
+        LAST.clear()
+        LAST.update(stats)
+        logger.info("%s reload: %s", stats["mode"], stats)
+
+
+def _time_first_paint(bars, stats):
+    stats["waiting"] = set(bars)
+    for bar in bars:
+
+        def first_draw(bar=bar, draw=bar._actual_draw):
+            del bar._actual_draw
+            draw()
+            _painted(stats, bar)
+
+        bar._actual_draw = first_draw
+
+
+def _bars(screens) -> list:
+    return [getattr(s, p) for s in screens for p in POSITIONS if getattr(s, p)]
+
+
+def track(screens):
+    """Time the first paint of screens if they come from full_reload(), call
+    this at the end of the config."""
+    global _pending_full
+    if _pending_full is not None:
+        _time_first_paint(_bars(screens), _pending_full)
+        _pending_full = None
+
+
+def full_reload(qtile):
+    global _pending_full
+    _pending_full = dict(mode="full", start=time.monotonic())
+    qtile.reload_config()
+
+
+def _apply(qtile, bar, widgets, created, removed):
+    for widget in removed:
+        if qtile.widgets_map.get(widget.name) is widget:
+            del qtile.widgets_map[widget.name]
+        widget.finalize()
+    bar.widgets = widgets
+    for widget in created:
+        if bar._configure_widget(widget):
+            qtile.register_widget(widget)
+        else:
+            bar.widgets.remove(widget)
+    bar._resize(bar.length, bar.widgets)
+
+
+def reload_bars(qtile):
+    """Rebuild only the changed widgets of the live bars, for lazy.function."""
+    start = time.monotonic()
+    # the config subscribes its hooks again, keep the live subscriptions only
+    hooks = {event: list(funcs) for event, funcs in hook.subscriptions.items()}
+    try:
+        config = runpy.run_path(qtile.config.file_path)
+    except Exception:
+        logger.exception("incremental reload: config failed, nothing changed")
+        return
+    finally:
+        hook.subscriptions.clear()
+        hook.subscriptions.update(hooks)
+    screens = config.get("fake_screens") or config.get("screens") or []
+    if len(screens) != len(qtile.screens):
+        return full_reload(qtile)
+    changes = []
+    for live_screen, screen in zip(qtile.screens, screens):
+        for position in POSITIONS:
+            live, new = getattr(live_screen, position), getattr(screen, position)
+            if live is None and new is None:
+                continue
+            if live is None or new is None or bar_key(live) != bar_key(new):
+                return full_reload(qtile)
+            changes.append((live, diff_widgets(live.widgets, new.widgets)))
+
+    stats = dict(mode="incremental", start=start, kept=0, created=0, removed=0)
+    redraw = []
+    for bar, (widgets, created, removed) in changes:
+        stats["kept"] += len(widgets) - len(created)
+        stats["created"] += len(created)
+        stats["removed"] += len(removed)
+        if created or removed or any(a is not b for a, b in zip(widgets, bar.widgets)):
+            _apply(qtile, bar, widgets, created, removed)
+            redraw.append(bar)
+    if not redraw:
+        stats.pop("start")
+        LAST.clear()
+        LAST.update(stats, first_paint_ms=0.0)
+        logger.info("incremental reload: nothing changed")
+        return
+    _time_first_paint(redraw, stats)
+    for bar in redraw:
+        bar.draw()
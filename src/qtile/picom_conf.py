@@ -0,0 +1,352 @@
+"""picom.conf generated from a qtile config's PICOM settings.
+
+Window rules are written once in RULES as picom condition strings. Before
+they are rendered every list is deduplicated, rules implied by a broader rule
+in the same exclude list are dropped, and rules and their conditions are
+ordered for the fewest condition tests per window on a typical window set,
+cost (window_type and class before names and X property lookups) breaking
+ties, since picom's matching short-circuits. Opacity rules are
+first-match-wins, so a rule only moves ahead of rules it cannot overlap with.
+The written order is kept when it already needs fewer tests.
+
+The config's PICOM dict (palette colours, corner radius, blur strength, ...)
+overrides DEFAULTS, and the result is filled into the existing picom.conf so
+its comments stay:
+
+    python src/qtile/picom_conf.py src/qtile/glassmorphism.py src/picom/picom.conf
+
+PROFILES are the full look and cheaper variants for governor.py, an optional
+third argument writes one of them instead of "full".
+
+Without qtile installed, run it with PYTHONPATH=bench/stubs.
+"""
+import fnmatch
+import re
+import runpy
+import sys
+from collections import namedtuple
+
+Condition = namedtuple("Condition", "negate target op value")
+Rule = namedtuple("Rule", "value conditions")  # value None in exclude lists
+
+RULES = {
+    "shadow-exclude": [
+        "name = 'Notification'",
+        "class_g = 'Conky'",
+        "class_g ?= 'Notify-osd'",
+        "class_g = 'Cairo-clock'",
+        "_GTK_FRAME_EXTENTS@:c",
+    ],
+    "opacity-rule": [
+        "30:class_g = 'Terminator' && !focused",
+        "100:class_g = 'Gvim' && focused",
+        "60:class_g = 'Gvim' && !focused",
+    ],
+    "rounded-corners-exclude": [
+        "window_type = 'dock'",
+        "window_type = 'desktop'",
+    ],
+    "blur-background-exclude": [
+        "window_type = 'dock'",
+        "window_type = 'desktop'",
+        "_GTK_FRAME_EXTENTS@:c",
+    ],
+}
+DEFAULTS = {
+    "shadow-offset-x": -10,
+    "shadow-offset-y": -10,
+    "corner-radius": 30,
+    "blur-strength": 8,
+}
+# applied over the theme, callables get the settings so far
+PROFILES = {
+    "full": {
+        "shadow": True,
+        "fading": True,
+        "fade-delta": 4,
+        "blur-background": True,
+    },
+    "reduced": {
+        "shadow": True,
+        "fading": True,
+        "fade-delta": 12,  # ms per fade step, fewer repaints
+        "blur-background": True,
+        "blur-strength": lambda settings: max(1, settings["blur-strength"] // 2),
+    },
+    "minimal": {
+        "shadow": False,
+        "fading": False,
+        "fade-delta": 12,
+        "blur-background": False,
+    },
+}
+# relative cost of testing a target: window_type and focus are cached ints,
+# class and name are cached strings, @ targets fetch an X property
+COSTS = {"window_type": 1, "focused": 1, "class_g": 2, "class_i": 2, "name": 3}
+PROPERTY_COST = 8
+# (weight, window) of a typical session, for ordering the rules
+WINDOWS = (
+    (30, dict(class_g="Terminator", name="~", window_type="normal")),
+    (20, dict(class_g="firefox", name="Mozilla Firefox", window_type="normal")),
+    (5, dict(class_g="Gvim", name="config.py", window_type="normal")),
+    (5, dict(class_g="Nautilus", name="", window_type="normal", _GTK_FRAME_EXTENTS=1)),
+    (10, dict(class_g="qtile", name="", window_type="dock")),
+    (10, dict(class_g="firefox", name="", window_type="tooltip")),
+    (8, dict(class_g="firefox", name="", window_type="popup_menu")),
+    (3, dict(class_g="Dunst", name="Notification", window_type="notification")),
+    (1, dict(class_g="Conky", name="conky", window_type="desktop")),
+)
+
+_CONDITION = re.compile(
+    r"^(!)?\s*([A-Za-z_]\w*)(@:\w+)?\s*(?:(!=|\??[*^%~]?=)\s*'([^']*)')?$"
+)
+
+
+def parse_condition(text) -> Condition:
+    match = _CONDITION.match(text.strip())
+    if match is None:
+        raise ValueError("unsupported picom condition: {!r}".format(text))
+    negate, target, prop, op, value = match.groups()
+    return Condition(bool(negate), target + (prop or ""), op, value)
+
+
+def parse_rule(text, valued=False) -> Rule:
+    value = None
+    if valued:
+        value, _, text = text.partition(":")
+        value = int(value)
+    return Rule(value, tuple(parse_condition(c) for c in text.split("&&")))
+
+
+def format_rule(rule) -> str:
+    conditions = " && ".join(
+        "{}{}{}".format(
+            "!" if c.negate else "",
+            c.target,
+            " {} '{}'".format(c.op, c.value) if c.op else "",
+        )
+        for c in rule.conditions
+    )
+    return conditions if rule.value is None else "{}:{}".format(rule.value, conditions)
+
+
+def cost(condition) -> int:
+    if "@" in condition.target:
+        return PROPERTY_COST
+    return COSTS.get(condition.target, PROPERTY_COST)
+
+
+def test(condition, window) -> bool:
+    """Whether the condition holds for window, a dict of target values."""
+    value = window.get(condition.target.split("@")[0])
+    op = condition.op
+    if op is None:
+        result = bool(value)
+    else:
+        value, expected = str(value or ""), condition.value
+        if op.startswith("?"):
+            value, expected, op = value.lower(), expected.lower(), op[1:]
+        if op == "=":
+            result = value == expected
+        elif op == "!=":
+            result = value != expected
+        elif op == "*=":
+            result = expected in value
+        elif op == "^=":
+            result = value.startswith(expected)
+        elif op == "%=":
+            result = fnmatch.fnmatchcase(value, expected)
+        else:
+            result = re.search(expected, value) is not None
+    return result != condition.negate
+
+
+def evaluate(rules, window, stats=None):
+    """First matching rule (True for exclude lists), counting every condition
+    test and its cost into stats."""
+    for rule in rules:
+        for condition in rule.conditions:
+            if stats is not None:
+                stats["tests"] += 1
+                stats["cost"] += cost(condition)
+            if not test(condition, window):
+                break
+        else:
+            return True if rule.value is None else rule.value
+    return None
+
+
+def _probability(conditions, windows) -> float:
+    total = sum(weight for weight, _ in windows)
+    hits = sum(
+        weight
+        for weight, window in windows
+        for focused in (False, True)
+        if all(test(c, dict(window, focused=focused)) for c in conditions)
+    )
+    return hits / (2 * total)
+
+
+def _order_conditions(conditions, windows) -> tuple:
+    # AND: most likely to fail first, then cheapest
+    return tuple(
+        sorted(conditions, key=lambda c: (_probability((c,), windows), cost(c)))
+    )
+
+
+def expected(rules, windows=WINDOWS) -> tuple:
+    """(tests, cost) per window of evaluating rules on windows."""
+    stats = {"tests": 0, "cost": 0}
+    total = 0
+    for weight, window in windows:
+        for focused in (False, True):
+            counted = {"tests": 0, "cost": 0}
+            evaluate(rules, dict(window, focused=focused), counted)
+            stats["tests"] += weight * counted["tests"]
+            stats["cost"] += weight * counted["cost"]
+            total += weight
+    return stats["tests"] / total, stats["cost"] / total
+
+
+def _exclusive(a, b) -> bool:
+    """Whether no window can match both rules."""
+    for x in a.conditions:
+        for y in b.conditions:
+            if x.target != y.target:
+                continue
+            if x.op == y.op and x.value == y.value and x.negate != y.negate:
+                return True
+            if (
+                x.op == y.op == "="
+                and not x.negate
+                and not y.negate
+                and x.value != y.value
+            ):
+                return True
+    return False
+
+
+def _implies(narrow, broad) -> bool:
+    return set(broad.conditions) <= set(narrow.conditions)
+
+
+def optimize(rules, windows=WINDOWS) -> list:
+    """Deduplicated rules in the order that needs the fewest condition tests
+    for windows, matching the same windows as rules did. Keeps the written
+    order if the reordered rules would need more tests."""
+    written = []
+    for rule in rules:
+        if any(set(rule.conditions) == set(r.conditions) for r in written):
+            continue  # never reached, an identical rule matches first
+        written.append(rule)
+    exclude = all(rule.value is None for rule in written)
+    if exclude:
+        written = [
+            r
+            for r in written
+            if not any(o is not r and _implies(r, o) for o in written)
+        ]
+    unique = [
+        Rule(r.value, _order_conditions(r.conditions, windows)) for r in written
+    ]
+
+    def key(rule):
+        p = max(_probability(rule.conditions, windows), 1e-3)
+        return len(rule.conditions) / p, sum(cost(c) for c in rule.conditions) / p
+
+    if exclude:
+        ordered = sorted(unique, key=key)
+    else:
+        ordered = []
+        for rule in unique:
+            # stable insertion, only past rules that can not match the same window
+            index = len(ordered)
+            while (
+                index
+                and key(ordered[index - 1]) > key(rule)
+                and _exclusive(ordered[index - 1], rule)
+            ):
+                index -= 1
+            ordered.insert(index, rule)
+    return min(ordered, written, key=lambda r: expected(r, windows))
+
+
+def build(settings=None, profile="full", windows=WINDOWS) -> dict:
+    """{option: value} with the rule lists parsed and optimized."""
+    settings = dict(DEFAULTS, **(settings or {}))
+    for option, value in PROFILES[profile].items():
+        settings[option] = value(settings) if callable(value) else value
+    for option, texts in RULES.items():
+        texts = settings.pop(option, texts)
+        rules = [parse_rule(t, valued=option == "opacity-rule") for t in texts]
+        settings[option] = optimize(rules, windows)
+    return settings
+
+
+def format_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return '"{}"'.format(value)
+    return str(value)
+
+
+def render(template, settings) -> str:
+    """template with the options of settings replaced, commented entries in
+    lists are kept at their place among the entries."""
+    for option, value in settings.items():
+        name = re.escape(option)
+        if isinstance(value, list):
+            array = re.compile(r"^{} = \[\n(.*?)^\];".format(name), re.M | re.S)
+            match = array.search(template)
+            if match is None:
+                raise ValueError("{} not in the template".format(option))
+            lines = ['  "{}",'.format(format_rule(rule)) for rule in value]
+            # a comment goes back after as many entries as preceded it
+            comments, entries = [], 0
+            for line in match.group(1).splitlines():
+                if line.lstrip().startswith("#"):
+                    comments.append((min(entries, len(value)), line))
+                elif line.strip():
+                    entries += 1
+            for offset, (index, line) in enumerate(comments):
+                lines.insert(index + offset, line)
+            body = "\n".join(lines)
+            template = "{}{} = [\n{}\n];{}".format(
+                template[: match.start()], option, body, template[match.end() :]
+            )
+            continue
+        value = format_value(value)
+        # keep the separator and comment of the line
+        active = re.compile(
+            r'^({}\s*=\s*)(?:"[^"\n]*"|[^;#\n]*[^;#\s])'.format(name), re.M
+        )
+        template, replaced = active.subn(
+            lambda m: m.group(1) + value, template, count=1
+        )
+        if replaced:
+            continue
+        line = "{} = {};".format(option, value)
+        commented = list(re.finditer(r"^#\s*{}\s*=.*$".format(name), template, re.M))
+        if not commented:
+            raise ValueError("{} not in the template".format(option))
+        end = commented[-1].end()
+        template = template[:end] + "\n" + line + template[end:]
+    return template
+
+
+def render_profiles(template, settings=None) -> dict:
+    """{profile: picom.conf text} of every profile in PROFILES."""
+    return {name: render(template, build(settings, name)) for name in PROFILES}
+
+
+def main(config, conf, profile="full"):
+    theme = runpy.run_path(config).get("PICOM", {})
+    with open(conf) as f:
+        template = f.read()
+    with open(conf, "w") as f:
+        f.write(render(template, build(theme, profile)))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -24,13 +24,28 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from libqtile import bar, layout, widget
+from libqtile import bar, hook, layout, qtile, widget
 from libqtile.config import Click, Drag, Group, Key, Match, Screen
 from libqtile.lazy import lazy
 from libqtile.utils import guess_terminal
 
 # MY CODE ==================================================
-from collections import namedtuple
+import barspec
+from barspec import Ref, Segment, W
+import colors
+import geometry
+import hot_reload
+import glyphs
+import gradient
+import profiling
+import tasklist
+import titles
+from scheduler import FrameBar
+import system_widgets
+import async_widgets
+import event_widgets
+from audio import VOLUME
+from brightness import get_controller
 
 
 # https://github.com/morhetz/gruvbox/blob/master/colors/gruvbox.vim
@@ -145,32 +160,28 @@ SYMBOLS = {
 }
 VOLUME_COMMANDS: {str: str} = {
     # str: str
-    "up": "sh -c 'pactl set-sink-mute @DEFAULT_SINK@ false; pactl set-sink-volume @DEFAULT_SINK@ +10%'",
-    "down": "sh -c 'pactl set-sink-mute @DEFAULT_SINK@ false; pactl set-sink-volume @DEFAULT_SINK@ -10%'",
-    "toggle": "pactl set-sink-mute @DEFAULT_SINK@ toggle",
     "toggle-mic": "pactl set-source-mute @DEFAULT_SOURCE@ toggle",
 }
+VOLUME_STEP = 10
+BRIGHTNESS = get_controller("intel_backlight")
+BRIGHTNESS_STEP = 10
 WIDTH = 28  # 32 with font=12
+FONT = "JetBrainsMono Nerd Font"
 FONTSIZE = 12
+TITLE_WIDTH = 8 * FONTSIZE  # about the old 10 characters and ellipsis
 DEBUG = "#00ff00"
 MARGIN = 15
 BACKGROUND = GRUVBOX["bg0_h"] + "00"
+# picom options of this theme, written to picom.conf by picom_conf.py
+PICOM = {"shadow-color": GRUVBOX["bg0_h"], "corner-radius": 2 * MARGIN}
 
-YOFFSET = 0  # offset from top of the screen
-SCREENDIM = (1366, 768)  # (1366, 768)
-FakeScreenDimDim = namedtuple("FakeScreenDimDim", "x y width height")
-DUMMY = FakeScreenDimDim(0, YOFFSET + MARGIN, SCREENDIM[0], WIDTH)
-MAIN = FakeScreenDimDim(
-    DUMMY.x,
-    DUMMY.y + DUMMY.height + MARGIN,
-    SCREENDIM[0],
-    SCREENDIM[1] - DUMMY.y - DUMMY.height - MARGIN,
-)
+YOFFSET = 0  # offset from top of the output
 
 
 def text_color_transition(color_1, color_2, symbol):
-    """Return circle textbox instance. Transition from color 1 to color 2."""
-    return widget.TextBox(
+    """Return circle glyph instance. Transition from color 1 to color 2.
+    The glyph is rasterized once and blitted from glyphs.ATLAS afterwards."""
+    return glyphs.GlyphTransition(
         symbol, foreground=color_1, background=color_2, fontsize=25, padding=-1
     )
 
@@ -191,31 +202,28 @@ def get_endcap(color_1, color_2, symbol, left=True) -> tuple:
     )
 
 
-def truncate_text(text: str) -> str:
-    ELLIPSIS = "..."
-    MAX = 10
-    if len(text) > MAX:
-        return text[:MAX] + ELLIPSIS
-    return text
+truncate_text = titles.fitter(TITLE_WIDTH, FONT, FONTSIZE)
+
 
+def layout_output(output, index) -> tuple:
+    """Split an output into the main screen and the strip above it that holds
+    the 2nd bar."""
+    strip = geometry.Rect(output.x, output.y + YOFFSET + MARGIN, output.width, WIDTH)
+    top = strip.y + strip.height + MARGIN - output.y
+    main = geometry.Rect(output.x, output.y + top, output.width, output.height - top)
+    return main, strip
 
-def init_fake_screens():
-    main_screen = Screen(
-        top=init_bar(init_1st_bar_widgets()),
-        x=MAIN.x,
-        y=MAIN.y,
-        height=MAIN.height,
-        width=MAIN.width,
+
+def init_screen(index, role, rect):
+    """Fake screen for the rect layout_output returned at position role."""
+    if role == 1:
+        bottom = init_bar(init_2nd_bar_widgets(), max_fps=2)
+        return Screen(bottom=bottom, **rect._asdict())
+    return Screen(
+        top=init_bar(init_1st_bar_widgets(primary=index == 0)),
         bottom=init_bar(init_gradient_bar_widgets()),
+        **rect._asdict()
     )
-    dummy_screen = Screen(
-        bottom=init_bar(init_2nd_bar_widgets()),
-        x=DUMMY.x,
-        y=DUMMY.y,
-        height=DUMMY.height,
-        width=DUMMY.width,
-    )
-    return [main_screen, dummy_screen]
 
 
 def init_treelayout():
@@ -253,241 +261,288 @@ def init_treelayout():
     )
 
 
-def init_bar(widgets) -> bar.Bar:
-    return bar.Bar(
+def init_bar(widgets, **config) -> bar.Bar:
+    """@param config: extra FrameBar options, e.g. max_fps"""
+    return FrameBar(
         widgets,
         WIDTH,
         background=GRUVBOX["bg0_h"] + "00",  # make color transparent
         border_width=0,  # [N E S W]
         border_color=[GRUVBOX["bg0_s"] + "00"] * 4,  # make border transparent
+        **config
     )
 
 
-def init_1st_bar_widgets() -> list:
-    return [
-        *get_endcap(GRADIENT3[0], BACKGROUND, SYMBOLS["left-circle"]),
-        widget.CheckUpdates(
-            distro="Arch", no_update_string="0 updates", background=GRADIENT3[0]
-        ),
-        text_color_transition(GRADIENT3[0], GRADIENT3[1], SYMBOLS["right-circle"]),
-        widget.TextBox(" ", background=GRADIENT3[1]),
-        widget.CurrentLayoutIcon(scale=0.65, background=GRADIENT3[1]),
-        widget.CurrentLayout(background=GRADIENT3[1]),
-        widget.TextBox(" ", background=GRADIENT3[1]),
-        text_color_transition(GRADIENT3[1], GRADIENT3[2], SYMBOLS["right-circle"]),
-        widget.TextBox(" ", background=GRADIENT3[2]),
-        widget.GroupBox(
-            background=GRADIENT3[2],
-            foreground="#ffff00",
-            highlight_method="block",
-            active="#ff0000",
-            inactive="#00ffff",
-            disable_drag=True,
-            block_highlight_text_color=GRUVBOX["bg0_h"],
-            highlight_color=[GRADIENT3[2], GRADIENT[3]],
-            this_current_screen_border=GRADIENT[3],
-            this_screen_border="#00ff00",
-            other_current_screen_border="#ff00ff",
-            other_screen_border=GRADIENT3[3],
+POWERLINE = {
+    "style": "powerline",
+    "transition": "text_color_transition",
+    "cap": "get_endcap",
+    "outer": BACKGROUND,
+    "symbols": {
+        "left": SYMBOLS["right-circle"],
+        "right": SYMBOLS["left-circle"],
+        "left_cap": SYMBOLS["left-circle"],
+        "right_cap": SYMBOLS["right-circle"],
+    },
+}
+PAD = W("widget.TextBox", " ")
+
+
+def init_1st_bar_widgets(primary=True) -> list:
+    """@param primary: False leaves out the tray, there can only be one"""
+    segments = [
+        Segment(
+            GRADIENT3[0],
+            [
+                W(
+                    "async_widgets.CheckUpdates",
+                    distro="Arch",
+                    no_update_string="0 updates",
+                )
+            ],
         ),
-        text_color_transition(
-            GRADIENT3[2], GRADIENT3[3] + "00", SYMBOLS["right-circle"]
+        Segment(
+            GRADIENT3[1],
+            [
+                PAD,
+                W("widget.CurrentLayoutIcon", scale=0.65),
+                W("widget.CurrentLayout"),
+                PAD,
+            ],
         ),
-        widget.TextBox(" "),
-        widget.TaskList(
-            # background=GRADIENT3[1],
-            border=GRADIENT[3],
-            # borderwidth=[1, BORDERWIDTH, 1, 1],
-            foreground=GRUVBOX["bg0_h"],
-            highlight_method="block",
-            icon_size=None,
-            margin=3,
-            # max_title_width=200,
-            padding=3,
-            parse_text=truncate_text,
-            rounded=True,
-            spacing=None,
-            theme_mode=None,
-            # title_width_method="uniform",
-            unfocused_border=GRADIENT3[3],
-            urgent_alert_method="border",
-            urgent_border=GRUVBOX["red"],
+        Segment(
+            GRADIENT3[2],
+            [
+                PAD,
+                W(
+                    "widget.GroupBox",
+                    foreground="#ffff00",
+                    highlight_method="block",
+                    active="#ff0000",
+                    inactive="#00ffff",
+                    disable_drag=True,
+                    block_highlight_text_color=GRUVBOX["bg0_h"],
+                    highlight_color=[GRADIENT3[2], GRADIENT[3]],
+                    this_current_screen_border=GRADIENT[3],
+                    this_screen_border="#00ff00",
+                    other_current_screen_border="#ff00ff",
+                    other_screen_border=GRADIENT3[3],
+                ),
+            ],
         ),
-        # text_color_transition(GRADIENT3[2], GRADIENT3[3], SYMBOLS["right-circle"]),
-        # text_color_transition(GRADIENT3[3], GRADIENT3[4], SYMBOLS["right-circle"]),
-        # END LEFT BLOCK
-        # widget.Spacer(),
-        widget.TextBox(" "),
-        # text_color_transition(
-        #    GRADIENT3[5], GRADIENT3[0] + "00", SYMBOLS["left-circle"]
-        # ),
-        # text_color_transition(GRADIENT3[4], GRADIENT3[5], SYMBOLS["left-circle"]),
-        widget.Systray(),
-        widget.StatusNotifier(),
-        widget.TextBox(" "),
-        # text_color_transition(GRADIENT3[4], BACKGROUND, SYMBOLS["left-circle"]),
-        # widget.TextBox(
-        #    "\uea99 ",
-        #    foreground=GRUVBOX["bg0_h"],
-        #    background=GRADIENT3[4],
-        #    fontsize=int(1.5 * FONTSIZE),
-        # ),
-        # widget.StatusNotifier(background=GRADIENT3[4], foreground=GRUVBOX["bg0_h"], icon_theme=None),   # needs python-pyxdg, and python-dbus-next
-        # widget.TextBox(" ", background=GRADIENT3[4]),
-        text_color_transition(
-            GRADIENT3[3], GRADIENT3[4] + "00", SYMBOLS["left-circle"]
+        # MIDDLE, keeps the transparent bar background
+        Segment(
+            GRADIENT3[3] + "00",
+            [
+                PAD,
+                W(
+                    "tasklist.VirtualTaskList",
+                    border=GRADIENT[3],
+                    # borderwidth=[1, BORDERWIDTH, 1, 1],
+                    foreground=GRUVBOX["bg0_h"],
+                    highlight_method="block",
+                    icon_size=None,
+                    margin=3,
+                    # max_title_width=200,
+                    padding=3,
+                    parse_text=Ref("truncate_text"),
+                    rounded=True,
+                    spacing=None,
+                    theme_mode=None,
+                    # title_width_method="uniform",
+                    unfocused_border=GRADIENT3[3],
+                    urgent_alert_method="border",
+                    urgent_border=GRUVBOX["red"],
+                ),
+                PAD,
+                *([W("widget.Systray"), W("widget.StatusNotifier")] if primary else []),
+                PAD,
+            ],
+            fill=False,
         ),
-        widget.TextBox(
-            " ",
-            foreground=GRUVBOX["bg0_h"],
-            background=GRADIENT3[3],
-            fontsize=FONTSIZE,
+        Segment(
+            GRADIENT3[3],
+            [
+                W(
+                    "widget.TextBox",
+                    " ",
+                    foreground=GRUVBOX["bg0_h"],
+                    fontsize=FONTSIZE,
+                ),
+                W("event_widgets.PulseVolume", foreground=GRUVBOX["bg0_h"]),
+                W("widget.TextBox", " ", fontsize=FONTSIZE),
+            ],
+            side="right",
         ),
-        widget.PulseVolume(foreground=GRUVBOX["bg0_h"], background=GRADIENT3[3]),
-        widget.TextBox(" ", background=GRADIENT3[3], fontsize=FONTSIZE),
-        text_color_transition(GRADIENT3[2], GRADIENT3[3], SYMBOLS["left-circle"]),
-        widget.Backlight(
-            format=SYMBOLS["brightness"] + "{percent:2.0%} ",
-            change_command="brightnessctl set {}%",
-            backlight_name="intel_backlight",
-            background=GRADIENT3[2],
-            # foreground=GRUVBOX["bg0_h"],
+        Segment(
+            GRADIENT3[2],
+            [
+                W(
+                    "event_widgets.Backlight",
+                    format=SYMBOLS["brightness"] + "{percent:2.0%} ",
+                    backlight_name="intel_backlight",
+                    controller=Ref("BRIGHTNESS"),
+                ),
+            ],
+            side="right",
         ),
-        text_color_transition(GRADIENT3[1], GRADIENT3[2], SYMBOLS["left-circle"]),
-        widget.Battery(
-            # foreground=GRUVBOX["bg0_h"],
-            background=GRADIENT3[1],
-            show_short_text=False,
-            low_percentage=0.15,
-            charge_char="\uf0e7",
-            discharge_char="\uf242",
-            empty_char="\uf244",
-            full_char="\uf240",
-            format="{char}  {percent:2.0%} ",
-            unkown_char="?",
-            low_foreground=GRUVBOX["red"],
-            update_interval=30,
+        Segment(
+            GRADIENT3[1],
+            [
+                W(
+                    "event_widgets.Battery",
+                    # foreground=GRUVBOX["bg0_h"],
+                    show_short_text=False,
+                    low_percentage=0.15,
+                    charge_char="\uf0e7",
+                    discharge_char="\uf242",
+                    empty_char="\uf244",
+                    full_char="\uf240",
+                    format="{char}  {percent:2.0%} ",
+                    unkown_char="?",
+                    low_foreground=GRUVBOX["red"],
+                    update_interval=30,
+                ),
+            ],
+            side="right",
         ),
-        text_color_transition(GRADIENT3[0], GRADIENT3[1], SYMBOLS["left-circle"]),
-        widget.Spacer(length=int(FONTSIZE / 2), background=GRADIENT3[0]),
-        widget.QuickExit(
-            default_text=SYMBOLS["power"],
-            countdown_format="({})",
-            fontsize=int(1.5 * FONTSIZE),
-            foreground=GRADIENT3[5],
-            background=GRUVBOX["bg0_h"],
+        Segment(
+            GRADIENT3[0],
+            [
+                W("widget.Spacer", length=int(FONTSIZE / 2)),
+                W(
+                    "widget.QuickExit",
+                    default_text=SYMBOLS["power"],
+                    countdown_format="({})",
+                    fontsize=int(1.5 * FONTSIZE),
+                    foreground=GRADIENT3[5],
+                    background=GRUVBOX["bg0_h"],
+                ),
+            ],
+            side="right",
         ),
-        *get_endcap(GRADIENT3[0], BACKGROUND, SYMBOLS["right-circle"], left=False),
     ]
+    return barspec.build(dict(POWERLINE, segments=segments), globals())
 
 
 def init_2nd_bar_widgets() -> list:
-    return [
-        *get_endcap(GRADIENT3[0], BACKGROUND, SYMBOLS["left-circle"]),
-        # widget.TextBox(" ", background=GRADIENT3[0], fontsize=FONTSIZE),
-        widget.CPU(
-            format="CPU {freq_current}GHz {load_percent}%",
-            background=GRADIENT3[0],
-        ),
-        text_color_transition(GRADIENT3[0], GRADIENT3[1], SYMBOLS["right-circle"]),
-        widget.TextBox(" ", background=GRADIENT3[1], fontsize=FONTSIZE),
-        widget.Memory(
-            measure_mem="G",
-            measure_swap="G",
-            background=GRADIENT3[1],
-            # RAM|SWP
-            format="RAM {MemUsed:.0f}/{MemTotal:.0f}{mm} SWP {SwapUsed:.0f}/{SwapTotal:.0f}{mm}",
+    segments = [
+        Segment(
+            GRADIENT3[0],
+            [W("system_widgets.CPU", format="CPU {freq_current}GHz {load_percent}%")],
         ),
-        text_color_transition(GRADIENT3[1], GRADIENT3[2], SYMBOLS["right-circle"]),
-        widget.TextBox(" ", background=GRADIENT3[2], fontsize=FONTSIZE),
-        widget.ThermalZone(
-            fgcolor_normal=GRUVBOX["fg"],
-            background=GRADIENT3[2],
-            format=SYMBOLS["thermometer"] + " " + "{temp}°F",
-        ),
-        # widget.Load(background=GRADIENT3[2]),  # what is this even measuring
-        text_color_transition(GRADIENT3[2], GRADIENT3[3], SYMBOLS["right-circle"]),
-        widget.TextBox(
-            " ",
-            background=GRADIENT3[3],
-        ),
-        widget.Net(
-            foreground=GRUVBOX["bg0_h"],
-            background=GRADIENT3[3],
-            format="↓↑ {total}",
+        Segment(
+            GRADIENT3[1],
+            [
+                W("widget.TextBox", " ", fontsize=FONTSIZE),
+                W(
+                    "system_widgets.Memory",
+                    measure_mem="G",
+                    measure_swap="G",
+                    # RAM|SWP
+                    format="RAM {MemUsed:.0f}/{MemTotal:.0f}{mm} SWP {SwapUsed:.0f}/{SwapTotal:.0f}{mm}",
+                ),
+            ],
         ),
-        text_color_transition(GRADIENT3[3], GRADIENT3[4], SYMBOLS["right-circle"]),
-        # widget.TextBox(
-        #    " ",
-        #    background=GRADIENT3[4],
-        # ),
-        widget.DF(
-            visible_on_warn=False,
-            background=GRADIENT3[4],
-            foreground=GRUVBOX["bg0_h"],
-            format=" \uf0c7" + " {f}{m}|{r:.0f}%",
+        Segment(
+            GRADIENT3[2],
+            [
+                W("widget.TextBox", " ", fontsize=FONTSIZE),
+                W(
+                    "system_widgets.ThermalZone",
+                    fgcolor_normal=GRUVBOX["fg"],
+                    format=SYMBOLS["thermometer"] + " " + "{temp}°F",
+                ),
+                # W("widget.Load"),  # what is this even measuring
+            ],
         ),
-        text_color_transition(GRADIENT3[4], GRADIENT3[5], SYMBOLS["right-circle"]),
-        widget.TextBox(" ", background=GRADIENT3[5], fontsize=int(FONTSIZE / 2)),
-        widget.TextBox(
-            "\uf120",
-            foreground=GRUVBOX["bg0_h"],
-            background=GRADIENT3[5],
-            fontsize=2 * FONTSIZE,
+        Segment(
+            GRADIENT3[3],
+            [
+                PAD,
+                W(
+                    "system_widgets.Net",
+                    foreground=GRUVBOX["bg0_h"],
+                    format="↓↑ {total}",
+                ),
+            ],
         ),
-        widget.Prompt(
-            prompt="",
-            background=GRADIENT3[5],
-            foreground=GRUVBOX["bg0_h"],
-            fontsize=FONTSIZE + 4,
-            cursor_color=GRUVBOX["bg0_h"],
-            bell_style="visual",
-            visual_bell_color=DEBUG,
+        Segment(
+            GRADIENT3[4],
+            [
+                W(
+                    "system_widgets.DF",
+                    visible_on_warn=False,
+                    foreground=GRUVBOX["bg0_h"],
+                    format=" \uf0c7" + " {f}{m}|{r:.0f}%",
+                ),
+            ],
         ),
-        text_color_transition(
-            GRADIENT3[5], GRADIENT3[0] + "00", SYMBOLS["right-circle"]
+        Segment(
+            GRADIENT3[5],
+            [
+                W("widget.TextBox", " ", fontsize=int(FONTSIZE / 2)),
+                W(
+                    "widget.TextBox",
+                    "\uf120",
+                    foreground=GRUVBOX["bg0_h"],
+                    fontsize=2 * FONTSIZE,
+                ),
+                W(
+                    "widget.Prompt",
+                    prompt="",
+                    foreground=GRUVBOX["bg0_h"],
+                    fontsize=FONTSIZE + 4,
+                    cursor_color=GRUVBOX["bg0_h"],
+                    bell_style="visual",
+                    visual_bell_color=DEBUG,
+                ),
+            ],
         ),
-        # widget.LaunchBar(BACKGROUND=DEBUG),
-        # widget.Notify(),
-        # widget.TextBox(" "),
         # MIDDLE
-        widget.Spacer(),
-        # text_color_transition(
-        #    GRADIENT3[2], GRADIENT3[0] + "00", SYMBOLS["left-circle"]
-        # ),
-        # text_color_transition(GRADIENT3[2], GRADIENT3[3] + "00", SYMBOLS["left-circle"]),
-        text_color_transition(
-            GRADIENT3[1], GRADIENT3[2] + "00", SYMBOLS["left-circle"]
+        Segment(
+            GRADIENT3[0] + "00",
+            [
+                # empty unless profiling, see mod+ctrl+p
+                W("profiling.Profiler", foreground=GRUVBOX["fg"]),
+                W("widget.Spacer"),
+            ],
+            fill=False,
         ),
-        widget.OpenWeather(
-            location="Berkeley, US",
-            metric=False,
-            # format="{main_temp}°{units_temperature} {icon} {weather_details}",
-            format="{location_city} {main_temp}°{units_temperature} {weather_details}",
-            background=GRADIENT3[1],
+        Segment(
+            GRADIENT3[1],
+            [
+                W(
+                    "async_widgets.OpenWeather",
+                    location="Berkeley, US",
+                    metric=False,
+                    # format="{main_temp}°{units_temperature} {icon} {weather_details}",
+                    format="{location_city} {main_temp}°{units_temperature} {weather_details}",
+                ),
+                PAD,
+            ],
+            side="right",
+        ),
+        Segment(
+            GRADIENT3[0],
+            [W("widget.Clock", format="%Y/%m/%d %a %I:%M %p")],
+            side="right",
         ),
-        widget.TextBox(" ", background=GRADIENT3[1]),
-        text_color_transition(GRADIENT3[0], GRADIENT3[1], SYMBOLS["left-circle"]),
-        widget.Clock(background=GRADIENT3[0], format="%Y/%m/%d %a %I:%M %p"),
-        *get_endcap(GRADIENT3[0], BACKGROUND, SYMBOLS["right-circle"], left=False),
     ]
-
-
-def rgba_to_hex(color: tuple) -> str:
-    """Convert rga or rgba to hex. If rgb then a=255 is assumed."""
-    if len(color) == 3:
-        # rgb
-        return "#{:02x}{:02x}{:02x}".format(*color)
-    # rgba
-    return "#{:02x}{:02x}{:02x}{:02x}".format(*color)
+    return barspec.build(dict(POWERLINE, segments=segments), globals())
 
 
 def init_gradient_bar_widgets() -> list:
-    colors = []
     rgb = (150, 150, 150)
-    for i in range(0, 255, 20):
-        colors.append(widget.TextBox(" ", background=rgba_to_hex((*rgb, i))))
-    return colors
+    steps = 13  # range(0, 255, 20)
+    return [
+        gradient.GradientWidget(
+            length=steps * FONTSIZE,
+            start=colors.with_alpha(rgb, 0),
+            end=colors.with_alpha(rgb, 240),
+            steps=steps,
+        )
+    ]
 
 
 # MY CODE ==================================================
@@ -541,16 +596,41 @@ keys = [
     # Toggle between different layouts as defined below
     Key([mod], "Tab", lazy.next_layout(), desc="Toggle between layouts"),
     Key([mod], "w", lazy.window.kill(), desc="Kill focused window"),
-    Key([mod, "control"], "r", lazy.reload_config(), desc="Reload the config"),
+    Key(
+        [mod, "control"],
+        "r",
+        lazy.function(hot_reload.reload_bars),
+        desc="Reload the bars, keeping unchanged widgets",
+    ),
+    Key(
+        [mod, "control", "shift"],
+        "r",
+        lazy.function(hot_reload.full_reload),
+        desc="Reload the config",
+    ),
+    Key(
+        [mod, "control"],
+        "p",
+        lazy.function(profiling.toggle),
+        desc="Start or stop profiling the widgets",
+    ),
     Key([mod, "control"], "q", lazy.shutdown(), desc="Shutdown Qtile"),
     Key([mod], "r", lazy.spawncmd(), desc="Spawn a command using a prompt widget"),
-    # control screen brightness, needs brightnessctl to work
-    Key([], "XF86MonBrightnessUp", lazy.spawn("brightnessctl set 10%+")),
-    Key([], "XF86MonBrightnessDown", lazy.spawn("brightnessctl set 10%-")),
-    # control volume, needs pactl to work
-    Key([], "XF86AudioRaiseVolume", lazy.spawn(VOLUME_COMMANDS["up"])),
-    Key([], "XF86AudioLowerVolume", lazy.spawn(VOLUME_COMMANDS["down"])),
-    Key([], "XF86AudioMute", lazy.spawn(VOLUME_COMMANDS["toggle"])),
+    # control screen brightness through sysfs, brightnessctl is only the fallback
+    Key(
+        [],
+        "XF86MonBrightnessUp",
+        lazy.function(BRIGHTNESS.lazy_step(BRIGHTNESS_STEP)),
+    ),
+    Key(
+        [],
+        "XF86MonBrightnessDown",
+        lazy.function(BRIGHTNESS.lazy_step(-BRIGHTNESS_STEP)),
+    ),
+    # control volume over one sound server connection, see audio.py
+    Key([], "XF86AudioRaiseVolume", lazy.function(VOLUME.lazy_change(VOLUME_STEP))),
+    Key([], "XF86AudioLowerVolume", lazy.function(VOLUME.lazy_change(-VOLUME_STEP))),
+    Key([], "XF86AudioMute", lazy.function(VOLUME.lazy_toggle_mute())),
     Key([], "XF86AudioMicMute", lazy.spawn(VOLUME_COMMANDS["toggle-mic"])),
 ]
 
@@ -604,7 +684,7 @@ layouts = [
 ]
 
 widget_defaults = dict(
-    font="JetBrainsMono Nerd Font",
+    font=FONT,
     fontsize=FONTSIZE,
     padding=3,
 )
@@ -629,7 +709,18 @@ extension_defaults = widget_defaults.copy()
 #
 # Notice there is a hole in the middle
 # also D goes down below the others
-fake_screens = init_fake_screens()
+SCREENS = geometry.ScreenLayout(layout_output, init_screen)
+SCREENS.update(geometry.outputs(qtile))
+fake_screens = SCREENS.fake_screens
+hot_reload.track(fake_screens)
+
+
+@hook.subscribe.screen_change
+def outputs_changed(*args):
+    # runs before qtile's reconfigure_screens, which applies fake_screens
+    SCREENS.update(geometry.outputs(qtile))
+
+
 """
 screens = [
     Screen(
@@ -0,0 +1,260 @@
+"""Opt-in per-widget profiling.
+
+start(qtile) wraps draw, poll and update of every widget in qtile.widgets_map
+with instance attributes that record draw and poll times into fixed-size ring
+buffers and count draws, polls and wakeups (update() calls, i.e. every timer
+tick or event that reached the widget). stop(qtile) puts the original methods
+back, so nothing is left on the widgets while profiling is off. Widgets added
+after start() are picked up by the next start(). Both refresh the live
+Profiler widgets.
+
+The Profiler widget shows the most expensive widget and is the command
+interface, e.g.
+
+    qtile cmd-obj -o widget profiler -f start_profiling
+    qtile cmd-obj -o widget profiler -f profiling_report -a 5
+"""
+import time
+from array import array
+
+from libqtile.command.base import expose_command
+from libqtile.widget import base
+
+SIZE = 128  # samples kept per ring
+PROFILES = {}  # widget name -> WidgetProfile
+WIDGETS = []  # configured Profiler widgets, told when profiling starts or stops
+_started = None
+
+
+class Ring:
+    """The last SIZE samples in a float array."""
+
+    __slots__ = ("values", "pos", "count")
+
+    def __init__(self, size=SIZE):
+        self.values = array("f", bytes(4 * size))
+        self.pos = 0
+        self.count = 0
+
+    def add(self, value):
+        self.values[self.pos] = value
+        self.pos = (self.pos + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+
+    def recent(self) -> list:
+        """Samples, oldest first."""
+        if self.count < len(self.values):
+            return self.values[: self.count].tolist()
+        return (self.values[self.pos :] + self.values[: self.pos]).tolist()
+
+    def mean(self) -> float:
+        return sum(self.recent()) / self.count if self.count else 0.0
+
+    def max(self) -> float:
+        return max(self.recent(), default=0.0)
+
+
+class Timing:
+    __slots__ = ("count", "total_ms", "ring")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.ring = Ring()
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.ring.add(ms)
+
+
+class WidgetProfile:
+    __slots__ = ("name", "draw", "poll", "wakeups", "originals")
+
+    def __init__(self, name):
+        self.name = name
+        self.draw = Timing()
+        self.poll = Timing()
+        self.wakeups = 0
+        self.originals = {}  # attribute -> instance value or None
+
+    def summary(self, elapsed) -> dict:
+        elapsed = max(elapsed, 1e-9)
+        return dict(
+            name=self.name,
+            draws=self.draw.count,
+            polls=self.poll.count,
+            wakeups=self.wakeups,
+            wakeups_per_s=self.wakeups / elapsed,
+            draw_ms=self.draw.ring.mean(),
+            draw_max_ms=self.draw.ring.max(),
+            poll_ms=self.poll.ring.mean(),
+            poll_max_ms=self.poll.ring.max(),
+            cpu_ms_per_s=(self.draw.total_ms + self.poll.total_ms) / elapsed,
+        )
+
+
+def _timed(timing, method):
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timing.add((time.perf_counter() - start) * 1e3)
+
+    return timed
+
+
+def _counted(profile, method):
+    def counted(*args, **kwargs):
+        profile.wakeups += 1
+        return method(*args, **kwargs)
+
+    return counted
+
+
+def _wrap(widget, profile):
+    # FrameBar keeps the real draw in _frame_draw and points draw at itself
+    draw = "_frame_draw" if hasattr(widget, "_frame_draw") else "draw"
+    wrappers = {
+        draw: lambda m: _timed(profile.draw, m),
+        "poll": lambda m: _timed(profile.poll, m),
+        "update": lambda m: _counted(profile, m),
+    }
+    for attribute, wrap in wrappers.items():
+        method = getattr(widget, attribute, None)
+        if method is None:
+            continue
+        profile.originals[attribute] = widget.__dict__.get(attribute)
+        setattr(widget, attribute, wrap(method))
+
+
+def _unwrap(widget, profile):
+    for attribute, original in profile.originals.items():
+        if original is None:
+            widget.__dict__.pop(attribute, None)
+        else:
+            setattr(widget, attribute, original)
+
+
+def _unwrap_all(qtile):
+    for name, profile in PROFILES.items():
+        widget = qtile.widgets_map.get(name)
+        if widget is not None:
+            _unwrap(widget, profile)
+        profile.originals.clear()
+
+
+def _notify():
+    for widget in WIDGETS:
+        widget.profiling_changed()
+
+
+def start(qtile):
+    """Profile every widget from now on, clears earlier results."""
+    global _started
+    _unwrap_all(qtile)
+    PROFILES.clear()
+    for name, widget in qtile.widgets_map.items():
+        if isinstance(widget, Profiler):
+            continue
+        PROFILES[name] = profile = WidgetProfile(name)
+        _wrap(widget, profile)
+    _started = time.monotonic()
+    _notify()
+
+
+def stop(qtile):
+    """Remove the wrappers, the results stay readable through report()."""
+    _unwrap_all(qtile)
+    _notify()
+
+
+def running() -> bool:
+    return any(p.originals for p in PROFILES.values())
+
+
+def report(top=None) -> list:
+    """Summaries of the profiled widgets, most CPU time per second first."""
+    if _started is None:
+        return []
+    elapsed = time.monotonic() - _started
+    summaries = sorted(
+        (p.summary(elapsed) for p in PROFILES.values()),
+        key=lambda s: s["cpu_ms_per_s"],
+        reverse=True,
+    )
+    return summaries[:top] if top else summaries
+
+
+def toggle(qtile):
+    """For lazy.function."""
+    if running():
+        stop(qtile)
+    else:
+        start(qtile)
+
+
+class Profiler(base._TextBox):
+    """Shows the widget costing the most CPU time while profiling runs, is
+    empty (zero width) otherwise."""
+
+    defaults = [
+        ("update_interval", 2, "Seconds between refreshes while profiling"),
+        (
+            "format",
+            "{name} {cpu_ms_per_s:.1f}ms/s {wakeups_per_s:.1f}/s",
+            "Format of the top widget, fields of profiling.report()",
+        ),
+        ("autostart", False, "Start profiling once the bars are configured"),
+    ]
+
+    def __init__(self, **config):
+        base._TextBox.__init__(self, "", **config)
+        self.add_defaults(Profiler.defaults)
+        self._timer = None
+
+    def _configure(self, qtile, bar):
+        base._TextBox._configure(self, qtile, bar)
+        WIDGETS.append(self)
+        if self.autostart:
+            # the other bars register their widgets after this one
+            self.qtile.call_soon(self.start_profiling)
+
+    def profiling_changed(self):
+        """Show the new state now, called by start() and stop()."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._refresh()
+
+    def _refresh(self):
+        self._timer = None
+        if not running():
+            self.update("")
+            return
+        top = report(1)
+        self.update(self.format.format(**top[0]) if top else "")
+        self._timer = self.timeout_add(self.update_interval, self._refresh)
+
+    @expose_command()
+    def start_profiling(self):
+        """Start profiling every widget."""
+        start(self.qtile)
+
+    @expose_command()
+    def stop_profiling(self):
+        """Stop profiling, profiling_report still returns the results."""
+        stop(self.qtile)
+
+    @expose_command()
+    def profiling_report(self, top=10) -> list:
+        """Per-widget summaries, most CPU time per second first."""
+        return report(int(top))
+
+    def finalize(self):
+        if self in WIDGETS:
+            WIDGETS.remove(self)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        base._TextBox.finalize(self)
@@ -0,0 +1,201 @@
+"""One shared sampler for /proc, sysfs and statvfs.
+
+Every source is opened once, kept open and re-read with os.pread on each
+tick, so CPU, Memory, ThermalZone, Net and DF no longer reopen and reparse the
+same files on their own timers. Subscribers get the parsed sample of the
+sources they asked for. root can point at a fake /proc tree, e.g.
+
+    sampler = Sampler(root="/tmp/fakeroot")
+    sampler.sample(["proc/stat", "proc/meminfo"])
+"""
+import os
+import time
+from collections import namedtuple
+
+from libqtile.log_utils import logger
+
+STAT = "proc/stat"
+MEMINFO = "proc/meminfo"
+CPUINFO = "proc/cpuinfo"
+NET_DEV = "proc/net/dev"
+LOADAVG = "proc/loadavg"
+STATVFS = "statvfs:"  # prefix for statvfs(mount point) sources
+
+CpuTimes = namedtuple("CpuTimes", "busy total")
+Subscription = namedtuple("Subscription", "callback sources every")
+
+
+def parse_stat(text: str) -> CpuTimes:
+    """Aggregate cpu line of /proc/stat, iowait counted as idle like psutil."""
+    for line in text.splitlines():
+        if line.startswith("cpu "):
+            values = [int(v) for v in line.split()[1:]]
+            # user nice system idle iowait irq softirq steal guest guest_nice
+            total = sum(values[:8])
+            idle = values[3] + (values[4] if len(values) > 4 else 0)
+            return CpuTimes(total - idle, total)
+    raise ValueError("no cpu line in /proc/stat")
+
+
+def parse_meminfo(text: str) -> dict:
+    """Return /proc/meminfo as {key: bytes}."""
+    info = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        fields = value.split()
+        if not fields:
+            continue
+        multiplier = 1024 if len(fields) > 1 and fields[1] == "kB" else 1
+        info[key] = int(fields[0]) * multiplier
+    return info
+
+
+def parse_cpuinfo(text: str) -> list:
+    """Return the MHz of every cpu listed in /proc/cpuinfo."""
+    return [
+        float(line.partition(":")[2])
+        for line in text.splitlines()
+        if line.startswith("cpu MHz")
+    ]
+
+
+def parse_net_dev(text: str) -> dict:
+    """Return /proc/net/dev as {interface: (rx_bytes, tx_bytes)}."""
+    counters = {}
+    for line in text.splitlines()[2:]:
+        name, _, data = line.partition(":")
+        fields = data.split()
+        if len(fields) < 9:
+            continue
+        counters[name.strip()] = (int(fields[0]), int(fields[8]))
+    return counters
+
+
+def parse_loadavg(text: str) -> float:
+    """1 minute load average."""
+    return float(text.split()[0])
+
+
+def parse_int(text: str) -> int:
+    return int(text.strip())
+
+
+def parse_str(text: str) -> str:
+    return text.strip()
+
+
+PARSERS = {
+    STAT: parse_stat,
+    MEMINFO: parse_meminfo,
+    CPUINFO: parse_cpuinfo,
+    NET_DEV: parse_net_dev,
+    LOADAVG: parse_loadavg,
+}
+
+
+class Sampler:
+    def __init__(self, root="/", interval=1.0, bufsize=16384):
+        self.root = root
+        self.interval = interval
+        self.bufsize = bufsize
+        self.subscriptions = []
+        self.ticks = 0
+        self.reads = 0
+        self._fds = {}
+        self._timer = None
+        self._qtile = None
+
+    def path(self, source: str) -> str:
+        return os.path.join(self.root, source.lstrip("/"))
+
+    def _fd(self, source: str) -> int:
+        fd = self._fds.get(source)
+        if fd is None:
+            fd = self._fds[source] = os.open(self.path(source), os.O_RDONLY)
+        return fd
+
+    def read_text(self, source: str) -> str:
+        fd = self._fd(source)
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(fd, self.bufsize, offset)
+            chunks.append(chunk)
+            offset += len(chunk)
+            if len(chunk) < self.bufsize:
+                break
+        self.reads += 1
+        return b"".join(chunks).decode()
+
+    def read(self, source: str):
+        """Return the parsed value of source, None if it can not be read."""
+        try:
+            if source.startswith(STATVFS):
+                self.reads += 1
+                return os.statvfs(self.path(source[len(STATVFS) :]))
+            return PARSERS.get(source, parse_int)(self.read_text(source))
+        except (OSError, ValueError):
+            self._close(source)
+            return None
+
+    def sample(self, sources) -> dict:
+        sample = {source: self.read(source) for source in sources}
+        sample["time"] = time.monotonic()
+        return sample
+
+    def subscribe(self, callback, sources, update_interval=None) -> Subscription:
+        """Call callback(sample) with sources every update_interval seconds."""
+        every = max(1, round((update_interval or self.interval) / self.interval))
+        sub = Subscription(callback, tuple(sources), every)
+        self.subscriptions.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        if sub in self.subscriptions:
+            self.subscriptions.remove(sub)
+        in_use = {source for other in self.subscriptions for source in other.sources}
+        for source in list(self._fds):
+            if source not in in_use:
+                self._close(source)
+        if not self.subscriptions:
+            self.stop()
+
+    def tick(self):
+        """Read every source due this tick once and fan it out."""
+        due = [s for s in self.subscriptions if self.ticks % s.every == 0]
+        self.ticks += 1
+        sample = self.sample({source for sub in due for source in sub.sources})
+        for sub in due:
+            try:
+                sub.callback(sample)
+            except Exception:
+                # one broken widget must not starve the other subscribers
+                logger.exception("sampler: subscriber %r failed", sub.callback)
+        return sample
+
+    def _run(self):
+        self._timer = self._qtile.call_later(self.interval, self._run)
+        self.tick()
+
+    def start(self, qtile):
+        if self._timer is None:
+            self._qtile = qtile
+            self._timer = qtile.call_later(self.interval, self._run)
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _close(self, source):
+        fd = self._fds.pop(source, None)
+        if fd is not None:
+            os.close(fd)
+
+    def close(self):
+        self.stop()
+        for source in list(self._fds):
+            self._close(source)
+
+
+SAMPLER = Sampler()
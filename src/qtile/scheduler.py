@@ -0,0 +1,128 @@
+"""Frame-coalescing bar.
+
+Every widget timer normally ends in its own draw, so a bar with many polling
+widgets repaints (and damages the compositor) several times a second.
+FrameBar collects dirty widgets and commits them together on the next frame
+tick, at most max_fps times per second. A widget asking again before the
+frame is drawn once, saved counts the widget draws avoided that way. Widgets
+reacting to input (passthrough) are drawn at once.
+"""
+import time
+from functools import partial
+
+from libqtile import bar
+from libqtile.log_utils import logger
+
+import damage
+
+
+class FrameBar(bar.Bar):
+    defaults = [
+        ("max_fps", 10, "Maximum number of frames committed per second"),
+        (
+            "passthrough",
+            ("Prompt", "GroupBox", "TaskList"),
+            "Class names of widgets drawn immediately (subclasses too), for input",
+        ),
+    ]
+
+    def __init__(self, widgets, size, **config):
+        bar.Bar.__init__(self, widgets, size, **config)
+        self.add_defaults(FrameBar.defaults)
+        self._dirty = {}  # insertion ordered set of widgets
+        self._full = False
+        self._frame = None
+        self._last_commit = 0.0
+        self._committing = False
+        self.requested = 0
+        self.committed = 0
+        self.saved = 0
+
+    def _configure(self, qtile, screen, *args, **kwargs):
+        bar.Bar._configure(self, qtile, screen, *args, **kwargs)
+        if getattr(self, "drawer", None) is not None:
+            damage.track_clear(self.drawer)
+        for widget in self.widgets:
+            damage.track(widget)
+            self._wrap(widget)
+
+    def _configure_widget(self, widget):
+        # also reached for widgets added by hot_reload.reload_bars
+        damage.prepare(widget)
+        configured = bar.Bar._configure_widget(self, widget)
+        if configured:
+            damage.track(widget)
+            self._wrap(widget)
+        return configured
+
+    def _wrap(self, widget):
+        if hasattr(widget, "_frame_draw"):
+            return
+        if any(cls.__name__ in self.passthrough for cls in type(widget).__mro__):
+            return
+        widget._frame_draw = widget.draw
+        widget.draw = partial(self._request_widget, widget)
+
+    def frame_stats(self) -> dict:
+        return dict(
+            requested=self.requested,
+            committed=self.committed,
+            saved=self.saved,
+            max_fps=self.max_fps,
+        )
+
+    def _schedule(self):
+        if self._frame is not None:
+            return
+        delay = self._last_commit + 1 / self.max_fps - time.monotonic()
+        self._frame = self.qtile.call_later(max(delay, 0), self._commit)
+
+    def _request_widget(self, widget):
+        if self._committing:
+            return widget._frame_draw()
+        self.requested += 1
+        if widget in self._dirty or self._full:
+            self.saved += 1
+        self._dirty[widget] = None
+        self._schedule()
+
+    def draw(self):
+        if self._committing:
+            return
+        self.requested += 1
+        if self._full:
+            self.saved += 1
+        self._full = True
+        self._schedule()
+
+    def _actual_draw(self):
+        self._committing = True
+        try:
+            bar.Bar._actual_draw(self)
+        finally:
+            self._committing = False
+
+    def _commit(self):
+        self._frame = None
+        self._last_commit = time.monotonic()
+        self.committed += 1
+        dirty, self._dirty = self._dirty, {}
+        if self._full:
+            # a full redraw repaints every widget, including the dirty ones
+            self._full = False
+            self._actual_draw()
+            return
+        self._committing = True
+        try:
+            for widget in dirty:
+                if widget.configured:
+                    widget._frame_draw()
+        finally:
+            self._committing = False
+
+    def finalize(self):
+        if self._frame is not None:
+            self._frame.cancel()
+            self._frame = None
+        logger.debug("FrameBar %s", self.frame_stats())
+        bar.Bar.finalize(self)
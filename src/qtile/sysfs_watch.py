@@ -0,0 +1,124 @@
+"""Change notifications for sysfs attributes.
+
+Files and directories are watched with inotify, which fires for userspace
+writes (brightnessctl) and for attributes the kernel sysfs_notify()s, e.g.
+backlight/actual_brightness. Kernel side changes that only emit a uevent,
+like power_supply capacity, are picked up from the kobject uevent netlink
+socket. Both fds are read from the asyncio loop, so nothing wakes up while
+nothing changes. Works on a fake sysfs tree of regular files as well.
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import socket
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_KERNEL_GROUP = 1
+
+_libc = None
+
+
+def _get_libc():
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library("c") or "libc.so.6"
+        _libc = ctypes.CDLL(name, use_errno=True)
+    return _libc
+
+
+class SysfsWatcher:
+    def __init__(self, paths, callback, subsystems=()):
+        """Call callback() once per batch of changes to paths or uevents of
+        the given subsystems, e.g. ("power_supply",)."""
+        self.paths = list(paths)
+        self.callback = callback
+        self.subsystems = tuple(s.encode() for s in subsystems)
+        self.wakeups = 0
+        self._fd = None
+        self._sock = None
+        self._loop = None
+
+    @property
+    def active(self) -> bool:
+        return self._fd is not None or self._sock is not None
+
+    def _start_inotify(self):
+        try:
+            libc = _get_libc()
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        mask = IN_MODIFY | IN_CLOSE_WRITE
+        watched = 0
+        for path in self.paths:
+            if libc.inotify_add_watch(fd, os.fsencode(path), mask) >= 0:
+                watched += 1
+        if not watched:
+            os.close(fd)
+            return
+        self._fd = fd
+        self._loop.add_reader(fd, self._on_inotify)
+
+    def _start_uevent(self):
+        if not self.subsystems or not hasattr(socket, "AF_NETLINK"):
+            return
+        try:
+            sock = socket.socket(
+                socket.AF_NETLINK,
+                socket.SOCK_DGRAM | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC,
+                NETLINK_KOBJECT_UEVENT,
+            )
+            sock.bind((0, UEVENT_KERNEL_GROUP))
+        except OSError:
+            return
+        self._sock = sock
+        self._loop.add_reader(sock.fileno(), self._on_uevent)
+
+    def start(self, loop=None) -> bool:
+        """Start watching, return False if no notification source is available
+        and the caller has to poll."""
+        self._loop = loop or asyncio.get_event_loop()
+        self._start_inotify()
+        self._start_uevent()
+        return self.active
+
+    def _on_inotify(self):
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self._notify()
+
+    def _on_uevent(self):
+        keys = [b"SUBSYSTEM=" + s + b"\0" for s in self.subsystems]
+        relevant = False
+        try:
+            while True:
+                message = self._sock.recv(8192) + b"\0"
+                relevant |= any(key in message for key in keys)
+        except BlockingIOError:
+            pass
+        if relevant:
+            self._notify()
+
+    def _notify(self):
+        self.wakeups += 1
+        self.callback()
+
+    def stop(self):
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        if self._sock is not None:
+            self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
@@ -0,0 +1,185 @@
+"""CPU, Memory, ThermalZone, Net and DF fed by sampler.SAMPLER.
+
+Same options and format fields as the libqtile widgets, but instead of
+running their own timer they subscribe to the shared sampler.
+"""
+from abc import abstractmethod
+
+from libqtile import widget
+
+from sampler import CPUINFO, MEMINFO, NET_DEV, SAMPLER, STAT, STATVFS
+
+UNITS = ("B", "kB", "MB", "GB", "TB")
+MEASURES = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def human_bytes(value: float) -> str:
+    unit = 0
+    while value >= 1024 and unit < len(UNITS) - 1:
+        value /= 1024
+        unit += 1
+    return "{:.2f}{}".format(value, UNITS[unit])
+
+
+class _Sampled:
+    sampler = SAMPLER
+    _subscription = None
+    _sample = None
+
+    @abstractmethod
+    def sources(self) -> tuple:
+        """Sampler sources the widget reads, subclasses override it."""
+
+    def timer_setup(self):
+        self._subscription = self.sampler.subscribe(
+            self._on_sample, self.sources(), self.update_interval
+        )
+        self.sampler.start(self.qtile)
+        self._on_sample(self.sampler.sample(self.sources()))
+
+    def _on_sample(self, sample):
+        self._sample = sample
+        self.update(self.poll())
+
+    def finalize(self):
+        if self._subscription is not None:
+            self.sampler.unsubscribe(self._subscription)
+            self._subscription = None
+        super().finalize()
+
+
+class CPU(_Sampled, widget.CPU):
+    _last = None
+
+    def sources(self):
+        return (STAT, CPUINFO)
+
+    def poll(self):
+        times, mhz = self._sample[STAT], self._sample[CPUINFO]
+        if times is None:
+            return "N/A"
+        last, self._last = self._last, times
+        busy, total = times.busy, times.total
+        if last is not None:
+            busy, total = busy - last.busy, total - last.total
+        freq = sum(mhz) / len(mhz) if mhz else 0
+        variables = dict(
+            load_percent=round(100 * busy / total, 1) if total else 0.0,
+            freq_current=round(freq / 1000, 1),
+            freq_max=round(max(mhz, default=0) / 1000, 1),
+            freq_min=round(min(mhz, default=0) / 1000, 1),
+        )
+        return self.format.format(**variables)
+
+
+class Memory(_Sampled, widget.Memory):
+    def sources(self):
+        return (MEMINFO,)
+
+    def poll(self):
+        info = self._sample[MEMINFO]
+        if info is None:
+            return "N/A"
+        mem, swap = MEASURES[self.measure_mem], MEASURES[self.measure_swap]
+        total, available = info["MemTotal"], info.get("MemAvailable", info["MemFree"])
+        swap_total, swap_free = info.get("SwapTotal", 0), info.get("SwapFree", 0)
+        variables = dict(
+            MemUsed=(total - available) / mem,
+            MemTotal=total / mem,
+            MemFree=info["MemFree"] / mem,
+            Available=available / mem,
+            Buffers=info.get("Buffers", 0) / mem,
+            Active=info.get("Active", 0) / mem,
+            Inactive=info.get("Inactive", 0) / mem,
+            Shmem=info.get("Shmem", 0) / mem,
+            MemPercent=round(100 * (total - available) / total, 1),
+            SwapTotal=swap_total / swap,
+            SwapFree=swap_free / swap,
+            SwapUsed=(swap_total - swap_free) / swap,
+            SwapPercent=round(100 * (swap_total - swap_free) / swap_total, 1)
+            if swap_total
+            else 0.0,
+            mm=self.measure_mem,
+            ms=self.measure_swap,
+        )
+        return self.format.format(**variables)
+
+
+class ThermalZone(_Sampled, widget.ThermalZone):
+    def sources(self):
+        return (self.zone,)
+
+    def poll(self):
+        value = self._sample[self.zone]
+        if value is None:
+            return "N/A"
+        value = round(value / 1000)
+        if value < self.high:
+            self.foreground = self.fgcolor_normal
+        elif value < self.crit:
+            self.foreground = self.fgcolor_high
+        else:
+            self.foreground = self.fgcolor_crit
+        if self.layout is not None:
+            self.layout.colour = self.foreground
+        return self.format.format(temp=value)
+
+
+class Net(_Sampled, widget.Net):
+    _last = None
+
+    def sources(self):
+        return (NET_DEV,)
+
+    def _counters(self, counters) -> tuple:
+        names = self.interface or list(counters)
+        if isinstance(names, str):
+            names = [names]
+        rx = sum(counters[n][0] for n in names if n in counters)
+        tx = sum(counters[n][1] for n in names if n in counters)
+        return rx, tx
+
+    def poll(self):
+        counters = self._sample[NET_DEV]
+        if counters is None:
+            return "N/A"
+        now = self._counters(counters), self._sample["time"]
+        last, self._last = self._last, now
+        if last is None:
+            down = up = 0.0
+        else:
+            elapsed = (now[1] - last[1]) or 1
+            down = (now[0][0] - last[0][0]) / elapsed
+            up = (now[0][1] - last[0][1]) / elapsed
+        return self.format.format(
+            interface=self.interface or "all",
+            down=human_bytes(down),
+            up=human_bytes(up),
+            total=human_bytes(down + up),
+        )
+
+
+class DF(_Sampled, widget.DF):
+    def sources(self):
+        return (STATVFS + self.partition,)
+
+    def poll(self):
+        statvfs = self._sample[self.sources()[0]]
+        if statvfs is None:
+            return "N/A"
+        calc = MEASURES[self.measure]
+        size = statvfs.f_frsize * statvfs.f_blocks // calc
+        free_blocks = statvfs.f_bavail if self.user_free_only else statvfs.f_bfree
+        free = statvfs.f_frsize * free_blocks // calc
+        if self.visible_on_warn and free >= self.warn_space:
+            return ""
+        if self.layout is not None:
+            warn = free <= self.warn_space
+            self.layout.colour = self.warn_color if warn else self.foreground
+        return self.format.format(
+            p=self.partition,
+            s=size,
+            f=free,
+            r=(size - free) / size * 100 if size else 0,
+            m=self.measure,
+        )
@@ -0,0 +1,184 @@
+"""TaskList that only lays out and draws the windows that fit.
+
+widget.TaskList measures and draws every window of the group on each redraw
+and shrinks all boxes when they overflow. VirtualTaskList keeps boxes at their
+natural width, walks the windows from the first visible one (moved to keep
+the focused window in view) until the bar is full and shows the rest as a
+"+N" box. Box widths are cached per title, and every drawn box is kept as a
+surface per (window, title, state), so a focus change blits the two boxes
+involved from earlier frames instead of laying their text out again. Boxes
+that scrolled to another offset are drawn again.
+"""
+import cairocffi
+from libqtile import widget
+
+MAX_WIDTHS = 1024  # cached box widths before the cache is dropped
+
+
+class VirtualTaskList(widget.TaskList):
+    defaults = [
+        ("overflow_format", "+{}", "Text of the box counting hidden windows"),
+    ]
+
+    def __init__(self, **config):
+        widget.TaskList.__init__(self, **config)
+        self.add_defaults(VirtualTaskList.defaults)
+        self._first = 0
+        self._visible = []
+        self._hidden = 0
+        self._widths = {}  # (title, icon) -> box width
+        self._entries = {}  # window -> {(title, colours, icon, offset, width): surface}
+        self.laid_out = 0
+        self.rendered = 0
+        self.blitted = 0
+
+    def _box(self, window) -> tuple:
+        """(window, icon, title, width) of one box."""
+        title = self.get_taskname(window)
+        icon = self.get_window_icon(window) if self.icon_size else None
+        key = (title, icon is not None)
+        width = self._widths.get(key)
+        if width is None:
+            if len(self._widths) >= MAX_WIDTHS:
+                self._widths.clear()
+            self.laid_out += 1
+            width = self.box_width(title)
+            if icon is not None:
+                width += self.icon_size + self.padding_x
+            if self.max_title_width:
+                width = min(width, self.max_title_width)
+            width = self._widths[key] = width
+        return window, icon, title, width
+
+    def _fill(self, windows, start, room, step) -> list:
+        boxes = []
+        index = start
+        while 0 <= index < len(windows):
+            box = self._box(windows[index])
+            if boxes and box[3] > room:
+                break
+            boxes.append(box)
+            room -= box[3] + self.spacing
+            index += step
+        return boxes
+
+    def calc_box_widths(self):
+        self._hidden = 0
+        if self.title_width_method == "uniform":
+            return list(widget.TaskList.calc_box_widths(self))
+        windows = self.windows
+        if not windows:
+            return []
+        room = self.width - 2 * self.margin_x
+        focused = next(
+            (i for i, w in enumerate(windows) if w is w.group.current_window), 0
+        )
+        first = min(self._first, len(windows) - 1)
+        if focused < first:
+            first = focused
+        boxes = self._fill(windows, first, room, 1)
+        if len(boxes) < len(windows):
+            # leave room for the overflow box
+            room -= self.box_width(self.overflow_format.format(len(windows)))
+            room -= self.spacing
+            boxes = self._fill(windows, first, room, 1)
+            if focused >= first + len(boxes):
+                boxes = self._fill(windows, focused, room, -1)[::-1]
+                first = focused - len(boxes) + 1
+        self._first = first
+        self._hidden = len(windows) - len(boxes)
+        return boxes
+
+    def _state(self, window) -> tuple:
+        if window.urgent:
+            border = self.urgent_border
+            text_color = border
+        elif window is window.group.current_window:
+            border = self.border
+            text_color = border
+        else:
+            border = self.unfocused_border or None
+            text_color = self.foreground
+        if self.highlight_method == "text":
+            border = None
+        else:
+            text_color = self.foreground
+        return border, text_color
+
+    def _drawbox(self, offset, title, border, text_color, width, icon=None):
+        textwidth = width - 2 * self.padding_x
+        if icon is not None:
+            textwidth -= self.icon_size + self.padding_x
+        self.drawbox(
+            offset,
+            title,
+            border,
+            text_color,
+            rounded=self.rounded,
+            block=self.highlight_method == "block",
+            width=textwidth,
+            icon=icon,
+        )
+
+    def _blit(self, surface, offset, width):
+        ctx = self.drawer.ctx
+        ctx.save()
+        ctx.set_operator(cairocffi.OPERATOR_SOURCE)
+        ctx.set_source_surface(surface, offset, 0)
+        ctx.rectangle(offset, 0, width, self.height)
+        ctx.fill()
+        ctx.restore()
+
+    def _snapshot(self, offset, width):
+        surface = cairocffi.ImageSurface(
+            cairocffi.FORMAT_ARGB32, int(width), self.height
+        )
+        ctx = cairocffi.Context(surface)
+        ctx.set_operator(cairocffi.OPERATOR_SOURCE)
+        ctx.set_source_surface(self.drawer.surface, -offset, 0)
+        ctx.paint()
+        return surface
+
+    def draw(self):
+        self.drawer.clear(self.background or self.bar.background)
+        boxes = self.calc_box_widths()
+        self._visible = [box[0] for box in boxes]
+        self._box_end_positions = []
+        entries = {}
+        offset = self.margin_x
+        for window, icon, title, width in boxes:
+            self._box_end_positions.append(offset + width)
+            border, text_color = self._state(window)
+            cached = self._entries.get(window, {})
+            key = (title, border, text_color, id(icon), offset, width)
+            surface = cached.get(key)
+            if surface is not None:
+                self.blitted += 1
+                self._blit(surface, offset, width)
+            else:
+                self.rendered += 1
+                self._drawbox(offset, title, border, text_color, width, icon)
+                surface = self._snapshot(offset, width)
+            # keep the other states of the title for the next focus change
+            entries[window] = {k: s for k, s in cached.items() if k[0] == title}
+            entries[window][key] = surface
+            offset += width + self.spacing
+        self._entries = entries
+        if self._hidden:
+            text = self.overflow_format.format(self._hidden)
+            self._drawbox(
+                offset,
+                text,
+                self.unfocused_border or None,
+                self.foreground,
+                self.box_width(text),
+            )
+        self.drawer.draw(offsetx=self.offset, offsety=self.offsety, width=self.width)
+
+    def get_clicked(self, x, y):
+        start = self.margin_x
+        for end, window in zip(self._box_end_positions, self._visible):
+            if start <= x <= end:
+                return window
+            start = end + self.spacing
+        return None
@@ -0,0 +1,139 @@
+"""Window titles fitted to a pixel budget for TaskList.
+
+Titles are split into grapheme clusters (a base character with its combining
+marks, variation selectors, emoji modifiers and ZWJ sequences, or a regional
+indicator pair) so a cut never separates an accent from its letter. Cluster
+widths are measured once per font with pango and cached, and fitted titles are
+memoized per (title, font, fontsize, budget), so redrawing a TaskList whose
+titles did not change does no work. Without pango, widths are estimated from
+monospace cells.
+
+    parse_text=titles.fitter(72, "JetBrainsMono Nerd Font", 12)
+"""
+import unicodedata
+from functools import lru_cache
+
+try:
+    import cairocffi
+    from libqtile import pangocffi
+except ImportError:
+    pangocffi = None
+
+ELLIPSIS = "..."
+CACHE_SIZE = 2048
+ZWJ = "\u200d"
+CELL = 0.6  # advance of a monospace cell, in fontsize units
+
+
+def _joins(char) -> bool:
+    """Whether char belongs to the cluster before it."""
+    code = ord(char)
+    return (
+        unicodedata.category(char) in ("Mn", "Me", "Mc")
+        or 0xFE00 <= code <= 0xFE0F  # variation selectors
+        or 0x1F3FB <= code <= 0x1F3FF  # emoji skin tones
+        or 0xE0020 <= code <= 0xE007F  # emoji tag sequences
+    )
+
+
+def _regional(char) -> bool:
+    return 0x1F1E6 <= ord(char) <= 0x1F1FF
+
+
+def graphemes(text: str) -> list:
+    clusters = []
+    for char in text:
+        if clusters:
+            last = clusters[-1]
+            if (
+                _joins(char)
+                or char == ZWJ
+                or last[-1] == ZWJ
+                or (_regional(char) and len(last) == 1 and _regional(last))
+            ):
+                clusters[-1] = last + char
+                continue
+        clusters.append(char)
+    return clusters
+
+
+def cell_measure(fontsize):
+    """Width estimate from monospace cells, wide east asian characters and
+    emoji take two."""
+
+    def measure(text) -> int:
+        cells = 0
+        for cluster in graphemes(text):
+            wide = unicodedata.east_asian_width(cluster[0]) in ("W", "F")
+            cells += 2 if wide or ord(cluster[0]) > 0x1F000 else 1
+        return round(cells * CELL * fontsize)
+
+    return measure
+
+
+def pango_measure(font, fontsize):
+    surface = cairocffi.ImageSurface(cairocffi.FORMAT_ARGB32, 1, 1)
+    layout = pangocffi.create_layout(cairocffi.Context(surface))
+    desc = pangocffi.FontDescription.from_string(font)
+    desc.set_absolute_size(pangocffi.units_from_double(float(fontsize)))
+    layout.set_font_description(desc)
+
+    def measure(text) -> int:
+        layout.set_text(text)
+        return layout.get_pixel_size()[0]
+
+    return measure
+
+
+class GlyphMetrics:
+    """Cached pixel widths of grapheme clusters in one font."""
+
+    def __init__(self, measure):
+        self.measure = measure
+        self._widths = {}
+
+    def width(self, cluster) -> int:
+        width = self._widths.get(cluster)
+        if width is None:
+            width = self._widths[cluster] = self.measure(cluster)
+        return width
+
+
+@lru_cache(maxsize=None)
+def metrics(font, fontsize) -> GlyphMetrics:
+    if pangocffi is None:
+        return GlyphMetrics(cell_measure(fontsize))
+    return GlyphMetrics(pango_measure(font, fontsize))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fit(title, font, fontsize, budget) -> str:
+    """title cut at a grapheme boundary so that it and ELLIPSIS fit in budget
+    pixels, title itself when it fits."""
+    glyphs = metrics(font, fontsize)
+    clusters = graphemes(title)
+    widths = [glyphs.width(c) for c in clusters]
+    if sum(widths) <= budget:
+        return title
+    room = budget - glyphs.width(ELLIPSIS)
+    used = count = 0
+    for width in widths:
+        if used + width > room:
+            break
+        used += width
+        count += 1
+    return "".join(clusters[:count]).rstrip() + ELLIPSIS
+
+
+def fitter(budget, font, fontsize):
+    """parse_text callable fitting titles to budget pixels."""
+
+    def parse_text(title: str) -> str:
+        return fit(title, font, fontsize, budget)
+
+    return parse_text
+
+
+def cache_clear():
+    fit.cache_clear()
+    metrics.cache_clear()
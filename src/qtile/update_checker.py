@@ -0,0 +1,102 @@
+"""Non-blocking package update checker.
+
+The backend command runs as an asyncio subprocess so the event loop is never
+blocked. The last result is saved with its timestamp so a config reload shows
+it straight away, and failing commands are retried with exponential backoff.
+"""
+import asyncio
+import json
+import os
+import time
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "qtile"
+)
+
+
+# the shell could not find or run the command
+SHELL_FAILURES = (126, 127)
+
+
+class CheckFailed(Exception):
+    pass
+
+
+class UpdateChecker:
+    def __init__(self, cmd, cache_file=None, interval=60, max_backoff=3600):
+        """@param cmd: shell command printing one line per pending update"""
+        self.cmd = cmd
+        self.cache_file = cache_file
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.updates = None
+        self.checked = None  # wall clock time of the last successful check
+        self._task = None
+
+    def load(self) -> bool:
+        """Load the cached result, return True if there was one."""
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+            updates, checked = int(cached["updates"]), float(cached["time"])
+        except (TypeError, OSError, ValueError, KeyError):
+            return False
+        self.updates, self.checked = updates, checked
+        return True
+
+    def save(self):
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"updates": self.updates, "time": self.checked}, f)
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            pass
+
+    def next_delay(self) -> float:
+        """Seconds until the next check is due."""
+        if self.failures:
+            return min(self.interval * 2**self.failures, self.max_backoff)
+        if self.checked is None:
+            return 0
+        return max(0.0, self.checked + self.interval - time.time())
+
+    async def _run(self) -> int:
+        proc = await asyncio.create_subprocess_shell(
+            self.cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        out, _ = await proc.communicate()
+        if proc.returncode in SHELL_FAILURES:
+            raise CheckFailed("{!r} exited with {}".format(self.cmd, proc.returncode))
+        if proc.returncode:
+            # like upstream CheckUpdates: checkupdates exits 2 and pacman -Qu
+            # exits 1 when nothing is pending
+            return 0
+        lines = [line for line in out.decode(errors="replace").splitlines() if line]
+        return len(lines)
+
+    async def _check(self) -> int:
+        try:
+            updates = await self._run()
+        except Exception:
+            # anything else would leave next_delay() at 0 and spin
+            self.failures += 1
+            raise
+        finally:
+            self._task = None
+        self.failures = 0
+        self.updates, self.checked = updates, time.time()
+        self.save()
+        return updates
+
+    def check(self) -> asyncio.Task:
+        """Start a check, or return the one already running."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._check())
+        return self._task
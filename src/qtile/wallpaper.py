@@ -0,0 +1,195 @@
+"""Wallpapers decoded and scaled once per output geometry.
+
+qtile decodes the wallpaper and scales it onto the root window on every
+start, reload and screen change, for an 8K image on several outputs the
+slowest part of a reload. WallpaperScreen hands qtile's painter a copy that
+is already screen sized, painted 1:1. The copies are cached per (path, mtime,
+width, height, mode) as uncompressed top-down 32 bit bmp files: their pixel
+rows are cairo's RGB24 layout, so qtile's loader reads them without inflating
+or scaling anything, and WallpaperCache.surface memory-maps them straight
+into an ImageSurface. Writing a copy removes the older copies of the same
+wallpaper, screen size and mode, and drops their mappings. When a copy can't
+be written, the original wallpaper is painted as before.
+"""
+import hashlib
+import mmap
+import os
+import struct
+
+import cairocffi
+from libqtile.command.base import expose_command
+from libqtile.config import Screen
+from libqtile.log_utils import logger
+
+from glyphs import CACHE_DIR as GLYPH_DIR
+
+CACHE_DIR = os.path.join(os.path.dirname(GLYPH_DIR), "wallpaper")
+# BITMAPFILEHEADER and BITMAPINFOHEADER
+BMP_HEADER = struct.Struct("<2sIHHIIiiHHIIiiII")
+
+
+def decode(path):
+    """ImageSurface of an image file, decoded like qtile decodes wallpapers."""
+    from libqtile import images
+
+    with open(path, "rb") as f:
+        surface, _ = images.get_cairo_surface(f.read())
+    return surface
+
+
+def place(image, width, height, mode):
+    """Matrix placing image on a width x height screen for a wallpaper_mode."""
+    iw, ih = image.get_width(), image.get_height()
+    matrix = cairocffi.Matrix()
+    if mode == "stretch":
+        matrix.scale(width / iw, height / ih)
+    elif mode == "fill":
+        scale = max(width / iw, height / ih)
+        matrix.translate((width - iw * scale) / 2, (height - ih * scale) / 2)
+        matrix.scale(scale, scale)
+    elif mode == "center":
+        matrix.translate((width - iw) / 2, (height - ih) / 2)
+    return matrix
+
+
+def scale(image, width, height, mode):
+    """image painted on a black width x height screen."""
+    out = cairocffi.ImageSurface(cairocffi.FORMAT_RGB24, width, height)
+    ctx = cairocffi.Context(out)
+    ctx.paint()
+    ctx.transform(place(image, width, height, mode))
+    ctx.set_source_surface(image)
+    ctx.get_source().set_filter(cairocffi.FILTER_GOOD)
+    ctx.paint()
+    return out
+
+
+def write_bmp(surface, path):
+    surface.flush()
+    width, height = surface.get_width(), surface.get_height()
+    stride, row = surface.get_stride(), width * 4
+    size = row * height
+    data = surface.get_data()
+    header = BMP_HEADER.pack(
+        b"BM",
+        BMP_HEADER.size + size,
+        0,
+        0,
+        BMP_HEADER.size,  # pixel data offset
+        40,  # BITMAPINFOHEADER size
+        width,
+        -height,  # top-down rows
+        1,
+        32,
+        0,  # BI_RGB
+        size,
+        2835,  # 72 dpi
+        2835,
+        0,
+        0,
+    )
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        if stride == row:
+            f.write(data[:size])
+        else:
+            for y in range(height):
+                f.write(data[y * stride : y * stride + row])
+    os.replace(tmp, path)
+
+
+def map_bmp(path):
+    """(mmap, ImageSurface) of a bmp written by write_bmp."""
+    with open(path, "rb") as f:
+        # private pages, drawing into the surface never touches the file
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, _, _, _, offset, _, width, height, _, bpp, compression, *_ = (
+        BMP_HEADER.unpack_from(mapped)
+    )
+    if magic != b"BM" or bpp != 32 or compression != 0 or height >= 0:
+        mapped.close()
+        raise ValueError("{} is not a top-down 32 bit bmp".format(path))
+    height = -height
+    data = memoryview(mapped)[offset : offset + width * 4 * height]
+    surface = cairocffi.ImageSurface.create_for_data(
+        data, cairocffi.FORMAT_RGB24, width, height, width * 4
+    )
+    return mapped, surface
+
+
+class WallpaperCache:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._mapped = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _stem(key) -> str:
+        """Name shared by the copies of one wallpaper, screen size and mode."""
+        path, _, *geometry = key
+        return hashlib.sha1(repr((path, *geometry)).encode()).hexdigest()
+
+    def _path(self, key) -> str:
+        return os.path.join(self.cache_dir, "{}-{}.bmp".format(self._stem(key), key[1]))
+
+    @staticmethod
+    def key(path, width, height, mode) -> tuple:
+        return (path, os.stat(path).st_mtime_ns, width, height, mode)
+
+    def _evict(self, key):
+        """Remove the copies of older versions of key's wallpaper."""
+        stem, current = self._stem(key), os.path.basename(self._path(key))
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(stem + "-") and name != current:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def scaled(self, path, width, height, mode) -> str:
+        """Path of the screen sized copy of path, written on a miss."""
+        key = self.key(path, width, height, mode)
+        target = self._path(key)
+        if os.path.exists(target):
+            self.hits += 1
+            return target
+        self.misses += 1
+        image = scale(decode(path), width, height, mode)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        write_bmp(image, target)
+        self._evict(key)
+        return target
+
+    def surface(self, path, width, height, mode):
+        """Memory-mapped ImageSurface of the screen sized copy of path."""
+        key = self.key(path, width, height, mode)
+        mapped = self._mapped.get(key)
+        if mapped is None:
+            stem = self._stem(key)
+            for old in [k for k in self._mapped if self._stem(k) == stem]:
+                # unmapped once cairo drops the surface
+                del self._mapped[old]
+            target = self.scaled(path, width, height, mode)
+            mapped = self._mapped[key] = map_bmp(target)
+        return mapped[1]
+
+    def clear(self):
+        self._mapped.clear()
+
+
+CACHE = WallpaperCache()
+
+
+class WallpaperScreen(Screen):
+    """Screen painting its wallpaper from a screen sized copy in CACHE."""
+
+    @expose_command()
+    def paint(self, path, mode=None):
+        try:
+            path = CACHE.scaled(os.path.expanduser(path), self.width, self.height, mode)
+            mode = None  # already screen sized, painted 1:1
+        except Exception:
+            logger.exception("wallpaper: painting %s uncached", path)
+        Screen.paint(self, path, mode)
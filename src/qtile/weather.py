@@ -0,0 +1,94 @@
+"""TTL-cached, non-blocking weather fetches.
+
+Responses are kept in memory and on disk per url. A fresh cached response is
+returned without touching the network, concurrent requests for one url share
+a single fetch, and when the network is down the last good response is
+served instead of an error.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from urllib.request import Request, urlopen
+
+from update_checker import CACHE_DIR
+
+WEATHER_CACHE_DIR = os.path.join(CACHE_DIR, "weather")
+
+
+class WeatherProvider:
+    def __init__(self, cache_dir=WEATHER_CACHE_DIR, timeout=10):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.fetches = 0
+        self.failures = {}  # url: consecutive failed fetches
+        self._memory = {}  # url: (body, fetched)
+        self._inflight = {}
+
+    def _path(self, url) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest())
+
+    def cached(self, url) -> tuple:
+        """Return (body, fetched time) of the last good response, or (None, None)."""
+        if url not in self._memory and self.cache_dir:
+            try:
+                with open(self._path(url)) as f:
+                    cached = json.load(f)
+                self._memory[url] = cached["body"], float(cached["time"])
+            except (OSError, ValueError, KeyError, TypeError):
+                return None, None
+        return self._memory.get(url, (None, None))
+
+    def age(self, url) -> float:
+        fetched = self.cached(url)[1]
+        return float("inf") if fetched is None else time.time() - fetched
+
+    def _store(self, url, body):
+        self._memory[url] = body, time.time()
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self._path(url) + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"body": body, "time": self._memory[url][1]}, f)
+            os.replace(tmp, self._path(url))
+        except OSError:
+            pass
+
+    def _download(self, url, headers):
+        self.fetches += 1
+        with urlopen(Request(url, headers=headers or {}), timeout=self.timeout) as r:
+            return json.loads(r.read().decode())
+
+    async def _refresh(self, url, ttl, headers):
+        body, _ = self.cached(url)
+        if body is not None and self.age(url) < ttl:
+            return body
+        loop = asyncio.get_event_loop()
+        try:
+            fresh = await loop.run_in_executor(None, self._download, url, headers)
+        except (OSError, ValueError):
+            self.failures[url] = self.failures.get(url, 0) + 1
+            if body is None:
+                raise
+            return body  # offline, serve the last good response
+        self.failures.pop(url, None)
+        self._store(url, fresh)
+        return fresh
+
+    async def _get(self, url, ttl, headers):
+        try:
+            return await self._refresh(url, ttl, headers)
+        finally:
+            self._inflight.pop(url, None)
+
+    def get(self, url, ttl=600, headers=None) -> asyncio.Future:
+        """Return a future for url's body, sharing any fetch already running."""
+        if url not in self._inflight:
+            self._inflight[url] = asyncio.ensure_future(self._get(url, ttl, headers))
+        return self._inflight[url]
+
+
+PROVIDER = WeatherProvider()